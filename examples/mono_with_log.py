@@ -37,4 +37,5 @@ sim = BioSim(geogr, ini_herbs, seed=1234, vis_years=1, ymax_animals=700, log_fil
 sim.simulate(20)
 sim.add_population(ini_carns)
 sim.simulate(20)
+sim.close()
 plt.show()
\ No newline at end of file
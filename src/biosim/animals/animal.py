@@ -1,28 +1,41 @@
+from collections import namedtuple
+from types import MappingProxyType
 import math
 import random
 
+import numpy as np
+
+# Compiled parameters of a species, see Animal.compile_params: the class
+# parameters as attributes, and the values derived from them.
+ParamRecord = namedtuple("ParamRecord",
+                         ["w_birth", "sigma_birth", "beta", "eta", "a_half", "phi_age",
+                          "w_half", "phi_weight", "mu", "gamma", "zeta", "xi", "omega",
+                          "F", "DeltaPhiMax", "minimum_weight", "birth_mu", "birth_sigma"])
+
 
 class Animal:
     """
     Animal Class creates an instance of animal and handles
     the birth, death, fitness conditions.
     """
-    # Initialize default class parameters to None.
-    params = {"w_birth": None,
-              "sigma_birth": None,
-              "beta": None,
-              "eta": None,
-              "a_half": None,
-              "phi_age": None,
-              "w_half": None,
-              "phi_weight": None,
-              "mu": None,
-              "gamma": None,
-              "zeta": None,
-              "xi": None,
-              "omega": None,
-              "F": None,
-              "DeltaPhiMax": None}
+    # Initialize default class parameters to None. The parameters of every
+    # class are read only, so that they are only changed by update_params,
+    # which also rebuilds the compiled parameters.
+    params = MappingProxyType({"w_birth": None,
+                               "sigma_birth": None,
+                               "beta": None,
+                               "eta": None,
+                               "a_half": None,
+                               "phi_age": None,
+                               "w_half": None,
+                               "phi_weight": None,
+                               "mu": None,
+                               "gamma": None,
+                               "zeta": None,
+                               "xi": None,
+                               "omega": None,
+                               "F": None,
+                               "DeltaPhiMax": None})
 
     # Initialise minimum weight required during childbirth.
     minimum_weight = None
@@ -32,6 +45,20 @@ class Animal:
     mu = None
     sigma = None
 
+    # Compiled parameters, rebuilt from params by compile_params whenever
+    # they change. The cycles read these instead of looking up params.
+    compiled = None
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Makes the parameters of every species class read only and compiles
+        them when the class is created.
+        """
+        super().__init_subclass__(**kwargs)
+        if "params" in cls.__dict__:
+            cls.params = MappingProxyType(dict(cls.params))
+        cls.compile_params()
+
     def __init__(self, age: int = None, weight: float = None):
 
         """
@@ -111,13 +138,51 @@ class Animal:
             # phi = q_age * q_weight
             # q_age = 1 / ( 1 + e^( phi_age * (age - a_half)))
             # q_weight = 1 / ( 1 + e^(- phi_weight * (weight - w_half)))
-            q_age = 1 / (1 + math.exp(self.params["phi_age"] *
-                                      (self.age - self.params["a_half"])))
+            compiled = self.compiled
+            q_age = 1 / (1 + math.exp(compiled.phi_age *
+                                      (self.age - compiled.a_half)))
 
-            q_weight = 1 / (1 + math.exp(-self.params["phi_weight"] *
-                                         (self.weight - self.params["w_half"])))
+            q_weight = 1 / (1 + math.exp(-compiled.phi_weight *
+                                         (self.weight - compiled.w_half)))
             self.phi = q_age * q_weight
 
+    @classmethod
+    def batch_fitness(cls, age, weight):
+        r"""
+        Calculates the fitness(phi) of many animals of the class in one
+        NumPy call, with the same formula as :func:`Animal.fitness`.
+
+        .. code::
+
+                phi = q_age * q_weight
+                q_age = 1 / ( 1 + \e^( phi_age * (age - a_half)))
+                q_weight = 1 / ( 1 + e^(- phi_weight * (weight - w_half)))
+
+        Parameters
+        ----------
+        age: array_like
+            ages of the animals
+        weight: array_like
+            weights of the animals
+
+        Returns
+        -------
+        numpy.ndarray
+            fitness of every animal, zero where weight is not positive.
+        """
+        age = np.asarray(age, dtype=float)
+        weight = np.asarray(weight, dtype=float)
+
+        # Large exponents overflow to inf, which correctly gives q = 0.
+        compiled = cls.compiled
+        with np.errstate(over='ignore'):
+            q_age = 1 / (1 + np.exp(compiled.phi_age * (age - compiled.a_half)))
+            q_weight = 1 / (1 + np.exp(-compiled.phi_weight *
+                                       (weight - compiled.w_half)))
+
+        # Animals without weight have zero fitness.
+        return np.where(weight <= 0.0, 0.0, q_age * q_weight)
+
     def aging(self):
         """
         The function increments age of an animal by 1.
@@ -154,7 +219,7 @@ class Animal:
 
             # Increase weight based on food value passed.
             # new_weight = old_weight + beta * food
-            self.weight += self.params["beta"] * food
+            self.weight += self.compiled.beta * food
 
             # Re-update the fitness.
             self.fitness()
@@ -182,9 +247,9 @@ class Animal:
         if self.weight < 0:
             self.weight = 0
         else:
-            self.weight -= self.params["eta"] * self.weight
+            self.weight -= self.compiled.eta * self.weight
 
-    def death(self):
+    def death(self, rng=random):
         r"""
         Checks the probability of death of each animal based on the
         fitness and omega.
@@ -193,6 +258,11 @@ class Animal:
 
                     \omega * (1 - \phi)
 
+        Parameters
+        ----------
+        rng: random.Random
+            random number stream, the random module by default
+
         Returns
         -------
         bool
@@ -202,7 +272,7 @@ class Animal:
         self.fitness()
         if self.weight == 0:
             return True
-        elif random.random() < (self.params['omega'] * (1 - self.phi)):
+        elif rng.random() < (self.compiled.omega * (1 - self.phi)):
             return True
         else:
             return False
@@ -250,7 +320,38 @@ class Animal:
         cls.mu = math.log((mu_x ** 2) / (math.sqrt(mu_x ** 2 + sigma_x ** 2)))
         cls.sigma = math.sqrt(math.log(1 + (sigma_x ** 2 / mu_x ** 2)))
 
-    def birth(self):
+    @classmethod
+    def compile_params(cls):
+        r"""
+        Compiles the class parameters into a frozen :class:`ParamRecord`,
+        together with the values derived from them: the minimum weight for
+        childbirth, mu and sigma of the child weight distribution, see
+        :func:`Animal.min_weight` and :func:`Animal.calculate_mu_sigma`.
+
+        The record is rebuilt by :func:`Animal.update_params`, and params is
+        read only otherwise, so the record always matches params.
+
+        Returns
+        -------
+
+        """
+        params = cls.params
+        if any(params[key] is None for key in ("zeta", "w_birth", "sigma_birth")):
+            # Animal itself has no parameters to compile.
+            return
+
+        cls.min_weight()
+        if params["w_birth"] > 0:
+            cls.calculate_mu_sigma()
+        else:
+            # Children cannot be born without birth weight.
+            cls.mu, cls.sigma = -math.inf, 0.0
+        cls.compiled = ParamRecord(**params,
+                                   minimum_weight=cls.minimum_weight,
+                                   birth_mu=cls.mu,
+                                   birth_sigma=cls.sigma)
+
+    def birth(self, rng=random):
         """
         Checks the probability of an animal giving birth to a child.
         A child is born with age = 0 and weight based on lognormvariate.
@@ -258,6 +359,10 @@ class Animal:
         - child weight should be greater than zero.
         - animal's weight should be greater than birth weight loss.
 
+        Parameters
+        ----------
+        rng: random.Random
+            random number stream, the random module by default
 
         Returns
         -------
@@ -266,11 +371,12 @@ class Animal:
 
         # Calculate child weight based on random lognormvariate
         # using mu and sigma as parameters.
-        child_weight: float = random.lognormvariate(self.mu, self.sigma)
+        compiled = self.compiled
+        child_weight: float = rng.lognormvariate(compiled.birth_mu, compiled.birth_sigma)
 
         # Calculate mother's weight loss after child's birth.
         # weight loss = xi * child_weight
-        weight_loss = self.params["xi"] * child_weight
+        weight_loss = compiled.xi * child_weight
 
         # Calculate minimum weight required by mother for child's birth.
         # minimum weight = zeta * (w_birth + sigma_birth)
@@ -302,25 +408,30 @@ class Animal:
             # Return None if birth is not allowed.
             return None
 
-    def migrate_prob(self):
+    def migrate_prob(self, rng=random):
         """
         Checks the probability of an animal migrating.
         probability = mu * phi
         - if probability is higher than random, animal can migrate.
         - else, animal cannot migrate.
 
+        Parameters
+        ----------
+        rng: random.Random
+            random number stream, the random module by default
+
         Returns
         -------
 
         """
-        probability = self.params["mu"] * self.phi
-        if random.random() < probability:
+        probability = self.compiled.mu * self.phi
+        if rng.random() < probability:
             return True
         else:
             return False
 
     @staticmethod
-    def migration(migration_list: list):
+    def migration(migration_list: list, rng=random):
         """
         Makes a random choice from possible migration locations
         for an animal  from the migration list.
@@ -329,6 +440,8 @@ class Animal:
         ----------
         migration_list: list
         List of possible migration locations for an animal.
+        rng: random.Random
+            random number stream, the random module by default
 
         Returns
         -------
@@ -338,7 +451,7 @@ class Animal:
         if len(migration_list) == 0:
             return None
         else:
-            return random.choice(migration_list)
+            return rng.choice(migration_list)
 
     @classmethod
     def update_params(cls, params=None):
@@ -387,5 +500,7 @@ class Animal:
                 raise ValueError(f"{key} value has to be greater than 0..")
 
         # If no validation error, update params.
-        for key in params:
-            cls.params[key] = params[key]
+        cls.params = MappingProxyType({**cls.params, **params})
+
+        # Rebuild the compiled parameters and the values derived from them.
+        cls.compile_params()
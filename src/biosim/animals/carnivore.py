@@ -1,4 +1,6 @@
 from .animal import Animal
+from operator import attrgetter
+import bisect
 import random
 
 
@@ -39,7 +41,7 @@ class Carnivore(Animal):
         # Inherit init of Animal Class.
         super().__init__(age, weight)
 
-    def feeding(self, herbivore_list: list):
+    def feeding(self, herbivore_list: list, short_circuit: bool = False, rng=random):
         """
         This checks the probability of a herbivore's killing and
         eating that herbivore.
@@ -57,6 +59,12 @@ class Carnivore(Animal):
         ----------
         herbivore_list: list
         list of herbivore on the land
+        short_circuit: bool
+        If True, herbivore_list must be sorted in ascending order of
+        fitness and herbivores at least as fit as the carnivore are not
+        tried, see :func:`Carnivore.short_circuit_feeding`.
+        rng: random.Random
+        random number stream, the random module by default
 
         Returns
         -------
@@ -65,13 +73,15 @@ class Carnivore(Animal):
         Lists of herbivores remaining.
 
         """
+        if short_circuit:
+            return self.short_circuit_feeding(herbivore_list, rng)
 
         # Capacity defines how much food carnivore is allowed
         # to eat or has eaten.
         #
         # This is initially set equal to params['F'] which is
         # max food allowed to eat.
-        capacity = self.params['F']
+        capacity = self.compiled.F
 
         # Counter is required to slice herbivore_list.
         # This is required to ensure carnivore does not attempt
@@ -93,7 +103,7 @@ class Carnivore(Animal):
             # Validate if carnivore probability to kill is higher
             # than random then carnivore is allowed to eat the
             # herbivore.
-            if random.random() <= self.prob_kill(herb.phi):
+            if rng.random() <= self.prob_kill(herb.phi):
 
                 # Validate if herbivore's weight is less than
                 # capacity.
@@ -145,6 +155,62 @@ class Carnivore(Animal):
         # not been hunted.
         return safe_herbivores + herbivore_list[counter:]
 
+    def short_circuit_feeding(self, herbivore_list: list, rng=random):
+        """
+        Same hunt as :func:`Carnivore.feeding`, for a herbivore_list sorted
+        in ascending order of fitness.
+
+        prob_kill is zero for every herbivore at least as fit as the
+        carnivore, and all herbivores after such a herbivore are fitter.
+        A binary search on the herbivore fitness therefore gives the
+        position after which no herbivore can be killed, and the hunt stops
+        there instead of drawing a random number for every herbivore. The
+        bound is searched again after each kill, since eating increases
+        the fitness of the carnivore.
+
+        Parameters
+        ----------
+        herbivore_list: list
+        list of herbivore on the land, sorted in ascending order of fitness
+        rng: random.Random
+        random number stream, the random module by default
+
+        Returns
+        -------
+        list
+        Herbivores remaining, in the same order.
+
+        """
+        phi = attrgetter("phi")
+        capacity = self.compiled.F
+        safe_herbivores = []
+
+        # Herbivores from stop on cannot be killed by this carnivore.
+        stop = bisect.bisect_left(herbivore_list, self.phi, key=phi)
+        counter = 0
+        while counter < stop:
+            herb = herbivore_list[counter]
+            counter += 1
+
+            if rng.random() <= self.prob_kill(herb.phi):
+
+                # Eat the herbivore up to the remaining capacity.
+                food = min(capacity, herb.weight)
+                self.increase_weight(food)
+                capacity -= food
+
+                # The carnivore got fitter, so fitter herbivores can be
+                # killed now.
+                stop = bisect.bisect_left(herbivore_list, self.phi,
+                                          lo=stop, key=phi)
+            else:
+                safe_herbivores.append(herb)
+
+            if capacity <= 0.0:
+                break
+
+        return safe_herbivores + herbivore_list[counter:]
+
     def prob_kill(self, fitness):
         """
         Checks the probability of Carnivore killing a Herbivore
@@ -178,8 +244,8 @@ class Carnivore(Animal):
         # If carnivore_fitness - herbivore_fitness > 0 and,
         # carnivore_fitness - herbivore_fitness > DeltaPhiMax then
         # assign value as (carnivore_fitness - herbivore_fitness)/DeltaPhiMax.
-        elif 0 < (self.phi - fitness) < self.params["DeltaPhiMax"]:
-            return (self.phi - fitness) / (self.params["DeltaPhiMax"])
+        elif 0 < (self.phi - fitness) < self.compiled.DeltaPhiMax:
+            return (self.phi - fitness) / self.compiled.DeltaPhiMax
 
         else:
             return 1
@@ -1,4 +1,5 @@
 from .animal import Animal
+from types import MappingProxyType
 
 
 class Herbivore(Animal):
@@ -63,16 +64,17 @@ class Herbivore(Animal):
 
         """
         # Validate if params['F'] is less than grass value.
-        if self.params["F"] <= grass:
+        appetite = self.compiled.F
+        if appetite <= grass:
 
             # Increase weight based on amount of grass eaten.
-            self.increase_weight(self.params['F'])
+            self.increase_weight(appetite)
 
             # Re-update fitness based on new weight.
 
             # Return amount of grass eaten which is equal to
             # params['F'].
-            return self.params['F']
+            return appetite
 
         # Validate if params['F'] is greater than grass value.
         else:
@@ -131,5 +133,7 @@ class Herbivore(Animal):
                 raise ValueError(f"{key} value has to be greater than 0..")
 
         # If no validation error, update params.
-        for key in params:
-            cls.params[key] = params[key]
+        cls.params = MappingProxyType({**cls.params, **params})
+
+        # Rebuild the compiled parameters and the values derived from them.
+        cls.compile_params()
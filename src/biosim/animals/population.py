@@ -0,0 +1,663 @@
+import numpy as np
+
+
+class AnimalView:
+    """
+    AnimalView Object
+
+    An AnimalView is a thin stand-in for an Animal whose age, weight and
+    fitness(phi) live in a row of a :class:`Population`. It offers the same
+    attributes as an Animal object so code written against the object API
+    can keep reading and updating animals of a columnar land.
+
+    A view refers to a row position, so it is only valid until the population
+    is compacted or re-assigned (death, feeding, migration).
+    """
+    __slots__ = ("population", "index")
+
+    def __init__(self, population, index: int):
+        """
+        AnimalView is initialised with the population and row it refers to.
+
+        Parameters
+        ----------
+        population : Population
+            columnar store holding the animal
+        index : int
+            row of the animal in the store
+        """
+        self.population = population
+        self.index = index
+
+    @property
+    def params(self):
+        """
+        Class parameters of the species of the animal.
+
+        Returns
+        -------
+        dict
+        """
+        return self.population.species.params
+
+    @property
+    def age(self):
+        """
+        Age of the animal.
+
+        Returns
+        -------
+        int
+        """
+        return int(self.population.age[self.index])
+
+    @age.setter
+    def age(self, value):
+        self.population.age[self.index] = value
+        self.population.mark_dirty([self.index])
+
+    @property
+    def weight(self):
+        """
+        Weight of the animal.
+
+        Returns
+        -------
+        float
+        """
+        return float(self.population.weight[self.index])
+
+    @weight.setter
+    def weight(self, value):
+        self.population.weight[self.index] = value
+        self.population.mark_dirty([self.index])
+
+    @property
+    def phi(self):
+        """
+        Fitness of the animal.
+
+        Returns
+        -------
+        float
+        """
+        return float(self.population.phi[self.index])
+
+    def __repr__(self):
+        return (f"<{self.population.species.__name__} view age={self.age}, "
+                f"weight={self.weight:.3f}, phi={self.phi:.3f}>")
+
+
+class Population:
+    """
+    Population Object
+
+    A Population object stores every animal of one species on a land object
+    column by column: one NumPy array each for age, weight and fitness(phi),
+    instead of one Animal object per animal. Land objects created with
+    ``columnar=True`` keep their herbivores and carnivores in two Population
+    objects and run the aging, death and birth cycles directly on the arrays.
+
+    The arrays are allocated with spare capacity that grows geometrically,
+    so newborns and migrants are appended without reallocating every year.
+    Fitness is evaluated lazily: changing age or weight only marks the rows
+    dirty, and reading :attr:`Population.phi` recomputes the dirty rows with
+    :func:`Animal.batch_fitness`.
+    Iterating a population yields :class:`AnimalView` objects, which keeps
+    the object API (``len(land.pop_herbivore)``, ``herb.weight`` ...) usable.
+
+    Class Parameters
+    =================
+
+    species: class
+            Animal class (Herbivore or Carnivore) whose params are used
+    """
+
+    def __init__(self, species, capacity: int = 8):
+        """
+        Population is initialised empty for the given species.
+
+        Parameters
+        ----------
+        species : class
+            Herbivore or Carnivore class
+        capacity : int
+            number of rows allocated up front
+        """
+        self.species = species
+        self.size = 0
+
+        # Allocate the columns with spare capacity; only the first
+        # self.size rows hold animals.
+        self._age = np.zeros(capacity, dtype=np.int64)
+        self._weight = np.zeros(capacity, dtype=float)
+        self._phi = np.zeros(capacity, dtype=float)
+
+        # Rows whose age or weight changed since phi was last calculated.
+        self._dirty = np.zeros(capacity, dtype=bool)
+        self._any_dirty = False
+
+        # Fitness parameters used for the values stored in self._phi.
+        self._fitness_params = self._get_fitness_params()
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (AnimalView(self, index) for index in range(self.size))
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(f"{index} is out of range for population of "
+                             f"size {self.size}.")
+        return AnimalView(self, index)
+
+    @property
+    def age(self):
+        """
+        Ages of the animals in the population.
+
+        Returns
+        -------
+        numpy.ndarray
+            view on the live rows of the age column
+        """
+        return self._age[:self.size]
+
+    @property
+    def weight(self):
+        """
+        Weights of the animals in the population.
+
+        Returns
+        -------
+        numpy.ndarray
+            view on the live rows of the weight column
+        """
+        return self._weight[:self.size]
+
+    @property
+    def phi(self):
+        """
+        Fitness of the animals in the population, recalculated for dirty
+        rows before it is returned.
+
+        Returns
+        -------
+        numpy.ndarray
+            view on the live rows of the fitness column
+        """
+        self.update_fitness()
+        return self._phi[:self.size]
+
+    def _reserve(self, size: int):
+        """
+        Grows the columns so that they can hold at least size rows.
+
+        Parameters
+        ----------
+        size: int
+            number of rows required
+
+        Returns
+        -------
+
+        """
+        capacity = len(self._age)
+        if size <= capacity:
+            return
+
+        # Grow geometrically so that repeated appends stay amortised O(1).
+        capacity = max(size, 2 * capacity)
+        for name in ("_age", "_weight", "_phi", "_dirty"):
+            column = getattr(self, name)
+            new_column = np.zeros(capacity, dtype=column.dtype)
+            new_column[:self.size] = column[:self.size]
+            setattr(self, name, new_column)
+
+    def _get_fitness_params(self):
+        """
+        Gets the species parameters the fitness depends on.
+
+        Returns
+        -------
+        tuple
+        """
+        compiled = self.species.compiled
+        return compiled.phi_age, compiled.a_half, compiled.phi_weight, compiled.w_half
+
+    def mark_dirty(self, index=None):
+        """
+        Marks rows whose age or weight changed, so that their fitness is
+        recalculated the next time it is needed.
+
+        Parameters
+        ----------
+        index: array_like
+            rows to mark, all rows if None
+
+        Returns
+        -------
+
+        """
+        if index is None:
+            index = slice(0, self.size)
+        self._dirty[index] = True
+        self._any_dirty = True
+
+    def update_fitness(self):
+        """
+        Recalculates the fitness(phi) of the dirty rows in one call to
+        :func:`Animal.batch_fitness`. Every row is recalculated if the
+        fitness parameters of the species changed since the last call.
+
+        Returns
+        -------
+
+        """
+        params = self._get_fitness_params()
+        if params != self._fitness_params:
+            self._fitness_params = params
+            self.mark_dirty()
+
+        if not self._any_dirty:
+            return
+
+        dirty = self._dirty[:self.size]
+        if dirty.all():
+            # Avoid fancy indexing when every row changed, e.g. after aging.
+            self._phi[:self.size] = self.species.batch_fitness(self.age, self.weight)
+        else:
+            index = np.flatnonzero(dirty)
+            self._phi[index] = self.species.batch_fitness(self._age[index],
+                                                          self._weight[index])
+        dirty[:] = False
+        self._any_dirty = False
+
+    def append(self, animal):
+        """
+        Appends one animal to the population.
+
+        Parameters
+        ----------
+        animal: Animal or AnimalView
+            animal whose age and weight are copied
+
+        Returns
+        -------
+
+        """
+        self._reserve(self.size + 1)
+        self._age[self.size] = animal.age
+        self._weight[self.size] = animal.weight
+        self.size += 1
+        self.mark_dirty(self.size - 1)
+
+    def extend(self, age, weight):
+        """
+        Appends several animals given as age and weight arrays.
+
+        Parameters
+        ----------
+        age: array_like
+            ages of the new animals
+        weight: array_like
+            weights of the new animals
+
+        Returns
+        -------
+
+        """
+        age = np.asarray(age)
+        weight = np.asarray(weight, dtype=float)
+        if len(age) != len(weight):
+            raise ValueError("age and weight need to have the same length.")
+
+        start, stop = self.size, self.size + len(age)
+        self._reserve(stop)
+        self._age[start:stop] = age
+        self._weight[start:stop] = weight
+        self.size = stop
+        self.mark_dirty(slice(start, stop))
+
+    def assign(self, animals):
+        """
+        Replaces the population by the animals in a list.
+
+        Parameters
+        ----------
+        animals: list
+            Animal or AnimalView objects
+
+        Returns
+        -------
+
+        """
+        # Read every value before anything is overwritten, since the list may
+        # contain views of this population.
+        values = [(animal.age, animal.weight) for animal in animals]
+        self.size = 0
+        self._reserve(len(values))
+        if values:
+            age, weight = zip(*values)
+            self._age[:len(values)] = age
+            self._weight[:len(values)] = weight
+        self.size = len(values)
+        self.mark_dirty()
+
+    def to_animals(self):
+        """
+        Creates an Animal object for every animal in the population.
+
+        Returns
+        -------
+        list
+            Herbivore or Carnivore objects
+        """
+        return [self.species(age=age, weight=weight)
+                for age, weight in zip(self.age.tolist(), self.weight.tolist())]
+
+    def compact(self, keep):
+        """
+        Removes animals from the population by moving the kept rows to the
+        front of the columns. No new arrays or lists are built.
+
+        Parameters
+        ----------
+        keep: numpy.ndarray
+            boolean mask, True for animals that stay
+
+        Returns
+        -------
+
+        """
+        count = int(np.count_nonzero(keep))
+        if count == self.size:
+            return
+        for column in (self._age, self._weight, self._phi, self._dirty):
+            column[:count] = column[:self.size][keep]
+        self.size = count
+
+    def aging(self):
+        r"""
+        Increments the age of every animal by 1 and decreases its weight by
+        eta, as :func:`Animal.aging` and :func:`Animal.decrease_weight` do.
+
+        .. math::
+
+             newweight = oldweight - \eta * oldweight.
+
+        Returns
+        -------
+
+        """
+        self.age[:] += 1
+        weight = self.weight
+        weight[:] = np.where(weight < 0, 0.0,
+                             weight - self.species.compiled.eta * weight)
+        self.mark_dirty()
+
+    def graze(self, fodder, rng):
+        r"""
+        Lets the animals eat fodder in random order, as the herbivores of
+        :func:`Land.feeding_cycle` do. Every animal eats
+
+        .. math::
+
+             \min(F, remaining fodder)
+
+        so the first ceil(fodder / F) animals of a random permutation eat,
+        and the amount each one eats follows from the prefix sums of their
+        appetites capped at the fodder available. Only the animals that ate
+        get their weight increased by beta times the amount and their rows
+        marked dirty.
+
+        Parameters
+        ----------
+        fodder: float
+            fodder available on the land object
+        rng: numpy.random.Generator
+            random number generator of the land object
+
+        Returns
+        -------
+        float
+            amount of fodder eaten
+        """
+        compiled = self.species.compiled
+        appetite = compiled.F
+        if self.size == 0 or fodder is None or fodder <= 0 or appetite <= 0:
+            return 0.0
+
+        # Only the animals drawn before the fodder runs out get to eat.
+        number = min(self.size, int(np.ceil(fodder / appetite)))
+        eaters = rng.choice(self.size, size=number, replace=False)
+
+        # consumed[i] is the fodder eaten by the first i + 1 eaters.
+        consumed = np.minimum(appetite * np.arange(1, number + 1), fodder)
+        eaten = np.diff(consumed, prepend=0.0)
+
+        self._weight[eaters] += compiled.beta * eaten
+        self.mark_dirty(eaters)
+        return float(consumed[-1])
+
+    def hunt(self, prey, rng):
+        r"""
+        Lets the animals hunt the animals of another population, as the
+        carnivores of :func:`Land.feeding_cycle` do. The fittest hunter
+        goes first and tries the weakest prey first; a prey is killed with
+        probability
+
+        .. math::
+
+             \min(1, (\phi_{hunter} - \phi_{prey}) / \Delta\Phi_{max})
+
+        or zero if the prey is at least as fit as the hunter. A hunter
+        stops after eating F.
+
+        A hunter can eat at most F, so its fitness never exceeds the fitness
+        it would have after eating F. Only prey below that bound can be
+        killed, so only those are sorted. Each hunter scans the prey weaker
+        than its own bound with one array comparison, killed prey are masked
+        out instead of removed, and the prey population is compacted once at
+        the end.
+
+        Parameters
+        ----------
+        prey: Population
+            animals that are hunted
+        rng: numpy.random.Generator
+            random number generator of the land object
+
+        Returns
+        -------
+
+        """
+        if self.size == 0 or prey.size == 0:
+            return
+
+        compiled = self.species.compiled
+        appetite = compiled.F
+        delta_phi_max = compiled.DeltaPhiMax
+        weight = self.weight
+
+        # Highest fitness each hunter can reach during this hunt.
+        bound = self.species.batch_fitness(
+            self.age, weight + compiled.beta * max(appetite, 0))
+
+        # Sort only the prey that some hunter could kill, weakest first.
+        prey_phi = prey.phi
+        rows = np.flatnonzero(prey_phi < bound.max())
+        if len(rows) == 0:
+            return
+        rows = rows[np.argsort(prey_phi[rows], kind="stable")]
+        rows_phi = prey_phi[rows]
+        rows_weight = prey.weight[rows]
+
+        hunters = np.argsort(-self.phi, kind="stable")
+        hunters_phi = self.phi[hunters].tolist()
+
+        # Prey at least as fit as a hunter can ever be are never killed by
+        # it, so each hunter only scans the prey before its stop.
+        # The stops are found once for all hunters.
+        stops = np.searchsorted(rows_phi, bound[hunters]).tolist()
+
+        for number, hunter in enumerate(hunters.tolist()):
+            stop = stops[number]
+            capacity = appetite
+            if capacity <= 0:
+                # Without appetite a hunter only tries the weakest prey.
+                stop = min(stop, 1)
+            if stop == 0:
+                continue
+
+            # A prey is killed if draw < (phi_hunter - phi_prey) / DeltaPhiMax,
+            # i.e. if phi_prey + draw * DeltaPhiMax < phi_hunter. This is
+            # never true for fitter prey, so no clipping to [0, 1] is needed.
+            threshold = rows_phi[:stop] + rng.random(stop) * delta_phi_max
+            phi = hunters_phi[number]
+            eaten = []
+            position = 0
+            while position < stop:
+                hits = np.flatnonzero(threshold[position:] < phi)
+                if len(hits) == 0:
+                    break
+
+                # Eat the first prey killed; the hunter gets fitter, which
+                # changes the kill probability of the prey after it.
+                position += int(hits[0])
+                eaten.append(position)
+                food = min(capacity, rows_weight[position])
+                weight[hunter] += compiled.beta * food
+                capacity -= food
+                if capacity <= 0:
+                    break
+                phi = float(self.species.batch_fitness(self._age[hunter],
+                                                       weight[hunter]))
+                position += 1
+
+            if eaten:
+                # Killed prey get infinite fitness so that no later hunter
+                # can kill them again; the stops stay valid.
+                self.mark_dirty([hunter])
+                rows_phi[eaten] = np.inf
+
+        # Remove the killed prey in one pass.
+        killed = rows[np.isinf(rows_phi)]
+        if len(killed) > 0:
+            keep = np.ones(prey.size, dtype=bool)
+            keep[killed] = False
+            prey.compact(keep)
+
+    def death(self, rng):
+        r"""
+        Removes the animals that die this year. An animal dies if its weight
+        is zero or with probability
+
+        .. math::
+
+                    \omega * (1 - \phi)
+
+        All uniform numbers for the population are drawn in one call, the
+        comparison is done on the whole arrays and the survivors are
+        compacted in place.
+
+        Parameters
+        ----------
+        rng: numpy.random.Generator
+            random number generator of the land object
+
+        Returns
+        -------
+
+        """
+        if self.size == 0:
+            return
+
+        draws = rng.random(self.size)
+        dies = (self.weight == 0) | \
+               (draws < self.species.compiled.omega * (1 - self.phi))
+        self.compact(~dies)
+
+    def birth(self, rng):
+        r"""
+        Lets every animal of the population give birth with probability
+
+        .. math::
+
+             \min(1, \gamma * \phi * (N - 1))
+
+        if its weight is at least the species minimum weight. Newborns are
+        appended as rows with age 0 and mothers lose xi times the weight of
+        their child, as in :func:`Animal.birth`.
+
+        The eligibility check, the uniform numbers, the lognormal child
+        weights and the weight loss are each done on whole arrays, so no
+        Animal objects are created for the newborns.
+
+        Parameters
+        ----------
+        rng: numpy.random.Generator
+            random number generator of the land object
+
+        Returns
+        -------
+
+        """
+        number = self.size
+        if number < 2:
+            return
+
+        compiled = self.species.compiled
+        weight = self.weight
+
+        # Only animals heavy enough can give birth.
+        eligible = np.flatnonzero((weight > 0) &
+                                  (weight >= compiled.minimum_weight))
+        if len(eligible) == 0:
+            return
+
+        # land_birth_prob = min(1, gamma * phi * (N - 1))
+        land_birth_prob = np.minimum(1, compiled.gamma * self.phi[eligible] *
+                                     (number - 1))
+        mothers = eligible[rng.random(len(eligible)) < land_birth_prob]
+
+        # Child weights follow the lognormal distribution with the mu and
+        # sigma compiled by Animal.compile_params.
+        child_weight = rng.lognormal(compiled.birth_mu, compiled.birth_sigma,
+                                     len(mothers))
+        weight_loss = compiled.xi * child_weight
+
+        # A child is only born if the mother can afford the weight loss.
+        born = (child_weight > 0) & (weight[mothers] > weight_loss)
+        mothers = mothers[born]
+        weight[mothers] -= weight_loss[born]
+        self.mark_dirty(mothers)
+
+        self.extend(np.zeros(len(mothers), dtype=np.int64), child_weight[born])
+
+    def get_sum_values(self):
+        """
+        Gets the sum of age, weight and fitness(phi) over the animals.
+
+        Returns
+        -------
+        dict
+        """
+        return {"age": int(self.age.sum()),
+                "weight": float(self.weight.sum()),
+                "fitness": float(self.phi.sum())}
+
+    def get_hist_values(self):
+        """
+        Gets the age, weight and fitness(phi) of every animal.
+
+        Returns
+        -------
+        dict
+        """
+        return {"age": self.age.tolist(),
+                "weight": self.weight.tolist(),
+                "fitness": self.phi.tolist()}
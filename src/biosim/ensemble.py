@@ -0,0 +1,230 @@
+"""
+BioSim ensemble runner
+"""
+
+from .island import Island
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import copy
+import random
+
+import numpy as np
+
+# Island template of a worker process, set by _init_worker.
+_template = None
+
+
+def _init_worker(island_map, ini_pop, columnar, params):
+    """
+    Sets up a worker process: sets the parameters and builds the island
+    template that every run of the worker starts from.
+
+    Parameters
+    ----------
+    island_map : str
+        Multi-line string specifying island geography
+    ini_pop : list
+        List of dictionaries specifying initial population
+    columnar : bool
+        use the columnar simulation engine
+    params : dict
+        animal and landscape parameters, see :func:`Island.set_params`
+
+    Returns
+    -------
+
+    """
+    global _template
+    _template = build_island(island_map, ini_pop, columnar, params)
+
+
+def _run_seed(seed, years):
+    """
+    Simulates the island template of the worker with one seed.
+
+    Parameters
+    ----------
+    seed : int
+        random number seed of the run
+    years : int
+        number of years to simulate
+
+    Returns
+    -------
+    tuple
+        seed and counts of the run, see :func:`run`
+    """
+    return seed, simulate_seed(_template, seed, years)
+
+
+def simulate_seed(template, seed, years):
+    """
+    Simulates a copy of an island with one seed.
+
+    Parameters
+    ----------
+    template : Island
+        island with its initial population, left unchanged
+    seed : int
+        random number seed of the run
+    years : int
+        number of years to simulate
+
+    Returns
+    -------
+    numpy.ndarray
+        number of herbivores and carnivores at the end of each year, of
+        shape ``(years + 1, 2)``, with the initial population at row 0
+    """
+    island = copy.deepcopy(template)
+
+    # Give the copy generators of its own, seeded as the island of BioSim is,
+    # so that a run gives the same counts as BioSim(island_map, ini_pop,
+    # seed) without touching the random module of the process.
+    if island.rng is not None:
+        # The land objects share the generator, so it is reseeded in place.
+        island.rng.bit_generator.state = np.random.default_rng(seed).bit_generator.state
+    else:
+        island.random = random.Random(seed)
+        for terra in island.cells:
+            terra.rng = island.random
+
+    counts = np.empty((years + 1, 2), dtype=np.int64)
+    counts[0] = island.totals
+    for year in range(1, years + 1):
+        island.annual_cycle()
+        counts[year] = island.totals
+    return counts
+
+
+def build_island(island_map, ini_pop, columnar=False, params=None):
+    """
+    Creates an island with its initial population.
+
+    Parameters
+    ----------
+    island_map : str
+        Multi-line string specifying island geography
+    ini_pop : list
+        List of dictionaries specifying initial population
+    columnar : bool
+        use the columnar simulation engine
+    params : dict
+        animal and landscape parameters of the island, in the format of
+        :func:`Island.get_params`; the island has a parameter context of its
+        own (see :func:`Island.new_context`), so the parameters of the
+        Island class are left unchanged
+
+    Returns
+    -------
+    Island
+    """
+    context = Island.new_context()
+    if params is not None:
+        context.set_params(params)
+    island = context(island_map, columnar=columnar)
+    island.add_neighbors()
+    for pop_dict in ini_pop:
+        island.add_pop(pop_dict.get('loc'), pop_dict.get('pop'))
+    return island
+
+
+def resolve_params(params):
+    """
+    Full set of parameters for worker processes: the current parameters of
+    this process with params set on top, checked by setting them on a
+    parameter context of their own, see :func:`Island.new_context`.
+
+    Parameters
+    ----------
+    params : dict
+        animal and landscape parameters keyed by species name and landscape
+        letter, or None
+
+    Returns
+    -------
+    dict
+        parameters in the format of :func:`Island.get_params`
+
+    Raises
+    ------
+    ValueError
+        If a key or a parameter value is wrong
+    """
+    resolved = Island.get_params()
+    for key, values in (params or {}).items():
+        if key not in resolved:
+            raise ValueError(f"{key} is neither a species nor a landscape type.")
+        resolved[key].update(values)
+
+    Island.new_context().set_params(resolved)
+    return resolved
+
+
+def run(island_map, ini_pop, seeds, years, params=None, workers=None, columnar=True):
+    """
+    Simulates one scenario with many seeds in parallel worker processes.
+
+    Every worker process sets the parameters and builds the island once,
+    and starts each of its runs from a copy of that island. Only the island
+    modules are imported in the workers, no visualization.
+
+    Parameters
+    ----------
+    island_map : str
+        Multi-line string specifying island geography
+    ini_pop : list
+        List of dictionaries specifying initial population
+    seeds : iterable
+        random number seeds, one run per seed
+    years : int
+        number of years to simulate
+    params : dict
+        animal and landscape parameters set on top of the current ones, keyed
+        by species name and landscape letter, e.g.
+        ``{'Herbivore': {'zeta': 3.0}, 'L': {'f_max': 700}}``
+    workers : int
+        number of worker processes (default: number of CPUs)
+    columnar : bool
+        use the columnar simulation engine
+
+    Returns
+    -------
+    generator
+        yields ``(seed, counts)`` for every run as it finishes, where counts
+        is an array of shape ``(years + 1, 2)`` holding the number of
+        herbivores and carnivores at the end of each year, with the initial
+        population at row 0
+
+    Raises
+    ------
+    ValueError
+        If years is not a non-negative integer or a parameter is wrong
+    """
+    if type(years) is not int or years < 0:
+        raise ValueError("years needs to be a non-negative integer.")
+
+    # Validate the map, population and parameters here rather than in the
+    # workers. The workers get the current parameters of this process, so
+    # that they do not depend on how the processes are started.
+    worker_params = resolve_params(params)
+    build_island(island_map, ini_pop, columnar, worker_params)
+
+    return _stream(island_map, ini_pop, list(seeds), years, worker_params,
+                   workers, columnar)
+
+
+def _stream(island_map, ini_pop, seeds, years, params, workers, columnar):
+    """
+    Runs the seeds in a process pool and yields the results as they finish,
+    see :func:`run`.
+
+    Returns
+    -------
+    generator
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(island_map, ini_pop, columnar,
+                                       params)) as executor:
+        futures = [executor.submit(_run_seed, seed, years) for seed in seeds]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,151 @@
+"""
+BioSim frame writer
+"""
+
+import atexit
+import queue
+import threading
+
+import matplotlib.image as mpimg
+
+
+class FrameWriter:
+    """
+    FrameWriter Object
+
+    The FrameWriter object encodes and writes image frames in a background
+    thread, so that the simulation goes on while the previous frames are
+    written. A frame is the RGBA buffer of a rendered figure; it is put on a
+    queue of at most queue_size frames, and :func:`FrameWriter.write` waits
+    while the queue is full, which caps the memory held by frames not yet
+    written.
+
+    :func:`FrameWriter.flush` waits until every frame is written
+    (:func:`BioSim.simulate` does so before it returns), and raises the
+    first error of the background thread. :func:`FrameWriter.close` (called
+    by :func:`BioSim.close`) also stops the thread; a writer that is not
+    closed is closed when the interpreter exits.
+
+    Class Parameters
+    =================
+
+    formats: tuple
+            image formats encoded from an RGBA buffer, other formats such
+            as pdf or svg need the figure itself
+    """
+    formats = ("png", "jpg", "jpeg", "tiff", "webp", "bmp")
+
+    def __init__(self, queue_size=4):
+        """
+        FrameWriter is initialised with the size of its queue, and starts
+        its background thread.
+
+        Parameters
+        ----------
+        queue_size : int
+            number of frames queued before write waits for the thread
+
+        Raises
+        ------
+        ValueError
+            If queue_size is not a positive integer
+        """
+        if type(queue_size) is not int or queue_size < 1:
+            raise ValueError("queue_size needs to be a positive integer.")
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.error = None
+
+        # A daemon thread, so that a writer that is never closed does not
+        # keep the interpreter alive. Daemon threads are stopped at exit
+        # wherever they are, so the writer is closed before, to write the
+        # frames still queued.
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def write(self, path, rgba, fmt, dpi):
+        """
+        Queues a frame to be written.
+
+        Parameters
+        ----------
+        path : str
+            path of the image file
+        rgba : numpy.ndarray
+            RGBA buffer of the frame, of shape ``(height, width, 4)``; it is
+            written later, so it must not be changed afterwards
+        fmt : str
+            image format, one of :attr:`FrameWriter.formats`
+        dpi : float
+            resolution stored in the image file
+
+        Returns
+        -------
+
+        Raises
+        ------
+        RuntimeError
+            If the writer is closed
+        """
+        if not self.thread.is_alive():
+            raise RuntimeError("The frame writer is closed.")
+        self.queue.put((path, rgba, fmt, dpi))
+
+    def _run(self):
+        """
+        Writes the queued frames, until it gets None.
+
+        Returns
+        -------
+
+        """
+        while True:
+            frame = self.queue.get()
+            try:
+                if frame is None:
+                    return
+                path, rgba, fmt, dpi = frame
+                try:
+                    mpimg.imsave(path, rgba, format=fmt, dpi=dpi)
+                except Exception as error:
+                    # Keep the first error for flush, and go on writing.
+                    if self.error is None:
+                        self.error = error
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """
+        Waits until every queued frame is written.
+
+        Returns
+        -------
+
+        Raises
+        ------
+        Exception
+            the first error of writing a frame since the last flush
+        """
+        self.queue.join()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def close(self):
+        """
+        Writes the queued frames and stops the background thread.
+
+        Returns
+        -------
+
+        Raises
+        ------
+        Exception
+            the first error of writing a frame since the last flush
+        """
+        atexit.unregister(self.close)
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        self.flush()
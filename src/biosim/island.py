@@ -1,8 +1,12 @@
+from .animals.herbivore import Herbivore
+from .animals.carnivore import Carnivore
 from .land.lowland import LowLand
 from .land.desert import Desert
 from .land.highland import HighLand
 from .land.water import Water
 
+import random
+
 import numpy as np
 
 
@@ -14,9 +18,19 @@ class Island:
     the island objects converts the geogr into multiple land objects with
     individual locations, it also stores all this land objects.
     The island object runs the bio simulation lifecycle.
+
+    The animal and landscape classes of the island, and so its parameters,
+    are those of the class attributes species and land_types. These are the
+    classes of the biosim modules, with parameters shared by the whole
+    process, unless the island is an instance of a parameter context
+    created by :func:`Island.new_context`.
     """
+    # Animal classes keyed by species name, and land classes keyed by
+    # landscape letter.
+    species = {"Herbivore": Herbivore, "Carnivore": Carnivore}
+    land_types = {'L': LowLand, 'H': HighLand, 'D': Desert, 'W': Water}
 
-    def __init__(self, geogr):
+    def __init__(self, geogr, columnar=False, seed=None, cell_streams=False):
         """
 
 
@@ -30,31 +44,208 @@ class Island:
         geogr : str
 
             Multi line string specifying Island geography , parsed in from simulation file
+
+        columnar : bool
+
+            If True, every land object stores its animals in Population arrays
+
+        seed : int
+
+            Seed of the random generator shared by the land objects: a NumPy
+            generator on columnar islands and a random.Random stream otherwise.
+            Object land objects draw from the random module if seed is None.
+
+        cell_streams : bool
+
+            If True, every habitable land object draws from its own random
+            stream, derived from seed and its location, see :func:`Island.cell_rng`
         """
         self.island = {}
+        self.columnar = columnar
+        self.seed = seed
+        self.cell_streams = cell_streams
+
+        # Columnar land objects draw random numbers from one shared generator,
+        # unless they have streams of their own.
+        self.rng = np.random.default_rng(seed) if columnar else None
+
+        # Object land objects share a random.Random stream of the island if
+        # it has a seed. Seeded like the random module, it draws the same
+        # numbers as random.seed(seed) did.
+        self.random = random.Random(seed) if seed is not None and not columnar else None
 
         # self.count_herb = 0
         # self.count_carn = 0
-        for y, line in enumerate(geogr.splitlines()):
+        lines = geogr.splitlines()
+
+        # Dense cell index: every land object gets a number, in the order of
+        # self.island, and grid[y - 1, x - 1] is the number of the land object
+        # at location (y, x), or -1 if the (ragged) map has no land there.
+        self.cells = []
+        self.grid = np.full((len(lines), max(map(len, lines), default=0)), -1,
+                            dtype=np.int64)
+        for y, line in enumerate(lines):
             for x, letters in enumerate(list(line)):
 
-                if letters == 'L':
-                    self.island[(y + 1, x + 1)] = LowLand()
-                elif letters == 'H':
-                    self.island[(y + 1, x + 1)] = HighLand()
-                elif letters == 'D':
-                    self.island[(y + 1, x + 1)] = Desert()
-                elif letters == 'W':
-                    self.island[(y + 1, x + 1)] = Water()
-                else:
+                if letters not in self.land_types:
                     raise ValueError(f"{letters} does not exists in landscape"
                                      f"types. Please check map again.")
+                land_type = self.land_types[letters]
+                if cell_streams and letters != 'W':
+                    rng = self.cell_rng((y + 1, x + 1))
+                else:
+                    rng = self.rng if columnar else self.random
+                self.island[(y + 1, x + 1)] = land_type(columnar, rng)
+
+                self.grid[y, x] = len(self.cells)
+                self.cells.append(self.island[(y + 1, x + 1)])
+
+        self.locations = list(self.island)
+        self.habitable = np.array([terra.habitable for terra in self.cells], dtype=bool)
+
+        # Flat position of every cell in the grid, used to scatter per cell
+        # values into matrices.
+        self.flat_index = np.flatnonzero(self.grid >= 0)
+
+        # neighbor_index[i, :neighbor_count[i]] holds the cell numbers of the
+        # neighbors of cell i, in the order below, padded with -1.
+        # The grid is padded with -1 so that the border needs no special case,
+        # and since locations start at 1 they index the padded grid directly.
+        padded = np.pad(self.grid, 1, constant_values=-1)
+        y, x = np.array(self.locations, dtype=np.int64).reshape(-1, 2).T
+        neighbors = np.stack([padded[y + 1, x],
+                              padded[y - 1, x],
+                              padded[y, x + 1],
+                              padded[y, x - 1]], axis=1)
+        order = np.argsort(neighbors < 0, axis=1, kind="stable")
+        self.neighbor_index = np.take_along_axis(neighbors, order, axis=1)
+        self.neighbor_count = np.count_nonzero(neighbors >= 0, axis=1)
+
+        # Active cells are the habitable land objects with animals. Only
+        # those are visited by the annual cycle and the count queries; the
+        # bitmap is updated by add_pop, migration and the death cycle.
+        self.active = np.zeros(len(self.cells), dtype=bool)
+
+        # Number of herbivores (row 0) and carnivores (row 1) on every land
+        # object, and their totals over the island. Updated together with
+        # the active bitmap, so that count queries need no island scan.
+        self.counts = np.zeros((2, len(self.cells)), dtype=np.int64)
+        self.totals = np.zeros(2, dtype=np.int64)
+
+    def stream_key(self, loc):
+        """
+        Key of the random stream of the land object at a location, unique
+        on the island map.
+
+        Parameters
+        ----------
+        loc : tuple
+            location of the land object
+
+        Returns
+        -------
+        tuple
+        """
+        return tuple(loc)
+
+    def cell_rng(self, loc):
+        """
+        Creates the random stream of the land object at a location, from the
+        seed of the island and :func:`Island.stream_key`. The streams of the
+        land objects are independent, so the land objects can be processed
+        in any order, or in parallel, with the same results.
+
+        Parameters
+        ----------
+        loc : tuple
+            location of the land object
+
+        Returns
+        -------
+        numpy.random.Generator or random.Random
+            NumPy generator on columnar islands, random.Random stream otherwise
+        """
+        sequence = np.random.SeedSequence(self.seed, spawn_key=self.stream_key(loc))
+        if self.columnar:
+            return np.random.default_rng(sequence)
+        return random.Random(int(sequence.generate_state(1, np.uint64)[0]))
+
+    def get_stream_states(self):
+        """
+        States of the random streams of the land objects, for islands with
+        cell streams.
+
+        Returns
+        -------
+        list
+            state of every land object with its own stream, in cell order,
+            None for the others; JSON serialisable
+        """
+        states = []
+        for terra in self.cells:
+            if terra.rng is None or terra.rng is self.rng:
+                states.append(None)
+            elif self.columnar:
+                states.append(terra.rng.bit_generator.state)
+            else:
+                states.append(terra.rng.getstate())
+        return states
+
+    def set_stream_states(self, states):
+        """
+        Restores the states of the random streams of the land objects.
+
+        Parameters
+        ----------
+        states : list
+            states as returned by :func:`Island.get_stream_states`, possibly
+            after a JSON round trip
+
+        Returns
+        -------
+
+        """
+        for terra, state in zip(self.cells, states):
+            if state is None:
+                continue
+            if self.columnar:
+                terra.rng.bit_generator.state = state
+            else:
+                version, internal_state, gauss_next = state
+                terra.rng.setstate((version, tuple(internal_state), gauss_next))
+
+    def cell_index(self, loc):
+        """
+        Gets the number of the land object at a location
+
+        Parameters
+        ----------
+        loc : tuple
+            Location (y, x) of the land object
+
+        Returns
+        -------
+        int
+            index of the land object in self.cells
+
+        Raises
+        ------
+
+        ValueError:
+            If the location does not exist on the island
+        """
+        y, x = loc
+        if not (1 <= y <= self.grid.shape[0] and 1 <= x <= self.grid.shape[1]) or \
+                self.grid[y - 1, x - 1] < 0:
+            raise ValueError(f'{loc} does not exist')
+        return int(self.grid[y - 1, x - 1])
 
     def add_neighbors(self):
         """
 
-        The function takes each land instance on the island, checks the land neighbours,
-        and adds them to a list which is parsed to the add_neighbor_list function
+        The function takes each land instance on the island, reads its neighbours
+        from the neighbor_index table, and adds their locations to a list which
+        is parsed to the add_neighbor_list function
 
         Returns
         -------
@@ -63,18 +254,10 @@ class Island:
                 list of neighboring land location values(tuples)
 
         """
-        for loc, land in self.island.items():
-            neighbors = [(loc[0] + 1, loc[1]),
-                         (loc[0] - 1, loc[1]),
-                         (loc[0], loc[1] + 1),
-                         (loc[0], loc[1] - 1)]
-
-            neighbors_list = []
-            for neighbor in neighbors:
-                if neighbor in self.island.keys():
-                    neighbors_list.append(neighbor)
-
-            land.add_neighbor_list(neighbors_list)
+        for cell, land in enumerate(self.cells):
+            neighbors = self.neighbor_index[cell, :self.neighbor_count[cell]]
+            land.add_neighbor_list([self.locations[neighbor]
+                                    for neighbor in neighbors.tolist()])
 
     def add_pop(self, loc, pop):
         """
@@ -106,19 +289,43 @@ class Island:
         """
         if loc[0] and loc[1] is not None:
 
-            # Validate if location exists.
-            if loc not in self.island.keys():
-                raise ValueError(f'{loc} does not exist')
+            # Validate if location exists and look up its land object.
+            cell = self.cell_index(loc)
+            territory = self.cells[cell]
+            territory.insert_pop(pop)
+            self.update_counts([cell])
+
+    def update_counts(self, cells=None):
+        """
+        Recounts the animals of land objects, updating the per land object
+        counts, the island totals and the active bitmap. A land object is
+        active if it is habitable and has animals.
 
-            for key in self.island:
-                if key == loc:
-                    land_location = loc
-                    territory = self.island[land_location]
-                    territory.insert_pop(pop)
-                    break
+        Parameters
+        ----------
+        cells : list
+            numbers of the land objects to recount, all land objects if None.
+            Use None after changing land populations without add_pop.
 
-    @staticmethod
-    def update_params(val1, val2, params):
+        Returns
+        -------
+
+        """
+        if cells is None:
+            cells = range(len(self.cells))
+        for cell in cells:
+            terra = self.cells[cell]
+            herbivores, carnivores = len(terra.pop_herbivore), len(terra.pop_carnivore)
+
+            # Keep the totals in step with the change on this land object.
+            self.totals[0] += herbivores - self.counts[0, cell]
+            self.totals[1] += carnivores - self.counts[1, cell]
+            self.counts[0, cell] = herbivores
+            self.counts[1, cell] = carnivores
+            self.active[cell] = bool(terra.habitable) and herbivores + carnivores > 0
+
+    @classmethod
+    def update_params(cls, val1, val2, params):
         """
 
         Takes the dictionary of parameters that should be updated,
@@ -161,21 +368,65 @@ class Island:
                              f"{params} is not a dictionary.")
 
         if val1 == 'animal':
-            LowLand.set_animal_params(val2, params)
+            cls.land_types['L'].set_animal_params(val2, params)
         elif val1 == 'landscape':
-            if val2 == 'L':
-                LowLand.set_land_params(params)
-            elif val2 == 'H':
-                HighLand.set_land_params(params)
-            elif val2 == 'D':
-                Desert.set_land_params(params)
-            elif val2 == 'W':
-                Water.set_land_params(params)
+            if val2 in cls.land_types:
+                cls.land_types[val2].set_land_params(params)
             else:
                 raise ValueError(f"Landscape parameter {val1} does not exist")
 
-    @staticmethod
-    def update_animal_island_values():
+    @classmethod
+    def get_params(cls):
+        """
+        Snapshot of the class level animal and landscape parameters of the
+        island class
+
+        Returns
+        -------
+        dict
+            copies of the parameters of each species, keyed by species name,
+            and the f_max of each landscape type, keyed by its letter, in the
+            format taken by :func:`Island.set_params`
+        """
+        return {"Herbivore": dict(cls.species["Herbivore"].params),
+                "Carnivore": dict(cls.species["Carnivore"].params),
+                "L": {"f_max": cls.land_types['L'].f_max},
+                "H": {"f_max": cls.land_types['H'].f_max},
+                "D": {"f_max": cls.land_types['D'].f_max}}
+
+    @classmethod
+    def set_params(cls, params):
+        """
+        Sets animal and landscape parameters from one dictionary
+
+        Parameters
+        ----------
+        params: dict
+            parameters of species names and landscape letters, as returned
+            by :func:`Island.get_params`; parameters left out are unchanged
+
+        Returns
+        -------
+
+        Raises
+        ------
+        ValueError:
+            if a key is neither a species nor a landscape type
+        """
+        for key, values in params.items():
+            if key in ("Herbivore", "Carnivore"):
+                # Unset parameters (Herbivore DeltaPhiMax) cannot be passed in.
+                cls.update_params('animal', key, {name: value
+                                                  for name, value in values.items()
+                                                  if value is not None})
+            elif key in ("L", "H", "D", "W"):
+                cls.update_params('landscape', key, values)
+            else:
+                raise ValueError(f"{key} is neither a species nor a landscape type.")
+        cls.update_animal_island_values()
+
+    @classmethod
+    def update_animal_island_values(cls):
         """
         Set Minimum weight
 
@@ -184,7 +435,37 @@ class Island:
         -------
 
         """
-        LowLand.update_animal_values()
+        cls.land_types['L'].update_animal_values()
+
+    @classmethod
+    def new_context(cls):
+        """
+        Creates a parameter context: a subclass of the island class with
+        subclasses of its animal and land classes, holding copies of their
+        current parameters.
+
+        Parameters set on the context or its instances, e.g. with
+        :func:`Island.set_params`, only apply to the islands of the context,
+        and parameters set on other classes afterwards do not reach it, so
+        that many simulations with their own parameters can run in one
+        process.
+
+        Returns
+        -------
+        type
+            Island subclass of the context
+        """
+        species = {name: type(animal.__name__, (animal,), {"params": dict(animal.params)})
+                   for name, animal in cls.species.items()}
+        land_types = {letter: type(land.__name__, (land,),
+                                   {"f_max": land.f_max,
+                                    "herbivore_class": species["Herbivore"],
+                                    "carnivore_class": species["Carnivore"]})
+                      for letter, land in cls.land_types.items()}
+        context = type(cls.__name__, (cls,), {"species": species,
+                                              "land_types": land_types})
+        context.update_animal_island_values()
+        return context
 
     def annual_cycle(self):
         """
@@ -214,57 +495,341 @@ class Island:
         Call death_cycle
 
 
+        Columnar islands migrate the animals of all land objects at once,
+        see :func:`Island.columnar_migration`.
+
         Returns
         -------
 
         """
+        if self.columnar:
+            self.columnar_feeding_migration_cycle()
+            self.columnar_aging_death_cycle()
+            return
+
+        # Land objects without animals are skipped. Their fodder is regrown
+        # when they are next visited, right before anything eats it.
+        for cell in np.flatnonzero(self.active).tolist():
+            terra, loc = self.cells[cell], self.locations[cell]
+            terra.birth_cycle()
+            terra.regrow()
+            terra.feeding_cycle()
+
+            # Extract a dictionary for both herbivore and carnivore that choose
+            # to migrate.
+            # Ex:  migration_herbivore = {(1,1):[A1,A2,A3], (1,2):[A4,A5]}
+            migration_herbivore, migration_carnivore = terra.migration_cycle()
+
+            # Insert the herbivores that choose to migrate into the other
+            # location in their migrate population.
+            for location, population in migration_herbivore.items():
+                if self.island[location].habitable:
+                    self.island[location].add_migration_pop(population, "Herbivore")
+                    self.active[self.cell_index(location)] = True
+                else:
+
+                    # If other location is water, insert the animals back to
+                    # their own location's migration population.
+                    self.island[loc].add_migration_pop(population, "Herbivore")
 
-        for loc, terra in self.island.items():
-            if terra.habitable:
-                terra.birth_cycle()
-                terra.regrow()
-                terra.feeding_cycle()
+            # Insert the carnivores that choose to migrate into the other
+            # location in their migrate population.
+            for location, population in migration_carnivore.items():
+                if self.island[location].habitable:
+                    self.island[location].add_migration_pop(population, "Carnivore")
+                    self.active[self.cell_index(location)] = True
+                else:
 
-                # Extract a dictionary for both herbivore and carnivore that choose
-                # to migrate.
-                # Ex:  migration_herbivore = {(1,1):[A1,A2,A3], (1,2):[A4,A5]}
-                migration_herbivore, migration_carnivore = terra.migration_cycle()
+                    # If other location is water, insert the animals back to
+                    # their own location's migration population.
+                    self.island[loc].add_migration_pop(population, "Carnivore")
 
-                # Insert the herbivores that choose to migrate into the other
-                # location in their migrate population.
-                for location, population in migration_herbivore.items():
-                    if self.island[location].habitable:
-                        self.island[location].add_migration_pop(population, "Herbivore")
-                    else:
+        # Visit the land objects that received migrants as well.
+        cells = np.flatnonzero(self.active).tolist()
+        for cell in cells:
+            terra = self.cells[cell]
 
-                        # If other location is water, insert the animals back to
-                        # their own location's migration population.
-                        self.island[loc].add_migration_pop(population, "Herbivore")
+            # Combine migration population with original population.
+            terra.combine_pop()
 
-                # Insert the carnivores that choose to migrate into the other
-                # location in their migrate population.
-                for location, population in migration_carnivore.items():
-                    if self.island[location].habitable:
-                        self.island[location].add_migration_pop(population, "Carnivore")
-                    else:
+            terra.aging_cycle()
+            terra.death_cycle()
+
+        # Land objects emptied by hunting, migration or death become inactive.
+        self.update_counts(cells)
+
+    def columnar_feeding_migration_cycle(self, defer=False):
+        """
+        First half of the annual cycle of a columnar island: birth, regrow
+        and feeding on every active land object, then migration.
+
+        Parameters
+        ----------
+        defer : bool
+            If True, return the migrants instead of adding them to their
+            destinations, see :func:`Island.columnar_migration`
+
+        Returns
+        -------
+        dict
+            the migrants if defer is set
+        """
+        for cell in np.flatnonzero(self.active).tolist():
+            terra = self.cells[cell]
+            terra.birth_cycle()
+            terra.regrow()
+            terra.feeding_cycle()
+
+        # Migrants are added straight to the population of their new land
+        # object, so no combine_pop is needed.
+        return self.columnar_migration(defer)
+
+    def columnar_aging_death_cycle(self):
+        """
+        Second half of the annual cycle of a columnar island: aging and death
+        on every active land object, then recounting them.
+
+        Returns
+        -------
+
+        """
+        cells = np.flatnonzero(self.active).tolist()
+        for cell in cells:
+            terra = self.cells[cell]
+            terra.aging_cycle()
+            terra.death_cycle()
+        self.update_counts(cells)
+
+    def columnar_migration(self, defer=False):
+        r"""
+        Migrates the animals of every land object of a columnar island in a
+        few array operations per species, instead of building per land
+        migration dictionaries.
+
+            - Every animal on the island migrates with probability
+
+            .. math::
+
+                 \mu * \phi
+
+            - A migrating animal picks one of the neighbors of its land
+              object from the neighbor_index table at random
+
+            - If the neighbor is not habitable the animal stays
+
+        The migrants are removed from their land objects, sorted by
+        destination and appended to each destination with one call to
+        :func:`Population.extend`, in the order of the land objects they
+        came from. Animals only migrate once a year, since all decisions are
+        made before any animal moves. With cell streams, each land object
+        draws the decisions of its animals from its own stream.
+
+        Parameters
+        ----------
+        defer : bool
+            If True, the migrants are not added to their destinations but
+            returned, for the caller to add.
+
+        Returns
+        -------
+        dict
+            if defer is set, destination, origin, age and weight of the
+            migrants of each species, as arrays in the order of their origin
+        """
+        arrivals = {}
+        cells = np.flatnonzero(self.active)
+        for species, name in (("herbivores", "Herbivore"), ("carnivores", "Carnivore")):
+            arrivals[name] = tuple(np.zeros(0, dtype=dtype) for dtype in
+                                   (np.int64, np.int64, np.int64, float))
+            populations = [getattr(self.cells[cell], species) for cell in cells]
+            sizes = np.array([len(population) for population in populations])
+            if sizes.sum() == 0:
+                continue
+
+            # Land object of every animal, in the order of the concatenated
+            # columns.
+            source = np.repeat(cells, sizes)
+            phi = np.concatenate([population.phi for population in populations])
+            mu = populations[0].species.compiled.mu
+
+            # Animals that choose to migrate and have somewhere to go, and
+            # the neighbor each of them picks.
+            if self.cell_streams:
+                movers, choice = self._cell_migration_draws(cells, sizes, phi, mu)
+            else:
+                movers = np.flatnonzero(self.rng.random(len(phi)) < mu * phi)
+                movers = movers[self.neighbor_count[source[movers]] > 0]
+                choice = self.rng.integers(self.neighbor_count[source[movers]])
+            if len(movers) == 0:
+                continue
+            destination = self.neighbor_index[source[movers], choice]
+
+            # Animals heading for water stay where they are.
+            movers = movers[self.habitable[destination]]
+            destination = destination[self.habitable[destination]]
+            if len(movers) == 0:
+                continue
+
+            age = np.concatenate([population.age for population in populations])[movers]
+            weight = np.concatenate([population.weight
+                                     for population in populations])[movers]
+
+            # Remove the migrants from the land objects they leave.
+            keep = np.ones(len(phi), dtype=bool)
+            keep[movers] = False
+            offsets = np.cumsum(sizes)[:-1]
+            for population, population_keep in zip(populations, np.split(keep, offsets)):
+                population.compact(population_keep)
+
+            if defer:
+                arrivals[name] = (destination, source[movers], age, weight)
+                continue
+
+            # Append the migrants to their destinations, one block each.
+            order = np.argsort(destination, kind="stable")
+            destination, age, weight = destination[order], age[order], weight[order]
+            targets, starts = np.unique(destination, return_index=True)
+            stops = np.append(starts[1:], len(destination))
+            for target, start, stop in zip(targets.tolist(), starts.tolist(), stops.tolist()):
+                getattr(self.cells[target], species).extend(age[start:stop],
+                                                            weight[start:stop])
+            self.active[targets] = True
+
+        if defer:
+            return arrivals
+
+    def _cell_migration_draws(self, cells, sizes, phi, mu):
+        """
+        Migration decisions of the animals of the given land objects, each
+        land object drawing from its own stream.
+
+        Parameters
+        ----------
+        cells : numpy.ndarray
+            numbers of the land objects
+        sizes : numpy.ndarray
+            number of animals of each land object
+        phi : numpy.ndarray
+            fitness of the animals, concatenated in the order of cells
+        mu : float
+            migration parameter of the species
+
+        Returns
+        -------
+        tuple
+            positions of the migrating animals in phi, and the neighbor
+            number each of them picks
+        """
+        movers, choice = [], []
+        start = 0
+        for cell, size in zip(cells.tolist(), sizes.tolist()):
+            if size == 0:
+                continue
+            rng = self.cells[cell].rng
+            cell_movers = np.flatnonzero(rng.random(size) < mu * phi[start:start + size])
+            if self.neighbor_count[cell] > 0 and len(cell_movers):
+                movers.append(cell_movers + start)
+                choice.append(rng.integers(self.neighbor_count[cell], size=len(cell_movers)))
+            start += size
+        if not movers:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(movers), np.concatenate(choice)
+
+    def get_animal_arrays(self):
+        """
+
+        Gets the land object number, age and weight of every animal on the
+        island as arrays, one set per species. Within a land object the
+        animals keep their order.
+
+        Returns
+        -------
+
+        animal_arrays :dict
+            {"Herbivore": {"cell": ..., "age": ..., "weight": ...},
+            "Carnivore": {...}}
 
-                        # If other location is water, insert the animals back to
-                        # their own location's migration population.
-                        self.island[loc].add_migration_pop(population, "Carnivore")
+        """
+        animal_arrays = {}
+        for species, attribute in (("Herbivore", "pop_herbivore"),
+                                   ("Carnivore", "pop_carnivore")):
+            cells, ages, weights = [], [], []
+            for cell in np.flatnonzero(self.active).tolist():
+                population = getattr(self.cells[cell], attribute)
+                if self.columnar:
+                    ages.append(population.age.copy())
+                    weights.append(population.weight.copy())
+                else:
+                    ages.append(np.array([animal.age for animal in population],
+                                         dtype=np.int64))
+                    weights.append(np.array([animal.weight for animal in population],
+                                            dtype=float))
+                cells.append(np.full(len(population), cell, dtype=np.int64))
+
+            animal_arrays[species] = {
+                "cell": np.concatenate(cells) if cells else np.zeros(0, dtype=np.int64),
+                "age": np.concatenate(ages) if ages else np.zeros(0, dtype=np.int64),
+                "weight": np.concatenate(weights) if weights else np.zeros(0)}
+        return animal_arrays
+
+    def insert_animal_arrays(self, species, cell, age, weight):
+        """
+
+        Adds animals given as arrays of land object number, age and weight,
+        the inverse of :func:`Island.get_animal_arrays`. Columnar land objects
+        take the arrays as they are; object land objects get one Animal object
+        per animal.
+
+        Parameters
+        ----------
+        species : str
+            Herbivore or Carnivore
+        cell : array_like
+            number of the land object of every animal
+        age : array_like
+            age of every animal
+        weight : array_like
+            weight of every animal
 
-        for terra in self.island.values():
-            if terra.habitable:
+        Returns
+        -------
 
-                # Combine migration population with original population.
-                terra.combine_pop()
+        Raises
+        ------
 
-                terra.aging_cycle()
-                terra.death_cycle()
+        ValueError:
+            If species does not exist or an animal is placed in water
+
+        """
+        if species not in ("Herbivore", "Carnivore"):
+            raise ValueError(f"{species} does not exists.")
+        cell, age, weight = np.asarray(cell), np.asarray(age), np.asarray(weight)
+        if len(cell) and not self.habitable[cell].all():
+            raise ValueError("Animals cannot be placed in water.")
+
+        # Insert the animals of one land object at a time, keeping their order.
+        order = np.argsort(cell, kind="stable")
+        cell, age, weight = cell[order], age[order], weight[order]
+        targets, starts = np.unique(cell, return_index=True)
+        stops = np.append(starts[1:], len(cell))
+        for target, start, stop in zip(targets.tolist(), starts.tolist(), stops.tolist()):
+            terra = self.cells[target]
+            if self.columnar:
+                population = terra.herbivores if species == "Herbivore" else terra.carnivores
+                population.extend(age[start:stop], weight[start:stop])
+            else:
+                animal = self.species[species]
+                population = terra.pop_herbivore if species == "Herbivore" \
+                    else terra.pop_carnivore
+                population.extend(animal(age=a, weight=w) for a, w in
+                                  zip(age[start:stop].tolist(), weight[start:stop].tolist()))
+        self.update_counts(targets.tolist())
 
     def animal_count(self):
         """
 
-        this adds the total number herbivore and carnivores to get the total animals
+        this adds the total number herbivore and carnivores to get the total animals,
+        from the counters kept by :func:`Island.update_counts`
 
         Returns
         -------
@@ -272,17 +837,15 @@ class Island:
         total_count: int
                 Total number of animals on an Island
         """
-        total_count = 0
-        for counts in self.num_animals_species.values():
-            total_count += counts
-        return total_count
+        return int(self.totals.sum())
 
     @property
     def num_animals_species(self):
         """
 
         gets the total number of herbivores and carnivores
-        for each land iteration
+        from the counters kept by :func:`Island.update_counts`,
+        without visiting the land objects
 
         Returns
         -------
@@ -297,68 +860,134 @@ class Island:
 
 
         """
-        count_herbivore = 0
-        count_carnivore = 0
-        for terra in self.island.values():
-            count_herbivore += len(terra.pop_herbivore)
-            count_carnivore += len(terra.pop_carnivore)
-        return {"Herbivore": count_herbivore,
-                "Carnivore": count_carnivore}
+        return {"Herbivore": int(self.totals[0]),
+                "Carnivore": int(self.totals[1])}
 
-    def get_histogram(self):
+    def get_mean_values(self):
         """
 
-        Get animal dictionary
+        Gets the mean age, weight and fitness of each species on the island,
+        from the sums of the active land objects and the island counters
+
+        Returns
+        -------
+
+        mean_values :dict
+            mean age, weight and fitness of each species, zero for a species
+            without animals
 
-        with the age weight and fitness
+        """
+        sums = {species: {"age": 0, "weight": 0, "fitness": 0}
+                for species in ("Herbivore", "Carnivore")}
+        for cell in np.flatnonzero(self.active).tolist():
+            for species, values in self.cells[cell].get_sum_values().items():
+                for key, value in values.items():
+                    sums[species][key] += value
+
+        mean_values = {}
+        for species, count in zip(("Herbivore", "Carnivore"), self.totals.tolist()):
+            mean_values[species] = {key: value / count if count else 0.0
+                                    for key, value in sums[species].items()}
+        return mean_values
 
-        of each animal per land object
+    def get_histogram(self):
+        """
 
-        Append them to the equivalent histogram_dict key value
+        Gets the age, weight and fitness of every animal on the island.
 
+        The arrays of each species are allocated once, with the number of
+        animals of the active land objects, and the values of every land
+        object are copied into their slice: columnar land objects copy their
+        Population columns, and the attributes of the Animal objects of
+        object land objects are read into the arrays one by one. The work
+        and memory are linear in the number of animals.
 
         Returns
         -------
 
         histogram_dict :dict
             dictionary containing age, weight and fitness value of every animal
-            on the island
+            on the island, as NumPy arrays, keyed by species
 
         """
-        histogram_dict = {"Herbivore": {"age": [],
-                                        "weight": [],
-                                        "fitness": []},
-                          "Carnivore": {"age": [],
-                                        "weight": [],
-                                        "fitness": []}}
+        cells = np.flatnonzero(self.active).tolist()
+        histogram_dict = {}
+        for species, attribute in (("Herbivore", "pop_herbivore"),
+                                   ("Carnivore", "pop_carnivore")):
+            populations = [getattr(self.cells[cell], attribute) for cell in cells]
+            size = sum(len(population) for population in populations)
+
+            if not self.columnar:
+                # fromiter fills an array of the given size, without lists.
+                histogram_dict[species] = {
+                    key: np.fromiter((getattr(animal, name) for population in populations
+                                      for animal in population), dtype=dtype, count=size)
+                    for key, name, dtype in (("age", "age", np.int64),
+                                             ("weight", "weight", float),
+                                             ("fitness", "phi", float))}
+                continue
+
+            values = {"age": np.empty(size, dtype=np.int64),
+                      "weight": np.empty(size),
+                      "fitness": np.empty(size)}
+            start = 0
+            for population in populations:
+                stop = start + len(population)
+                values["age"][start:stop] = population.age
+                values["weight"][start:stop] = population.weight
+                values["fitness"][start:stop] = population.phi
+                start = stop
+            histogram_dict[species] = values
 
-        for terra in self.island.values():
-            animal_dict = terra.get_hist_values()
-            histogram_dict["Herbivore"]["age"] = \
-                histogram_dict["Herbivore"].get("age", []) + \
-                animal_dict["Herbivore"]["age"]
+        return histogram_dict
 
-            histogram_dict["Herbivore"]["weight"] = \
-                histogram_dict["Herbivore"].get("weight", []) + \
-                animal_dict["Herbivore"]["weight"]
+    def get_histogram_counts(self, bin_edges):
+        """
 
-            histogram_dict["Herbivore"]["fitness"] = \
-                histogram_dict["Herbivore"].get("fitness", []) + \
-                animal_dict["Herbivore"]["fitness"]
+        Counts the animals of each species in histogram bins of age, weight
+        and fitness, so that a plot gets the counts rather than the values.
 
-            histogram_dict["Carnivore"]["age"] = \
-                histogram_dict["Carnivore"].get("age", []) + \
-                animal_dict["Carnivore"]["age"]
+        The counts are allocated once, and every active land object adds the
+        histogram of its animals in one vectorised pass: columnar land objects
+        bin their Population columns, and object land objects read the
+        attributes of their Animal objects into an array first. No array of
+        the values of the whole island is built. The counts are binned again
+        every call rather than kept up to date by the annual cycle, since
+        aging and weight loss move every animal between bins every year.
 
-            histogram_dict["Carnivore"]["weight"] = \
-                histogram_dict["Carnivore"].get("weight", []) + \
-                animal_dict["Carnivore"]["weight"]
+        Parameters
+        ----------
+        bin_edges : dict
+            bin edges of each property to count, keyed by 'age', 'weight'
+            or 'fitness', as taken by numpy.histogram
 
-            histogram_dict["Carnivore"]["fitness"] = \
-                histogram_dict["Carnivore"].get("fitness", []) + \
-                animal_dict["Carnivore"]["fitness"]
+        Returns
+        -------
+        dict
+            number of animals in every bin, keyed by species and property
 
-        return histogram_dict
+        """
+        names = {"age": "age", "weight": "weight", "fitness": "phi"}
+        counts = {species: {key: np.zeros(len(edges) - 1, dtype=np.int64)
+                            for key, edges in bin_edges.items()}
+                  for species in ("Herbivore", "Carnivore")}
+
+        for cell in np.flatnonzero(self.active).tolist():
+            terra = self.cells[cell]
+            for species, population in (("Herbivore", terra.pop_herbivore),
+                                        ("Carnivore", terra.pop_carnivore)):
+                if len(population) == 0:
+                    continue
+                for key, edges in bin_edges.items():
+                    if self.columnar:
+                        values = getattr(population, names[key])
+                    else:
+                        values = np.fromiter((getattr(animal, names[key])
+                                              for animal in population),
+                                             dtype=float, count=len(population))
+                    counts[species][key] += np.histogram(values, edges)[0]
+
+        return counts
 
     def get_matrix(self):
         """
@@ -369,19 +998,36 @@ class Island:
 
         each land object in the island list based on their location values
 
+        On a map with equal rows, the land objects are numbered in the order
+        of the grid, so the matrices are views of the counts array reshaped
+        to the grid, without copying, and follow the counts as they change.
+        Copy them to keep the matrices of a year.
+
+        The matrices are read-only, since writing to a view would change the
+        counts of the cells without the totals and active cells kept next to
+        them.
+
         Returns
         -------
 
         carn_matrix: array
-                Carnivore Matrix
+                Carnivore Matrix, read-only integer counts
 
         herb_matrix: array
-                Herbivore Matrix
+                Herbivore Matrix, read-only integer counts
         """
-        carn_matrix = np.zeros(list(self.island.keys())[-1])
-        herb_matrix = np.zeros(list(self.island.keys())[-1])
-        for loc, terra in self.island.items():
-            herb_matrix[loc[0] - 1][loc[1] - 1] = len(terra.pop_herbivore)
-            carn_matrix[loc[0] - 1][loc[1] - 1] = len(terra.pop_carnivore)
+        if len(self.cells) == self.grid.size:
+            herb_matrix, carn_matrix = self.counts.reshape((2,) + self.grid.shape)
+        else:
+            # Ragged maps have grid positions without land objects, so
+            # scatter the counts of every cell to its grid position.
+            carn_matrix = np.zeros(self.grid.shape, dtype=self.counts.dtype)
+            herb_matrix = np.zeros(self.grid.shape, dtype=self.counts.dtype)
+            herb_matrix.flat[self.flat_index] = self.counts[0]
+            carn_matrix.flat[self.flat_index] = self.counts[1]
+
+        # Only the returned arrays are read-only, the counts stay writable.
+        carn_matrix.flags.writeable = False
+        herb_matrix.flags.writeable = False
 
         return carn_matrix, herb_matrix
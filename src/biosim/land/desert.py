@@ -20,12 +20,18 @@ class Desert(Land):
     # set the amount of fodder for desert to 0
     f_max = 0
 
-    def __init__(self):
+    def __init__(self, columnar=False, rng=None):
         """
         Inherits the Init function in the Land class
 
+        Parameters
+        ----------
+        columnar: bool
+                If True, store the animals in Population arrays.
+        rng: numpy.random.Generator
+                Random number generator for the columnar cycles.
         """
-        super().__init__()
+        super().__init__(columnar, rng)
         self.habitable = True
 
     @classmethod
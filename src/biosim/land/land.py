@@ -1,7 +1,10 @@
 from biosim.animals.herbivore import Herbivore
 from biosim.animals.carnivore import Carnivore
+from biosim.animals.population import Population
 import random
 
+import numpy as np
+
 
 class Land:
     """
@@ -20,24 +23,49 @@ class Land:
             Maximum fodder allowed
     habitable: bool
             Checks if land can be migrated to
+    short_circuit_hunting: bool
+            If True, carnivores stop hunting at the first herbivore
+            at least as fit as themselves, see :func:`Carnivore.short_circuit_feeding`
+    herbivore_class, carnivore_class: type
+            Animal classes of the land objects, whose parameters they use,
+            see :func:`Island.new_context`
     """
     # Initialize f_max (maximum fodder on specific land allowed).
     f_max = None
     habitable = None
 
-    def __init__(self):
+    # Carnivores try every herbivore by default, which keeps the random
+    # numbers drawn (and so seeded results) unchanged.
+    short_circuit_hunting = False
+
+    # Animal classes of the land objects. Parameter contexts replace them
+    # with subclasses that hold parameters of their own.
+    herbivore_class = Herbivore
+    carnivore_class = Carnivore
+
+    def __init__(self, columnar=False, rng=None):
         """
         Land Initialization
 
         the Herbivore list, Carnivore list Land neighbors list, potential herbivore migrants list
         and potential carnivore migrants list are all initialised in self here.
 
+        Parameters
+        ----------
+        columnar: bool
+                If True, store the animals in :class:`Population` arrays instead
+                of lists of Animal objects.
+        rng: numpy.random.Generator or random.Random
+                Random number generator of the land object: a NumPy generator
+                for columnar land objects, a new unseeded one if None, and a
+                random.Random stream otherwise, the random module if None.
+
         Init Parameters
         ===============
 
-        pop_herbivore: list
+        pop_herbivore: list or Population
                 Herbivores list of a single land type
-        pop_carnivore: list
+        pop_carnivore: list or Population
                 Carnivore list of a single land type
         neighbors : list
                 tuple value of neighboring land coordinates
@@ -50,8 +78,26 @@ class Land:
         """
         # Initialize an empty list to the store population of
         # herbivores and carnivores.
-        self.pop_herbivore = []
-        self.pop_carnivore = []
+        self._pop_herbivore = []
+        self._pop_carnivore = []
+
+        # Columnar lands keep their animals in Population arrays, which
+        # pop_herbivore and pop_carnivore return instead of the lists.
+        self.columnar = columnar
+        if columnar:
+            self.herbivores = Population(self.herbivore_class)
+            self.carnivores = Population(self.carnivore_class)
+        else:
+            self.herbivores = None
+            self.carnivores = None
+
+        # Columnar cycles draw their random numbers in bulk from a NumPy
+        # generator, usually shared by all land objects of an island. Object
+        # based cycles draw from the random module unless the land object
+        # has its own stream, see Land._random.
+        if columnar and rng is None:
+            rng = np.random.default_rng()
+        self.rng = rng
 
         self.neighbors = []
 
@@ -64,6 +110,58 @@ class Land:
         # Initiate the migrate_pop_carnivore list to store Carnivores that want to migrate
         self.migrate_pop_carnivore = []
 
+    @property
+    def pop_herbivore(self):
+        """
+        Herbivores on the land object.
+
+        Returns
+        -------
+        list or Population
+            list of Herbivore objects, or the herbivore Population of a
+            columnar land.
+        """
+        return self.herbivores if self.columnar else self._pop_herbivore
+
+    @pop_herbivore.setter
+    def pop_herbivore(self, population):
+        if not self.columnar:
+            self._pop_herbivore = population
+        elif population is not self.herbivores:
+            self.herbivores.assign(population)
+
+    @property
+    def pop_carnivore(self):
+        """
+        Carnivores on the land object.
+
+        Returns
+        -------
+        list or Population
+            list of Carnivore objects, or the carnivore Population of a
+            columnar land.
+        """
+        return self.carnivores if self.columnar else self._pop_carnivore
+
+    @pop_carnivore.setter
+    def pop_carnivore(self, population):
+        if not self.columnar:
+            self._pop_carnivore = population
+        elif population is not self.carnivores:
+            self.carnivores.assign(population)
+
+    @property
+    def _random(self):
+        """
+        Random number stream of the object based cycles: the random.Random
+        stream of the land object, or the random module if it has none.
+
+        Returns
+        -------
+        random.Random or module
+        """
+        return random if self.rng is None else self.rng
+
     @classmethod
     def set_land_params(cls, params):
         """
@@ -110,8 +208,8 @@ class Land:
         else:
             raise ValueError('f_max cannot be set to None for Land.')
 
-    @staticmethod
-    def set_animal_params(val, params):
+    @classmethod
+    def set_animal_params(cls, val, params):
         """
         Inputs the val and params, then based on val, it sets
         parameters to the animal type's :func:`Animal.update_params`.
@@ -141,9 +239,9 @@ class Land:
 
             # then updates the Class Herbivore or Carnivore based on the parameters
             # parsed in.
-            Herbivore.update_params(params)
+            cls.herbivore_class.update_params(params)
         elif val == 'Carnivore':
-            Carnivore.update_params(params)
+            cls.carnivore_class.update_params(params)
         else:
             raise ValueError(f"{val} animal type does not exists.")
 
@@ -213,12 +311,12 @@ class Land:
 
                 # Check if the species is Herbivore, and append to the
                 # Herbivore list.
-                self.pop_herbivore.append(Herbivore(age=age, weight=weight))
+                self.pop_herbivore.append(self.herbivore_class(age=age, weight=weight))
 
             elif species["species"].lower() == "carnivore":
 
                 # Check if the species is Carnivore, and append to Carnivore list.
-                self.pop_carnivore.append(Carnivore(age=age, weight=weight))
+                self.pop_carnivore.append(self.carnivore_class(age=age, weight=weight))
 
             else:
                 raise ValueError(f"{species['species']} does not exists. Please check"
@@ -245,6 +343,10 @@ class Land:
         -------
 
         """
+        if self.columnar:
+            self.herbivores.aging()
+            self.carnivores.aging()
+            return
 
         def aging(population):
             """
@@ -287,8 +389,16 @@ class Land:
         -------
 
         """
+        if self.columnar:
+            # Herbivores graze on the arrays, see Population.graze.
+            self.fodder -= self.herbivores.graze(self.fodder, self.rng)
+
+            # Carnivores hunt the herbivores, see Population.hunt.
+            self.carnivores.hunt(self.herbivores, self.rng)
+            return
+
         # Shuffle herbivore population for random eating order.
-        random.shuffle(self.pop_herbivore)
+        self._random.shuffle(self.pop_herbivore)
 
         for herbivore in self.pop_herbivore:
 
@@ -304,6 +414,17 @@ class Land:
             else:
                 break
 
+        self._hunting()
+
+    def _hunting(self):
+        """
+        Lets every Carnivore hunt the Herbivores of the land object, the
+        fittest Carnivore first and the weakest Herbivore first.
+
+        Returns
+        -------
+
+        """
         # Sort Herbivore list in ascending order of fitness for Carnivore to feed.
         self.pop_herbivore = sorted(self.pop_herbivore, key=lambda herb: herb.phi, reverse=False)
 
@@ -317,7 +438,9 @@ class Land:
 
                 # Parse the current herbivore list into carnivore feeding function and return the
                 # updated herbivore list based on those that have been killed.
-                self.pop_herbivore = carnivore.feeding(self.pop_herbivore)
+                self.pop_herbivore = carnivore.feeding(self.pop_herbivore,
+                                                       self.short_circuit_hunting,
+                                                       self._random)
             else:
                 break
 
@@ -330,6 +453,10 @@ class Land:
         -------
 
         """
+        if self.columnar:
+            self.herbivores.death(self.rng)
+            self.carnivores.death(self.rng)
+            return
 
         # Create list of animal population which survives.
         def survivor(pop):
@@ -348,14 +475,14 @@ class Land:
             # if the return is false the animal is added to the list.
 
             # Note: Code has been taken from BioLab project given as part of example.
-            return [animal for animal in pop if animal.death() is False]
+            return [animal for animal in pop if animal.death(self._random) is False]
 
         # We set the Herbivore and Carnivore list to the list of animals that have survived.
         self.pop_herbivore = survivor(self.pop_herbivore)
         self.pop_carnivore = survivor(self.pop_carnivore)
 
-    @staticmethod
-    def update_animal_values():
+    @classmethod
+    def update_animal_values(cls):
         """
         Calculates minimum weight of animal needed for childbirth conditions
 
@@ -365,13 +492,10 @@ class Land:
         -------
 
         """
-        # Calculate minimum weight required during birth.
-        Herbivore.min_weight()
-        Carnivore.min_weight()
-
-        # Calculate mu sigma for lognormvariate for child weight.
-        Herbivore.calculate_mu_sigma()
-        Carnivore.calculate_mu_sigma()
+        # Calculate minimum weight required during birth, and mu sigma for
+        # lognormvariate for child weight, into the compiled parameters.
+        cls.herbivore_class.compile_params()
+        cls.carnivore_class.compile_params()
 
     def birth_cycle(self):
         r"""
@@ -408,6 +532,10 @@ class Land:
         -------
 
         """
+        if self.columnar:
+            self.herbivores.birth(self.rng)
+            self.carnivores.birth(self.rng)
+            return
 
         # We define a function birthing inorder to generalise the code for carnivore and herbivore
         def birthing(pop):
@@ -432,21 +560,21 @@ class Land:
 
                 # loop through the list of animals in each list
                 for animal in pop:
-                    if 0 < animal.weight >= animal.minimum_weight:
+                    if 0 < animal.weight >= animal.compiled.minimum_weight:
                         # Set the random value and store in a variable prob_birth
-                        prob_birth = random.random()
+                        prob_birth = self._random.random()
 
                         # we calculate the conditions for birth on the land and store in a variable
                         # land_birth_prob = minimum(1, gamma * phi * length of animals in the list
                         # excluding the animal being considered
-                        land_birth_prob = min(1, animal.params["gamma"] *
+                        land_birth_prob = min(1, animal.compiled.gamma *
                                               animal.phi * (len(pop) - 1))
                         # Check if the land birth probability is greater than the random number
                         if prob_birth < land_birth_prob:
 
                             # Run the animal Birth function on the selected animal
                             # and return the child
-                            child = animal.birth()
+                            child = animal.birth(self._random)
 
                             # if the child has a value and is not None,
                             # add the child to the child_list
@@ -501,7 +629,17 @@ class Land:
 
         migration_carnivore: dict
             dictionary of carnivores set to migrate
+
+        Raises
+        ------
+        RuntimeError
+            If the land object is columnar, see :func:`Island.columnar_migration`
         """
+        if self.columnar:
+            # Columnar islands migrate the animals of all land objects at
+            # once, drawing from the generator of the island.
+            raise RuntimeError("Columnar land objects migrate with "
+                               "Island.columnar_migration.")
 
         def find_migration(population):
             """
@@ -524,10 +662,10 @@ class Land:
             # Create an empty list for animals that do not choose to migrate.
             no_migration = []
             for animal in population:
-                if animal.migrate_prob() is True:
+                if animal.migrate_prob(self._random) is True:
 
                     # Animal provides information of the location.
-                    new_loc = animal.migration(self.neighbors)
+                    new_loc = animal.migration(self.neighbors, self._random)
                     if new_loc is None:
 
                         # If location is None, animal appended to no_migration
@@ -586,12 +724,41 @@ class Land:
         Returns
         -------
 
+        Raises
+        ------
+        RuntimeError
+            If the land object is columnar, see :func:`Island.columnar_migration`
         """
+        if self.columnar:
+            raise RuntimeError("Columnar land objects migrate with "
+                               "Island.columnar_migration.")
+
         self.pop_herbivore = self.pop_herbivore + self.migrate_pop_herbivore
         self.pop_carnivore = self.pop_carnivore + self.migrate_pop_carnivore
         self.migrate_pop_herbivore = []
         self.migrate_pop_carnivore = []
 
+    def get_sum_values(self):
+        """
+        Gets the sum of age, weight and fitness(phi) over the animals of
+        each species in that land, without building lists
+
+        Returns
+        -------
+        dict
+        """
+        if self.columnar:
+            return {"Herbivore": self.herbivores.get_sum_values(),
+                    "Carnivore": self.carnivores.get_sum_values()}
+
+        sum_values = {}
+        for species, population in (("Herbivore", self.pop_herbivore),
+                                    ("Carnivore", self.pop_carnivore)):
+            sum_values[species] = {"age": sum(animal.age for animal in population),
+                                   "weight": sum(animal.weight for animal in population),
+                                   "fitness": sum(animal.phi for animal in population)}
+        return sum_values
+
     def get_hist_values(self):
         """
         Gets the age, weight and fitness(phi), for every animal in that land
@@ -600,6 +767,10 @@ class Land:
         -------
 
         """
+        if self.columnar:
+            return {"Herbivore": self.herbivores.get_hist_values(),
+                    "Carnivore": self.carnivores.get_hist_values()}
+
         herb_age = []
         herb_weight = []
         herb_fitness = []
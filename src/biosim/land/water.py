@@ -9,12 +9,18 @@ class Water(Land):
     # set the amount of fodder for water to none
     f_max = None
 
-    def __init__(self):
+    def __init__(self, columnar=False, rng=None):
         """
         Inherits the Init function in the Land class
 
+        Parameters
+        ----------
+        columnar: bool
+                If True, store the animals in Population arrays.
+        rng: numpy.random.Generator
+                Random number generator for the columnar cycles.
         """
-        super().__init__()
+        super().__init__(columnar, rng)
         self.habitable = False
 
     @classmethod
@@ -0,0 +1,136 @@
+"""
+BioSim log writer
+"""
+
+import os
+
+
+class LogWriter:
+    """
+    LogWriter Object
+
+    The LogWriter object writes the yearly animal counts of a simulation to
+    a csv file. The file is opened once and kept open, and the lines are
+    collected in a buffer that is written every flush_years years, and
+    whenever :func:`LogWriter.flush` is called (:func:`BioSim.simulate` does
+    so before it returns). :func:`BioSim.close` closes the file.
+
+    With stats set, every line also holds the mean weight, age and
+    fitness(phi) of each species.
+
+    Class Parameters
+    =================
+
+    species: tuple
+            species logged, in column order
+    stats: tuple
+            properties whose mean is logged when stats is set
+    """
+    species = ("Herbivore", "Carnivore")
+    stats = ("weight", "age", "fitness")
+
+    def __init__(self, log_file, flush_years=10, stats=False, year=None):
+        """
+        LogWriter is initialised with the file to write to, which is created
+        with its header line.
+
+        Parameters
+        ----------
+        log_file : str
+            path of the csv file
+        flush_years : int
+            number of years collected before they are written to the file
+        stats : bool
+            If True, log the mean weight, age and fitness of each species
+        year : int
+            year a resumed simulation continues from; the lines of the years
+            up to year of an existing log_file are kept, and the file is
+            continued
+
+        Raises
+        ------
+        ValueError
+            If flush_years is not a positive integer, or the existing
+            log_file has another header
+        """
+        if type(flush_years) is not int or flush_years < 1:
+            raise ValueError("flush_years needs to be a positive integer.")
+
+        self.log_file = log_file
+        self.flush_years = flush_years
+        self.log_stats = stats
+        self.buffer = []
+
+        header = "Year,Herbivore,Carnivore"
+        if stats:
+            header += "".join(f",{species}_mean_{stat}"
+                              for species in self.species for stat in self.stats)
+        lines = [header + "\n"]
+        if year is not None and os.path.exists(log_file):
+            with open(log_file) as file:
+                old_header, *old_lines = file.readlines()
+            if old_header != lines[0]:
+                raise ValueError(f"{log_file} holds the log of another simulation.")
+
+            # Lines of years after year were logged after the checkpoint,
+            # and are logged again by the resumed simulation.
+            lines += [line for line in old_lines if int(line.split(",")[0]) <= year]
+
+        self.file = open(log_file, 'w')
+        self.file.write("".join(lines))
+        self.file.flush()
+
+    def write(self, year, animal_count, mean_values=None):
+        """
+        Adds the line of one year to the buffer, and writes the buffer to the
+        file once it holds flush_years lines.
+
+        Parameters
+        ----------
+        year : int
+            the year of the animal count value
+        animal_count : dict
+            number of animals Herbivore and Carnivores
+        mean_values : dict
+            mean weight, age and fitness of each species, as returned by
+            :func:`Island.get_mean_values`, needed if stats is set
+
+        Returns
+        -------
+
+        """
+        line = (f'{year}, '
+                f'{animal_count["Herbivore"]},'
+                f'{animal_count["Carnivore"]}')
+        if self.log_stats:
+            line += "".join(f",{mean_values[species][stat]:.6g}"
+                            for species in self.species for stat in self.stats)
+        self.buffer.append(line + "\n")
+
+        if len(self.buffer) >= self.flush_years:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered lines to the file.
+
+        Returns
+        -------
+
+        """
+        if self.buffer:
+            self.file.write("".join(self.buffer))
+            self.buffer = []
+        self.file.flush()
+
+    def close(self):
+        """
+        Writes the buffered lines and closes the file.
+
+        Returns
+        -------
+
+        """
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
@@ -0,0 +1,488 @@
+"""
+BioSim parallel island
+"""
+
+from .ensemble import resolve_params
+from .island import Island
+import multiprocessing
+
+import numpy as np
+
+
+class BandIsland(Island):
+    """
+    BandIsland Object
+
+    The BandIsland object is the part of a :class:`ParallelIsland` run by one
+    worker process: a band of rows of the island map, with the row above and
+    the row below the band as halo rows. Animals only live in the rows of the
+    band; the migrants heading for a halo row are handed to the worker of
+    the band that row belongs to.
+
+    Every land object has its own random stream, keyed by its location on
+    the whole island map, and the migrants arriving at a land object are
+    added in the order of the land objects they came from, as on an
+    :class:`Island` with cell streams.
+    """
+
+    def __init__(self, geogr, first_row, band_rows, seed=None):
+        """
+        BandIsland is initialised with the rows of its band and halo.
+
+        Parameters
+        ----------
+        geogr : str
+            Multi line string of the rows of the band and its halo rows
+        first_row : int
+            row of the island map of the first line of geogr, from 0
+        band_rows : tuple
+            first and last + 1 line of geogr that belong to the band
+        seed : int
+            Seed of the random streams of the island
+        """
+        # Set before the land objects are created, for their stream keys.
+        self.first_row = first_row
+        super().__init__(geogr, columnar=True, seed=seed, cell_streams=True)
+        self.add_neighbors()
+        self.band_rows = band_rows
+        self.location_array = np.array(self.locations, dtype=np.int64).reshape(-1, 2)
+
+        # Migrants that stay in the band, kept until those from the other
+        # bands have arrived.
+        self.arrivals = {}
+
+        # Land objects of the halo rows.
+        rows = np.arange(self.grid.shape[0])
+        halo_rows = (rows < band_rows[0]) | (rows >= band_rows[1])
+        self.halo = np.zeros(len(self.cells), dtype=bool)
+        halo_cells = self.grid[halo_rows]
+        self.halo[halo_cells[halo_cells >= 0]] = True
+
+    def stream_key(self, loc):
+        """
+        Key of the random stream of the land object at a location: its
+        location on the whole island map.
+
+        Parameters
+        ----------
+        loc : tuple
+            location of the land object on the band
+
+        Returns
+        -------
+        tuple
+        """
+        return loc[0] + self.first_row, loc[1]
+
+    def local_cell(self, y, x):
+        """
+        Numbers of the land objects at island map locations.
+
+        Parameters
+        ----------
+        y : numpy.ndarray
+            rows of the island map locations, from 1
+        x : numpy.ndarray
+            columns of the island map locations, from 1
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        return self.grid[y - self.first_row - 1, x - 1]
+
+    def add_band_pop(self, loc, pop):
+        """
+        Adds a population at an island map location of the band.
+
+        Parameters
+        ----------
+        loc : tuple
+            island map location
+        pop : list
+            list of animal dictionaries
+
+        Returns
+        -------
+        numpy.ndarray
+            number of herbivores and carnivores of the band
+        """
+        self.add_pop((loc[0] - self.first_row, loc[1]), pop)
+        return self.totals.copy()
+
+    def feeding_migration_cycle(self):
+        """
+        First half of the annual cycle of the band.
+
+        Returns
+        -------
+        dict
+            migrants leaving the band: island map row and column of their
+            destination and origin, age and weight of each species, as arrays
+        """
+        outgoing = {}
+        for species, (destination, origin, age, weight) in \
+                self.columnar_feeding_migration_cycle(defer=True).items():
+            dest_y, dest_x = self.location_array[destination].T
+            origin_y, origin_x = self.location_array[origin].T
+            migrants = (dest_y + self.first_row, dest_x, origin_y + self.first_row, origin_x,
+                        age, weight)
+            leaving = self.halo[destination]
+            outgoing[species] = tuple(values[leaving] for values in migrants)
+            self.arrivals[species] = tuple(values[~leaving] for values in migrants)
+        return outgoing
+
+    def aging_death_cycle(self, migrants):
+        """
+        Second half of the annual cycle of the band, after adding the
+        migrants that stayed in the band and those from the other bands.
+
+        Parameters
+        ----------
+        migrants : dict
+            migrants from the other bands, in the format returned by
+            :func:`BandIsland.feeding_migration_cycle`
+
+        Returns
+        -------
+        numpy.ndarray
+            number of herbivores and carnivores of the band
+        """
+        for species, arrivals in self.arrivals.items():
+            parts = [arrivals] + ([migrants[species]] if species in migrants else [])
+            dest_y, dest_x, origin_y, origin_x, age, weight = \
+                (np.concatenate(values) for values in zip(*parts))
+
+            # Order the migrants by destination, then origin, like
+            # Island.columnar_migration does. lexsort is stable, so the
+            # migrants of one origin keep their order.
+            order = np.lexsort((origin_x, origin_y, dest_x, dest_y))
+            self.insert_animal_arrays(species, self.local_cell(dest_y[order], dest_x[order]),
+                                      age[order], weight[order])
+        self.arrivals = {}
+        self.columnar_aging_death_cycle()
+        return self.totals.copy()
+
+    def get_band_matrix(self):
+        """
+        Carnivore and Herbivore Matrix of the rows of the band.
+
+        Returns
+        -------
+        tuple
+            carnivore and herbivore matrix
+        """
+        start, stop = self.band_rows
+        return tuple(matrix[start:stop] for matrix in self.get_matrix())
+
+
+def _band_worker(connection, geogr, first_row, band_rows, seed, params):
+    """
+    Runs a BandIsland in a worker process. The worker calls the methods
+    named by the messages it receives, until it is told to close.
+
+    Parameters
+    ----------
+    connection : multiprocessing.connection.Connection
+        end of the pipe to the ParallelIsland
+    geogr : str
+        rows of the band and its halo rows
+    first_row : int
+        row of the island map of the first line of geogr
+    band_rows : tuple
+        lines of geogr that belong to the band
+    seed : int
+        seed of the random streams of the island
+    params : dict
+        animal and landscape parameters, see :func:`Island.set_params`
+
+    Returns
+    -------
+
+    """
+    context = BandIsland.new_context()
+    context.set_params(params)
+    band = context(geogr, first_row, band_rows, seed)
+    while True:
+        method, args = connection.recv()
+        if method == "close":
+            break
+        try:
+            connection.send(("ok", getattr(band, method)(*args)))
+        except Exception as error:
+            connection.send(("error", error))
+    connection.close()
+
+
+class ParallelIsland:
+    """
+    ParallelIsland Object
+
+    The ParallelIsland object runs a columnar island split into bands of
+    rows, each band in its own worker process (see :class:`BandIsland`).
+    Every year the bands run birth, regrow, feeding and migration in
+    parallel, the animals migrating across band borders are exchanged, and
+    the bands run aging and death in parallel.
+
+    Every land object draws from its own random stream, derived from the
+    seed and its location, so the results do not depend on the number of
+    bands: they are the same as those of a columnar :class:`Island` with
+    cell streams and the same seed.
+
+    The animal and landscape parameters are given when the ParallelIsland
+    is created, e.g. those of a parameter context (see
+    :func:`Island.new_context`) or of a simulation.
+    """
+
+    def __init__(self, geogr, bands=2, seed=None, params=None):
+        """
+        ParallelIsland is initialised with the island geography and starts a
+        worker process per band.
+
+        Parameters
+        ----------
+        geogr : str
+            Multi line string specifying Island geography
+        bands : int
+            number of bands and worker processes, at most the number of rows
+        seed : int
+            Seed of the random streams of the land objects, a random one if None
+        params : dict
+            animal and landscape parameters of the island, as returned by
+            :func:`Island.get_params`, set on top of the current parameters
+            of the Island class; those parameters if None
+
+        Raises
+        ------
+        ValueError
+            If bands is not a positive integer, the map has an unknown
+            landscape type or a parameter is wrong
+        """
+        if type(bands) is not int or bands < 1:
+            raise ValueError("bands needs to be a positive integer.")
+        lines = geogr.splitlines()
+        unknown = set("".join(lines)) - set(Island.land_types)
+        if unknown:
+            raise ValueError(f"{''.join(sorted(unknown))} does not exists in landscape"
+                             f"types. Please check map again.")
+
+        # Full parameters, so that the workers do not depend on the
+        # parameters of their process.
+        params = resolve_params(params)
+
+        self.shape = (len(lines), max(map(len, lines), default=0))
+
+        # All bands need the same seed, so draw one if none is given.
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+
+        # Band of every row of the island map.
+        row_bands = np.array_split(np.arange(len(lines)), min(bands, len(lines)))
+        self.row_band = np.concatenate([np.full(len(rows), band)
+                                        for band, rows in enumerate(row_bands)])
+
+        # Number of herbivores and carnivores of every band.
+        self.band_totals = np.zeros((len(row_bands), 2), dtype=np.int64)
+
+        self.connections, self.processes = [], []
+        for band, rows in enumerate(row_bands):
+            start, stop = rows[0], rows[-1] + 1
+            first, last = max(start - 1, 0), min(stop + 1, len(lines))
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_band_worker, daemon=True,
+                args=(worker_connection, "\n".join(lines[first:last]), first,
+                      (start - first, stop - first),
+                      seed, params))
+            process.start()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _call(self, method, band_args):
+        """
+        Calls a BandIsland method in the worker processes and waits for
+        their results.
+
+        Parameters
+        ----------
+        method : str
+            name of the method
+        band_args : dict
+            arguments of the method for each band number
+
+        Returns
+        -------
+        dict
+            result of each band number
+
+        Raises
+        ------
+        Exception
+            the first exception raised in a worker process
+        """
+        for band, args in band_args.items():
+            self.connections[band].send((method, args))
+        results, errors = {}, []
+        for band in band_args:
+            status, result = self.connections[band].recv()
+            if status == "error":
+                errors.append(result)
+            results[band] = result
+        if errors:
+            raise errors[0]
+        return results
+
+    def _call_all(self, method, *args):
+        """
+        Calls a BandIsland method with the same arguments in every worker.
+
+        Returns
+        -------
+        list
+            result of each band
+        """
+        return self._call_all_args(method, [args] * len(self.connections))
+
+    def _call_all_args(self, method, args):
+        """
+        Calls a BandIsland method in every worker, with the arguments of
+        each band.
+
+        Parameters
+        ----------
+        method : str
+            name of the method
+        args : list
+            arguments of the method for each band
+
+        Returns
+        -------
+        list
+            result of each band
+        """
+        results = self._call(method, dict(enumerate(args)))
+        return [results[band] for band in range(len(args))]
+
+    def add_pop(self, loc, pop):
+        """
+        Adds a population to the land object at a location.
+
+        Parameters
+        ----------
+        loc : tuple
+            location of the land object
+        pop : list
+            list of animal dictionaries
+
+        Returns
+        -------
+
+        Raises
+        ------
+        ValueError:
+            If the location does not exist
+        """
+        if not 0 < loc[0] <= self.shape[0]:
+            raise ValueError(f"Location {loc} does not exists.")
+        band = int(self.row_band[loc[0] - 1])
+        self.band_totals[band] = self._call("add_band_pop", {band: (loc, pop)})[band]
+
+    def annual_cycle(self):
+        """
+        Runs one year on every band, see :class:`ParallelIsland`.
+
+        Returns
+        -------
+
+        """
+        outgoing = self._call_all("feeding_migration_cycle")
+
+        # Send every migrant to the band of the row it migrated to.
+        incoming = [{} for _ in self.connections]
+        for species in ("Herbivore", "Carnivore"):
+            arrays = [migrants[species] for migrants in outgoing if species in migrants]
+            if not arrays:
+                continue
+            migrants = tuple(np.concatenate(values) for values in zip(*arrays))
+            bands = self.row_band[migrants[0] - 1]
+            for band in np.unique(bands).tolist():
+                selected = bands == band
+                incoming[band][species] = tuple(values[selected] for values in migrants)
+
+        self.band_totals[:] = self._call_all_args("aging_death_cycle",
+                                                  [(migrants,) for migrants in incoming])
+
+    def get_matrix(self):
+        """
+        Creates a Carnivore and Herbivore Matrix of the whole island.
+
+        Returns
+        -------
+        carn_matrix: array
+                Carnivore Matrix
+
+        herb_matrix: array
+                Herbivore Matrix
+        """
+        carn_matrix = np.zeros(self.shape)
+        herb_matrix = np.zeros(self.shape)
+        row = 0
+        for carn, herb in self._call_all("get_band_matrix"):
+            carn_matrix[row:row + len(carn), :carn.shape[1]] = carn
+            herb_matrix[row:row + len(herb), :herb.shape[1]] = herb
+            row += len(carn)
+        return carn_matrix, herb_matrix
+
+    @property
+    def totals(self):
+        """
+        Number of herbivores and carnivores on the island.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        return self.band_totals.sum(axis=0)
+
+    def animal_count(self):
+        """
+        Total number of animals on the island.
+
+        Returns
+        -------
+        int
+        """
+        return int(self.totals.sum())
+
+    @property
+    def num_animals_species(self):
+        """
+        Total number of herbivores and carnivores on the island.
+
+        Returns
+        -------
+        dict
+        """
+        return {"Herbivore": int(self.totals[0]),
+                "Carnivore": int(self.totals[1])}
+
+    def close(self):
+        """
+        Stops the worker processes.
+
+        Returns
+        -------
+
+        """
+        for connection, process in zip(self.connections, self.processes):
+            if process.is_alive():
+                connection.send(("close", ()))
+            process.join()
+            connection.close()
+        self.connections, self.processes = [], []
@@ -0,0 +1,246 @@
+"""
+BioSim density recorder
+"""
+
+import numpy as np
+
+
+class Recorder:
+    """
+    Recorder Object
+
+    The Recorder object stores the herbivore and carnivore count matrices of
+    every simulated year in a ``.npy`` file of shape
+    ``(years, rows, cols, species)``, with herbivores at species index 0 and
+    carnivores at species index 1. Row ``year`` of the file holds the counts
+    at the end of that year (year 0 is the initial population).
+
+    The file is written through a memory map with room for chunk_years
+    years; when a year beyond that is recorded the file is extended by
+    another chunk in place. The ``.npy`` header reserves room for the number
+    of years to grow, so only the header and the file size change.
+    :func:`Recorder.flush` writes the data and sets the number of years in
+    the header to the years recorded, so the file can be read at any time
+    with ``numpy.load(path, mmap_mode='r')`` without copying it.
+    :func:`Recorder.close` (called by :func:`BioSim.close`) also removes
+    the rows of the last chunk that were not recorded.
+
+    Class Parameters
+    =================
+
+    dtype: numpy.dtype
+            data type of the counts
+    """
+    dtype = np.dtype(np.int32)
+
+    def __init__(self, path, shape, chunk_years=100, year=None):
+        """
+        Recorder is initialised with the file to write to and the shape of
+        the island map.
+
+        Parameters
+        ----------
+        path : str
+            path of the ``.npy`` file, overwritten if it exists, unless year
+            is given
+        shape : tuple
+            number of rows and columns of the island map
+        chunk_years : int
+            number of years the file grows by at a time
+        year : int
+            year a resumed simulation continues from; the years before year
+            of the existing file at path are kept, and the file is continued
+
+        Raises
+        ------
+        ValueError
+            If chunk_years is not a positive integer, or the file to
+            continue does not hold the years before year of an island map of
+            this shape
+        """
+        if type(chunk_years) is not int or chunk_years < 1:
+            raise ValueError("chunk_years needs to be a positive integer.")
+
+        self.path = path
+        self.frame_shape = tuple(shape) + (2,)
+        self.chunk_years = chunk_years
+
+        if year is None:
+            self.capacity = chunk_years
+
+            # Number of years in the file, i.e. the last year recorded + 1.
+            self.years = 0
+
+            self.array = np.lib.format.open_memmap(path, mode='w+', dtype=self.dtype,
+                                                   shape=(self.capacity,) + self.frame_shape)
+            self.offset = self.array.offset
+        else:
+            self.offset = self._read_header(year)
+
+            # Years from year on are recorded again by the resumed simulation.
+            self.years = year
+            self.capacity = year
+            self.array = None
+            self._grow(year + 1)
+
+    def _read_header(self, year):
+        """
+        Checks the ``.npy`` header of a file to continue at year.
+
+        Parameters
+        ----------
+        year : int
+            first year recorded again
+
+        Returns
+        -------
+        int
+            offset of the data in the file
+
+        Raises
+        ------
+        ValueError
+            If the file does not hold the years before year of an island map
+            of this shape
+        """
+        try:
+            with open(self.path, 'rb') as file:
+                if np.lib.format.read_magic(file) != (1, 0):
+                    raise ValueError("the header is not written by Recorder")
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+                offset = file.tell()
+        except (OSError, ValueError) as error:
+            raise ValueError(f"{self.path} is not a record file to continue: {error}")
+
+        if dtype != self.dtype or fortran_order or tuple(shape[1:]) != self.frame_shape:
+            raise ValueError(f"{self.path} holds the record of another island.")
+        if shape[0] < year:
+            raise ValueError(f"{self.path} holds {shape[0]} years, not the "
+                             f"{year} years before the checkpoint.")
+        return offset
+
+    def _write_header(self, years):
+        """
+        Rewrites the ``.npy`` header for a file holding years years.
+
+        Parameters
+        ----------
+        years : int
+            length of the first axis
+
+        Returns
+        -------
+
+        """
+        header = {"descr": np.lib.format.dtype_to_descr(self.dtype),
+                  "fortran_order": False,
+                  "shape": (years,) + self.frame_shape}
+        with open(self.path, 'r+b') as file:
+            np.lib.format.write_array_header_1_0(file, header)
+            if file.tell() != self.offset:
+                raise ValueError(f"Header of {self.path} cannot hold {years} years.")
+
+    def _grow(self, years):
+        """
+        Extends the file so that it holds at least years years.
+
+        Parameters
+        ----------
+        years : int
+            number of years needed
+
+        Returns
+        -------
+
+        """
+        self.capacity = max(years, self.capacity + self.chunk_years)
+
+        # Close the old memory map before resizing the file under it.
+        if self.array is not None:
+            self.array.flush()
+            self.array = None
+        self._write_header(self.capacity)
+        with open(self.path, 'r+b') as file:
+            file.truncate(self.offset + self.capacity * self.frame_size)
+
+        self.array = np.memmap(self.path, dtype=self.dtype, mode='r+', offset=self.offset,
+                               shape=(self.capacity,) + self.frame_shape)
+
+    @property
+    def frame_size(self):
+        """
+        Number of bytes of one year.
+
+        Returns
+        -------
+        int
+        """
+        return int(np.prod(self.frame_shape)) * self.dtype.itemsize
+
+    def record(self, year, herb_matrix, carn_matrix):
+        """
+        Writes the count matrices of one year.
+
+        Parameters
+        ----------
+        year : int
+            year of the counts, used as row of the file
+        herb_matrix : numpy.ndarray
+            Herbivore Matrix
+        carn_matrix : numpy.ndarray
+            Carnivore Matrix
+
+        Returns
+        -------
+
+        """
+        if year >= self.capacity:
+            self._grow(year + 1)
+
+        frame = self.array[year]
+        frame[..., 0] = herb_matrix
+        frame[..., 1] = carn_matrix
+        self.years = max(self.years, year + 1)
+
+    def flush(self):
+        """
+        Writes the recorded years to disk and sets their number in the header.
+
+        Returns
+        -------
+
+        """
+        self.array.flush()
+        self._write_header(self.years)
+
+    def close(self):
+        """
+        Flushes the recorder and cuts the file to the years recorded.
+
+        Returns
+        -------
+
+        """
+        if self.array is None:
+            return
+        self.flush()
+        self.array = None
+        with open(self.path, 'r+b') as file:
+            file.truncate(self.offset + self.years * self.frame_size)
+
+    @staticmethod
+    def load(path):
+        """
+        Opens a recorded file as a read only memory map.
+
+        Parameters
+        ----------
+        path : str
+            path of the ``.npy`` file
+
+        Returns
+        -------
+        numpy.memmap
+            counts of shape (years, rows, cols, species)
+        """
+        return np.load(path, mmap_mode='r')
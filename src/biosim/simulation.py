@@ -8,19 +8,29 @@ BioSim Simulation
 
 
 from .island import Island
+from .log_writer import LogWriter
+from .recorder import Recorder
 from .visualization import Visualization
-import random
+import json
+
+import numpy as np
 
 
 class BioSim:
     """
     BioSim Object.
+
+    Every BioSim object owns its random number generators and its animal
+    and landscape parameters, see :func:`Island.new_context`, so that
+    simulations in one process do not affect each other.
     """
 
     def __init__(self, island_map, ini_pop, seed,
                  vis_years=1, ymax_animals=None, cmax_animals=None, hist_specs=None,
                  img_years=None, img_dir=None, img_base=None, img_fmt='png',
-                 log_file=None):
+                 log_file=None, columnar=False, log_flush_years=10, log_stats=False,
+                 record_file=None, record_chunk_years=100, cell_streams=False,
+                 blit=False, img_queue_size=0):
 
         """
         Parameters
@@ -49,6 +59,28 @@ class BioSim:
             File type for figures, e.g. 'png' or 'pdf'
         log_file : str
             If given, write animal counts to this file
+        columnar : bool
+            If True, store animals in NumPy arrays per land instead of objects
+        log_flush_years : int
+            Years of animal counts buffered before they are written to `log_file`
+        log_stats : bool
+            If True, also log the mean weight, age and fitness of each species
+        record_file : str
+            If given, record the animal count matrices of every year to this
+            ``.npy`` file, see :class:`Recorder`
+        record_chunk_years : int
+            Years the record file grows by at a time
+        cell_streams : bool
+            If True, every land object draws from its own random stream,
+            derived from `seed` and its location, see :func:`Island.cell_rng`
+        blit : bool
+            If True, the visualization only redraws the artists that change
+            each year, using canvas blitting
+        img_queue_size : int
+            If positive, figures are encoded and written to file in a
+            background thread, with at most this many figures waiting, see
+            :class:`FrameWriter`; if 0, each figure is written before the
+            simulation goes on
 
         Notes
         -----
@@ -115,7 +147,25 @@ class BioSim:
                             raise ValueError(f"Map provided is not an island."
                                              f"Check location ({i + 1},{j + 1})")
 
-        self.map = Island(self.island_map)
+        # Validate columnar is a boolean.
+        if type(columnar) is not bool:
+            raise ValueError("columnar needs to be True or False.")
+        self.columnar = columnar
+
+        # Validate cell_streams is a boolean.
+        if type(cell_streams) is not bool:
+            raise ValueError("cell_streams needs to be True or False.")
+        self.cell_streams = cell_streams
+
+        # Set the seed value. The island seeds its own generators with it,
+        # rather than the random module shared by the process.
+        self.seed = seed
+
+        # The island is an instance of a parameter context of its own, which
+        # starts from the current class level parameters.
+        self.map = Island.new_context()(self.island_map, columnar=columnar,
+                                        seed=123 if self.seed is None else self.seed,
+                                        cell_streams=cell_streams)
         self.map.add_neighbors()
         self.add_population(ini_pop)
 
@@ -190,24 +240,19 @@ class BioSim:
 
         self.hist_specs = hist_specs
 
-        # Validate if log file is a string.
-        if log_file is None:
-            self.log_file = log_file
-        elif type(log_file) != str:
-            raise ValueError("Log File is not a string.")
-        else:
-            self.log_file = log_file
-            with open(log_file, 'w') as file:
-                file.write("Year,Herbivore,Carnivore\n")
+        # Validate blit is a boolean.
+        if type(blit) is not bool:
+            raise ValueError("blit needs to be True or False.")
+        self.blit = blit
 
-        self.num_years = 0
+        # Validate img_queue_size is a non-negative integer.
+        if type(img_queue_size) is not int or img_queue_size < 0:
+            raise ValueError("img_queue_size needs to be a non-negative integer.")
+        self.img_queue_size = img_queue_size
 
-        # Set the seed value.
-        self.seed = seed
-        if self.seed is None:
-            random.seed(123)
-        else:
-            random.seed(self.seed)
+        self.num_years = 0
+        self.open_outputs(log_file, log_flush_years, log_stats,
+                          record_file, record_chunk_years)
 
         # If vis_years or img_years is provided, create Visualization
         # Object.
@@ -220,11 +265,61 @@ class BioSim:
                                         img_base=self.img_base,
                                         img_fmt=self.img_fmt,
                                         vis_years=self.vis_years,
-                                        hist_specs=self.hist_specs)
+                                        hist_specs=self.hist_specs,
+                                        blit=self.blit,
+                                        img_queue_size=self.img_queue_size)
+
+    def open_outputs(self, log_file=None, log_flush_years=10, log_stats=False,
+                     record_file=None, record_chunk_years=100, resume=False):
+        """
+        Opens the log file and the record file of the simulation, see
+        :class:`BioSim` for the parameters.
+
+        Parameters
+        ----------
+        resume : bool
+            If True, the simulation is resumed at the current year: the
+            existing log file is continued after the lines of the years up
+            to it, and the existing record file from it on.
+
+        Raises
+        ------
+        ValueError
+            If a parameter is wrong, or a file to continue does not belong
+            to this simulation
+        """
+        year = self.num_years if resume else None
+
+        # Validate if log file is a string.
+        if type(log_stats) is not bool:
+            raise ValueError("log_stats needs to be True or False.")
+
+        if log_file is None:
+            self.log_file = log_file
+            self.log_writer = None
+        elif type(log_file) != str:
+            raise ValueError("Log File is not a string.")
+        else:
+            self.log_file = log_file
+
+            # The log writer keeps the file open and writes the counts of
+            # log_flush_years years at a time.
+            self.log_writer = LogWriter(log_file, flush_years=log_flush_years,
+                                        stats=log_stats, year=year)
+
+        # Validate if record file is a string.
+        if record_file is None:
+            self.recorder = None
+        elif type(record_file) is not str:
+            raise ValueError("Record File is not a string.")
+        else:
+            self.recorder = Recorder(record_file, self.map.grid.shape,
+                                     chunk_years=record_chunk_years, year=year)
+            self.record()
 
     def set_animal_parameters(self, species, params):
         """
-        Set parameters for animal species.
+        Set parameters for animal species of this simulation.
 
         Parameters
         ----------
@@ -242,7 +337,7 @@ class BioSim:
 
     def set_landscape_parameters(self, landscape, params):
         """
-        Set parameters for landscape type.
+        Set parameters for landscape type of this simulation.
 
         Parameters
         ----------
@@ -284,7 +379,7 @@ class BioSim:
             self.visual.draw_animal_count(animal_count=self.num_animals_per_species,
                                           current_year=self.num_years)
             self.visual.draw_year_counter(self.num_years)
-            self.visual.draw_histogram(histogram_values=self.get_histogram_values())
+            self.visual.draw_histogram(histogram_counts=self.get_histogram_counts())
             c_matrix, h_matrix = self.get_matrix()
             self.visual.draw_heatmap(h_matrix=h_matrix,
                                      c_matrix=c_matrix)
@@ -293,6 +388,31 @@ class BioSim:
             if self.img_years > 0:
                 self.visual.save_fig(self.num_years)
 
+        try:
+            self._simulate_years(num_years)
+        finally:
+            # Write the buffered log lines, records and images, also if the
+            # simulation failed.
+            if self.log_writer is not None:
+                self.log_writer.flush()
+            if self.recorder is not None:
+                self.recorder.flush()
+            if self.vis_years > 0 or self.img_years > 0:
+                self.visual.flush()
+
+        # if self.vis_years > 0 or self.img_years > 0:
+        #     self.visual.final_plot()
+
+    def _simulate_years(self, num_years):
+        """
+        Runs the annual cycle num_years times, updating the visualization
+        and the log after each year.
+
+        Parameters
+        ----------
+        num_years : int
+            Number of years to simulate
+        """
         for _ in range(num_years):
 
             # Perform Annual Cycle on the island.
@@ -310,7 +430,7 @@ class BioSim:
                         self.num_years % self.img_years == 0:
 
                     self.visual.draw_year_counter(self.num_years)
-                    self.visual.draw_histogram(histogram_values=self.get_histogram_values())
+                    self.visual.draw_histogram(histogram_counts=self.get_histogram_counts())
                     c_matrix, h_matrix = self.get_matrix()
                     self.visual.draw_heatmap(h_matrix=h_matrix,
                                              c_matrix=c_matrix)
@@ -328,8 +448,108 @@ class BioSim:
                 count = self.num_animals_per_species
                 self.logger(self.num_years, count)
 
-        # if self.vis_years > 0 or self.img_years > 0:
-        #     self.visual.final_plot()
+            # Record the count matrices of each year.
+            if self.recorder is not None:
+                self.record()
+
+    def save_checkpoint(self, path):
+        """
+        Save the state of the simulation to a checkpoint file.
+
+        The file is an uncompressed ``.npz`` archive with the land object
+        number, age and weight of every animal as arrays, and a JSON record
+        of the island map, year, animal and landscape parameters and the
+        states of the random generators of the island. A simulation
+        restored with :meth:`BioSim.load_checkpoint` continues exactly as
+        this one would.
+
+        Parameters
+        ----------
+        path : str
+            Path of the checkpoint file, written as given
+        """
+        numpy_state = None
+        if self.map.rng is not None:
+            numpy_state = self.map.rng.bit_generator.state
+        random_state = None
+        if self.map.random is not None:
+            random_state = self.map.random.getstate()
+
+        meta = {"version": 1,
+                "island_map": self.island_map,
+                "seed": self.seed,
+                "columnar": self.columnar,
+                "cell_streams": self.cell_streams,
+                "year": self.num_years,
+                "params": self.map.get_params(),
+                "random_state": random_state,
+                "numpy_state": numpy_state,
+                "stream_states": self.map.get_stream_states() if self.cell_streams else None}
+
+        arrays = {}
+        for species, values in self.map.get_animal_arrays().items():
+            for key, value in values.items():
+                arrays[f"{species}_{key}"] = value
+
+        # Write through a file object, so that numpy does not append .npz.
+        with open(path, 'wb') as file:
+            np.savez(file, meta=np.array(json.dumps(meta)), **arrays)
+
+    @classmethod
+    def load_checkpoint(cls, path, **kwargs):
+        """
+        Restore a simulation saved with :meth:`BioSim.save_checkpoint`.
+
+        The animal and landscape parameters of the checkpoint are set on
+        the restored simulation only, as with :meth:`BioSim.set_animal_parameters`.
+
+        Parameters
+        ----------
+        path : str
+            Path of the checkpoint file
+        kwargs
+            Further arguments for :class:`BioSim`, e.g. `log_file` or `img_dir`.
+            `vis_years` defaults to 0 here. A `log_file` or `record_file` of
+            the saved simulation is continued from the year of the
+            checkpoint, see :func:`BioSim.open_outputs`.
+
+        Returns
+        -------
+        BioSim
+            Simulation at the year of the checkpoint
+        """
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            arrays = {key: data[key] for key in data.files if key != "meta"}
+
+        # The log and record files are opened once the animals and the year
+        # are restored.
+        outputs = {key: kwargs.pop(key) for key in
+                   ("log_file", "log_flush_years", "log_stats",
+                    "record_file", "record_chunk_years") if key in kwargs}
+
+        kwargs.setdefault("vis_years", 0)
+        sim = cls(meta["island_map"], ini_pop=[], seed=meta["seed"],
+                  columnar=meta["columnar"], cell_streams=meta["cell_streams"], **kwargs)
+        sim.map.set_params(meta["params"])
+
+        for species in ("Herbivore", "Carnivore"):
+            sim.map.insert_animal_arrays(species, arrays[f"{species}_cell"],
+                                         arrays[f"{species}_age"],
+                                         arrays[f"{species}_weight"])
+        sim.num_years = meta["year"]
+
+        # Restore the random generators last, after everything that draws.
+        if meta["random_state"] is not None:
+            version, state, gauss_next = meta["random_state"]
+            sim.map.random.setstate((version, tuple(state), gauss_next))
+        if meta["numpy_state"] is not None:
+            sim.map.rng.bit_generator.state = meta["numpy_state"]
+        if meta["stream_states"] is not None:
+            sim.map.set_stream_states(meta["stream_states"])
+
+        sim.open_outputs(**outputs, resume=True)
+        return sim
 
     def add_population(self, population):
         """
@@ -391,10 +611,26 @@ class BioSim:
         """
         return self.map.get_histogram()
 
+    def get_histogram_counts(self):
+        """
+        Gets the number of animals in each bin of the age, weight and
+        fitness histograms of the visualization
+
+        Returns
+        -------
+        self.map.get_histogram_counts()
+        """
+        return self.map.get_histogram_counts(self.visual.bin_edges)
+
     def get_matrix(self):
         """
         Gets the carnovore and herbivore matrix
 
+        The matrices hold integer counts and are read-only. On a map with
+        equal rows they share memory with the counts of the island, and
+        change in place every simulated year; copy them to keep the
+        matrices of a year.
+
         Returns
         -------
 
@@ -408,9 +644,22 @@ class BioSim:
 
         self.visual.make_movie(movie_fmt)
 
+    def record(self):
+        """
+        Writes the herbivore and carnivore matrices of the current year to
+        the record file.
+
+        Returns
+        -------
+
+        """
+        c_matrix, h_matrix = self.get_matrix()
+        self.recorder.record(self.num_years, h_matrix, c_matrix)
+
     def logger(self, year, animal_count):
         """
-        creates opens the log file and write the year, and animal count to it
+        passes the year, and animal count to the log writer, together with the
+        mean weight, age and fitness of each species if log_stats is set
 
         Parameters
         ----------
@@ -424,7 +673,38 @@ class BioSim:
         -------
 
         """
-        with open(self.log_file, 'a') as file:
-            file.write(f'{year}, '
-                       f'{animal_count["Herbivore"]},'
-                       f'{animal_count["Carnivore"]}\n')
+        mean_values = None
+        if self.log_writer.log_stats:
+            mean_values = self.map.get_mean_values()
+        self.log_writer.write(year, animal_count, mean_values)
+
+    def close(self):
+        """
+        Writes the buffered log lines and closes the log file, cuts the
+        record file to the years recorded, and writes the queued images and
+        stops their background thread. The simulation cannot be continued
+        afterwards.
+
+        BioSim is also a context manager that closes itself on exit.
+
+        Returns
+        -------
+
+        Raises
+        ------
+        Exception
+            the first error of writing an image in the background thread
+            since simulate returned, after the other files are closed
+        """
+        if self.log_writer is not None:
+            self.log_writer.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.vis_years > 0 or self.img_years > 0:
+            self.visual.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
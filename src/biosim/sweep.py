@@ -0,0 +1,281 @@
+"""
+BioSim parameter sweep
+"""
+
+from .ensemble import build_island, resolve_params, simulate_seed
+from .island import Island
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import csv
+import itertools
+import os
+
+import numpy as np
+
+# Parameters the points of a worker process start from, set by _init_worker.
+_base_params = None
+
+# Summary metrics of a point, computed over its seeds.
+METRICS = tuple(f"{species}_{metric}"
+                for species in ("Herbivore", "Carnivore")
+                for metric in ("final_mean", "final_std", "extinct"))
+
+
+def grid(values):
+    """
+    Points of a full grid over parameter values.
+
+    Parameters
+    ----------
+    values : dict
+        list of values of every parameter, keyed by parameter name such as
+        ``'Herbivore.zeta'`` or ``'L.f_max'``
+
+    Returns
+    -------
+    list
+        one dict of parameter values per point, the last parameter varying
+        fastest
+    """
+    names = list(values)
+    return [dict(zip(names, point)) for point in itertools.product(*values.values())]
+
+
+def sample(ranges, num_points, seed=1):
+    """
+    Points drawn uniformly from parameter ranges.
+
+    Parameters
+    ----------
+    ranges : dict
+        lower and upper bound of every parameter, keyed by parameter name
+    num_points : int
+        number of points
+    seed : int
+        seed of the sampler, the same seed gives the same points
+
+    Returns
+    -------
+    list
+        one dict of parameter values per point
+    """
+    rng = np.random.default_rng(seed)
+    draws = {name: rng.uniform(low, high, num_points).tolist()
+             for name, (low, high) in ranges.items()}
+    return [{name: values[point] for name, values in draws.items()}
+            for point in range(num_points)]
+
+
+def to_params(point):
+    """
+    Converts a point to the parameter format of :func:`Island.set_params`.
+
+    Parameters
+    ----------
+    point : dict
+        parameter values keyed by ``'<species or landscape>.<parameter>'``
+
+    Returns
+    -------
+    dict
+
+    Raises
+    ------
+    ValueError
+        If a parameter name has no species or landscape part
+    """
+    params = {}
+    for name, value in point.items():
+        key, dot, param = name.partition(".")
+        if not dot:
+            raise ValueError(f"{name} needs to be of the form 'Herbivore.zeta' or 'L.f_max'.")
+        params.setdefault(key, {})[param] = value
+    return params
+
+
+def point_key(point, names):
+    """
+    Key identifying a point in the result table.
+
+    Parameters
+    ----------
+    point : dict
+        parameter values, as numbers or as strings read from the table
+    names : list
+        parameter names
+
+    Returns
+    -------
+    tuple
+    """
+    return tuple(float(point[name]) for name in names)
+
+
+def summarize(counts):
+    """
+    Summary metrics of the runs of one point.
+
+    Parameters
+    ----------
+    counts : list
+        yearly counts of every seed, see :func:`biosim.ensemble.run`
+
+    Returns
+    -------
+    dict
+        mean and standard deviation over the seeds of the final number of
+        each species, and the fraction of seeds in which it died out
+    """
+    final = np.array([run_counts[-1] for run_counts in counts], dtype=float)
+    metrics = {}
+    for column, species in enumerate(("Herbivore", "Carnivore")):
+        metrics[f"{species}_final_mean"] = float(final[:, column].mean())
+        metrics[f"{species}_final_std"] = float(final[:, column].std())
+        metrics[f"{species}_extinct"] = float(np.mean(final[:, column] == 0))
+    return metrics
+
+
+def _init_worker(base_params):
+    """
+    Stores the parameters the points of a worker process start from.
+
+    Parameters
+    ----------
+    base_params : dict
+        parameters in the format of :func:`Island.get_params`
+
+    Returns
+    -------
+
+    """
+    global _base_params
+    _base_params = base_params
+
+
+def _run_point(index, point, island_map, ini_pop, seeds, years, columnar):
+    """
+    Runs all seeds of one point.
+
+    The island of the point is built in a parameter context of its own with
+    the base parameters and the values of the point on top, so that the
+    parameters of the Island class are left unchanged and no point sees the
+    parameters of the points run before it in the same process.
+
+    Returns
+    -------
+    tuple
+        index, point and its summary metrics
+    """
+    params = {key: dict(values) for key, values in _base_params.items()}
+    for key, values in to_params(point).items():
+        params[key].update(values)
+    template = build_island(island_map, ini_pop, columnar, params=params)
+    counts = [simulate_seed(template, seed, years) for seed in seeds]
+    return index, point, summarize(counts)
+
+
+def run(island_map, ini_pop, points, years, results_file, seeds=(1,), workers=None,
+        columnar=True):
+    """
+    Runs a parameter sweep in parallel worker processes and writes one row
+    of summary metrics per point to a csv file.
+
+    Every point runs in a worker process with the parameters of this
+    process and the values of the point set on top, so points do not affect
+    each other or this process. Rows are written as the points finish, with
+    the years and seeds they were simulated with. If results_file exists,
+    the points already in it are skipped, so that an interrupted sweep is
+    resumed by running it again with the same arguments.
+
+    Parameters
+    ----------
+    island_map : str
+        Multi-line string specifying island geography
+    ini_pop : list
+        List of dictionaries specifying initial population
+    points : list
+        parameter values of every point, see :func:`grid` and :func:`sample`;
+        all points need the same parameter names
+    years : int
+        number of years to simulate
+    results_file : str
+        path of the csv result table
+    seeds : iterable
+        random number seeds, every point runs with each
+    workers : int
+        number of worker processes (default: number of CPUs)
+    columnar : bool
+        use the columnar simulation engine
+
+    Returns
+    -------
+    list
+        rows of the points run, as dicts of the point, its index, the years
+        and seeds and its metrics, in the order they finished
+
+    Raises
+    ------
+    ValueError
+        If years is not a non-negative integer, a point is wrong or the
+        existing result table has other parameters, years or seeds
+    """
+    if type(years) is not int or years < 0:
+        raise ValueError("years needs to be a non-negative integer.")
+
+    points = list(points)
+    seeds = list(seeds)
+    names = list(points[0]) if points else []
+    fieldnames = ["point", "years", "seeds"] + names + list(METRICS)
+
+    # Seeds of every row, as written to the table.
+    seeds_key = " ".join(str(seed) for seed in seeds)
+
+    # Validate every point here rather than in the workers.
+    for point in points:
+        if sorted(point) != sorted(names):
+            raise ValueError("All points need the same parameter names.")
+        resolve_params(to_params(point))
+    build_island(island_map, ini_pop, columnar)
+
+    done = set()
+    if os.path.exists(results_file) and os.path.getsize(results_file) > 0:
+        with open(results_file, newline='') as file:
+            reader = csv.DictReader(file)
+            if reader.fieldnames != fieldnames:
+                raise ValueError(f"{results_file} holds the results of another sweep.")
+            for row in reader:
+                # Rows of other years or seeds cannot be mixed with these.
+                if row["years"] != str(years) or row["seeds"] != seeds_key:
+                    raise ValueError(f"{results_file} holds results of {row['years']} "
+                                     f"years with seeds {row['seeds']}.")
+                done.add(point_key(row, names))
+        mode = 'a'
+    else:
+        mode = 'w'
+
+    todo = [(index, point) for index, point in enumerate(points)
+            if point_key(point, names) not in done]
+
+    rows = []
+    with open(results_file, mode, newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        if mode == 'w':
+            writer.writeheader()
+            file.flush()
+        if not todo:
+            return rows
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(Island.get_params(),)) as executor:
+            futures = [executor.submit(_run_point, index, point, island_map, ini_pop,
+                                       seeds, years, columnar)
+                       for index, point in todo]
+            for future in as_completed(futures):
+                index, point, metrics = future.result()
+                row = {"point": index, "years": years, "seeds": seeds_key,
+                       **point, **metrics}
+                writer.writerow(row)
+
+                # Flush every row, so that a killed sweep can be resumed.
+                file.flush()
+                rows.append(row)
+    return rows
@@ -1,3 +1,4 @@
+from .frame_writer import FrameWriter
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
@@ -19,9 +20,14 @@ class Visualization:
 
     def __init__(self, geogr=None, y_max=None, c_max=None, img_years=None,
                  img_dir=None, img_base=None, img_fmt=None, vis_years=None,
-                 hist_specs=None, img_name=None):
+                 hist_specs=None, img_name=None, blit=False, img_queue_size=0):
         self.map = geogr
 
+        # In blit mode, show_plot redraws only the artists that change over
+        # a saved image of the rest of the figure.
+        self.blit = blit
+        self.background = None
+
         if vis_years is None:
             self.vis_years = 0
         else:
@@ -65,6 +71,13 @@ class Visualization:
         self.img_base = img_base
         self.img_fmt = img_fmt
 
+        # With a queue size, raster images are encoded and written in a
+        # background thread while the simulation goes on.
+        if img_queue_size > 0:
+            self.frame_writer = FrameWriter(queue_size=img_queue_size)
+        else:
+            self.frame_writer = None
+
         # if img_name is None:
         #     img_name = _DEFAULT_GRAPHICS_NAME
         #
@@ -240,57 +253,77 @@ class Visualization:
                                           transform=self.time_counter.transAxes,
                                           fontsize=10)
 
+        # Artists updated every year. They are created once and updated with
+        # set_data or set_text; in blit mode they are animated, so that a
+        # full draw leaves them out of the saved background.
+        self.animated_artists = [self.herb_dist, self.carn_dist, self.txt,
+                                 self.age_hist_herbivore, self.age_hist_carnivore,
+                                 self.weight_hist_herbivore, self.weight_hist_carnivore,
+                                 self.fitness_hist_herbivore, self.fitness_hist_carnivore]
+        for artist in self.animated_artists:
+            artist.set_animated(self.blit)
+
     def show_plot(self):
-        plt.pause(0.01)
+        if not self.blit or not self.fig.canvas.supports_blit:
+            plt.pause(0.01)
+            return
+
+        canvas = self.fig.canvas
+        if self.background is None:
+            # Draw the figure without the animated artists once, and keep
+            # the image as background.
+            plt.show(block=False)
+            canvas.draw()
+            self.background = canvas.copy_from_bbox(self.fig.bbox)
+
+        # Draw the animated artists over the background and show only that.
+        canvas.restore_region(self.background)
+        for artist in self.animated_artists:
+            self.fig.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
 
     def final_plot(self):
         plt.show()
 
     def draw_heatmap(self, c_matrix=None, h_matrix=None):
 
-        self.herb_dist = self.herbivore_heatmap.imshow(h_matrix,
-                                                       cmap='magma',
-                                                       interpolation='nearest',
-                                                       vmin=0,
-                                                       vmax=self.c_max["Herbivore"])
-
-        self.carn_dist = self.carnivore_heatmap.imshow(c_matrix,
-                                                       cmap='magma',
-                                                       interpolation='nearest',
-                                                       vmin=0,
-                                                       vmax=self.c_max["Carnivore"])
+        # Update the images created in __init__, rather than adding new ones.
+        self.herb_dist.set_data(h_matrix)
+        self.carn_dist.set_data(c_matrix)
 
     def draw_year_counter(self, year):
 
         self.txt.set_text(self.template.format(year))
 
-    def draw_histogram(self, histogram_values):
+    @property
+    def bin_edges(self):
+        """
+        Bin edges of the age, weight and fitness histograms, for
+        :func:`Island.get_histogram_counts`.
+
+        Returns
+        -------
+        dict
+        """
+        return {"age": self.bin_edges_age,
+                "weight": self.bin_edges_weight,
+                "fitness": self.bin_edges_fitness}
 
-        # Update age histogram values.
-        hist_age_val_herbivore, _ = np.histogram(histogram_values["Herbivore"]["age"],
-                                                 self.bin_edges_age)
-        hist_age_val_carnivore, _ = np.histogram(histogram_values["Carnivore"]["age"],
-                                                 self.bin_edges_age)
-        self.age_hist_herbivore.set_data(hist_age_val_herbivore)
-        self.age_hist_carnivore.set_data(hist_age_val_carnivore)
+    def draw_histogram(self, histogram_counts):
+
+        # Update age histogram values. The counts are binned with
+        # self.bin_edges by the island.
+        self.age_hist_herbivore.set_data(histogram_counts["Herbivore"]["age"])
+        self.age_hist_carnivore.set_data(histogram_counts["Carnivore"]["age"])
 
         # Update weight histogram values.
-        hist_weight_val_herbivore, _ = np.histogram(histogram_values["Herbivore"]["age"],
-                                                    self.bin_edges_weight)
-        hist_weight_val_carnivore, _ = np.histogram(histogram_values["Carnivore"]["age"],
-                                                    self.bin_edges_weight)
-        self.weight_hist_herbivore.set_data(hist_weight_val_herbivore)
-        self.weight_hist_carnivore.set_data(hist_weight_val_carnivore)
-        # plt.pause(1)
+        self.weight_hist_herbivore.set_data(histogram_counts["Herbivore"]["weight"])
+        self.weight_hist_carnivore.set_data(histogram_counts["Carnivore"]["weight"])
 
         # Update fitness histogram values.
-        hist_fitness_val_herbivore, _ = np.histogram(histogram_values["Herbivore"]["fitness"],
-                                                     self.bin_edges_fitness)
-        hist_fitness_val_carnivore, _ = np.histogram(histogram_values["Carnivore"]["fitness"],
-                                                     self.bin_edges_fitness)
-        self.fitness_hist_herbivore.set_data(hist_fitness_val_herbivore)
-        self.fitness_hist_carnivore.set_data(hist_fitness_val_carnivore)
-        # plt.pause(0.01)
+        self.fitness_hist_herbivore.set_data(histogram_counts["Herbivore"]["fitness"])
+        self.fitness_hist_carnivore.set_data(histogram_counts["Carnivore"]["fitness"])
 
     def draw_map(self):
         rgb_value = {'W': (0.0, 0.0, 1.0),
@@ -322,6 +355,9 @@ class Visualization:
     def get_plot_values(self, years):
         self.year += years
 
+        # The axis limits and ticks change, so the background is redrawn.
+        self.background = None
+
         # Prepare Animal Count Plotting Values.
         self.animal_count_plot.set_xlim([0, self.year])
         if self.herb_line is None:
@@ -342,6 +378,12 @@ class Visualization:
                                                          color='r',
                                                          label='Carnivore',
                                                          lw=1.5)[0]
+
+            # The legend is created once, with the lines.
+            self.animal_count_plot.legend(fontsize=8)
+            self.herb_line.set_animated(self.blit)
+            self.carn_line.set_animated(self.blit)
+            self.animated_artists += [self.herb_line, self.carn_line]
         else:
             x_data_h, y_data_h = self.herb_line.get_data()
             x_data_c, y_data_c = self.carn_line.get_data()
@@ -408,19 +450,70 @@ class Visualization:
         carn_ydata = self.carn_line.get_ydata()
         carn_ydata[idx] = animal_count["Carnivore"]
         self.carn_line.set_ydata(carn_ydata)
-        self.animal_count_plot.legend(fontsize=8)
 
     def save_fig(self, current_year):
 
         if current_year % self.img_years == 0:
             if self.img_base is not None and self.img_dir is not None:
                 # os.chdir(self.img_dir)
-                plt.savefig('{dir}/{base}_{num:05d}.{type}'.format(base=self.img_base,
-                                                                   num=self.img_ctr,
-                                                                   type=self.img_fmt,
-                                                                   dir=self.img_dir))
+                path = '{dir}/{base}_{num:05d}.{type}'.format(base=self.img_base,
+                                                              num=self.img_ctr,
+                                                              type=self.img_fmt,
+                                                              dir=self.img_dir)
+                if self.frame_writer is not None and \
+                        self.img_fmt.lower() in FrameWriter.formats:
+                    self.frame_writer.write(path, self.get_frame(),
+                                            self.img_fmt, self.fig.dpi)
+                else:
+                    self.fig.savefig(path)
                 self.img_ctr += 1
 
+    def get_frame(self):
+        """
+        Renders the figure and copies its RGBA buffer.
+
+        Returns
+        -------
+        numpy.ndarray
+            RGBA image of the figure, of shape ``(height, width, 4)``
+        """
+        # A full draw leaves out the animated artists of blit mode, so they
+        # are drawn as normal artists here, in the order savefig draws them.
+        # The saved background is not changed.
+        for artist in self.animated_artists:
+            artist.set_animated(False)
+        try:
+            self.fig.canvas.draw()
+        finally:
+            for artist in self.animated_artists:
+                artist.set_animated(self.blit)
+
+        # Copied, as the buffer is drawn over while the frame is written.
+        return np.array(self.fig.canvas.buffer_rgba())
+
+    def flush(self):
+        """
+        Waits until the images queued for the background thread are
+        written.
+
+        Returns
+        -------
+
+        """
+        if self.frame_writer is not None:
+            self.frame_writer.flush()
+
+    def close(self):
+        """
+        Writes the images queued for the background thread and stops it.
+
+        Returns
+        -------
+
+        """
+        if self.frame_writer is not None:
+            self.frame_writer.close()
+
     def make_movie(self, movie_fmt=None):
         if self.img_base is None and self.img_dir is None:
             raise RuntimeError("No img_base and img_dir defined.")
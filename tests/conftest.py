@@ -0,0 +1,23 @@
+import random
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def seed_random(request):
+    """
+    Seeds the random module before every test, as pytest-randomly does
+
+    Notes
+    -----
+    - BioSim seeds generators of its own island, not the random module, so
+      the tests drawing from the random module would otherwise depend on the
+      tests run before them
+    - With pytest-randomly the module is seeded by the plugin already
+
+    Returns
+    -------
+
+    """
+    if not request.config.pluginmanager.hasplugin("randomly"):
+        random.seed(12345)
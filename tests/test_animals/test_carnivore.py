@@ -2,6 +2,7 @@ import pytest
 from biosim.animals.carnivore import Carnivore
 from biosim.animals.herbivore import Herbivore
 import math
+import random
 import scipy.stats as stats
 
 
@@ -805,6 +806,86 @@ class TestCarnivore:
         new_list = self.carn.feeding(h_pop)
         assert len(new_list) < len(h_pop)
 
+    @pytest.mark.parametrize("seed", [1, 2, 3, 4, 5])
+    def test_short_circuit_feeding_equivalence(self, seed, mocker):
+        """
+        Testing short circuit feeding gives the same result as feeding
+
+        Parameters
+        ----------
+        seed: int
+                seed of the random draws
+        mocker: float
+                Random control
+
+        Notes
+        ------
+        - Draw interior random numbers, never 0.0, at which feeding also
+          kills herbivores whose kill probability is 0
+        - Create two equal carnivores and two equal herbivore lists, sorted
+          in ascending order of fitness, with herbivores just below, at and
+          above the fitness of the carnivore, where prob_kill becomes 0
+        - Hunt with feeding on one and short circuit feeding on the other,
+          with the same draws
+        - assert the same herbivores are killed and the carnivores gain the
+          same weight
+
+        Returns
+        -------
+
+        """
+        rng = random.Random(seed)
+        draws = [rng.uniform(1e-6, 0.05) for _ in range(100)]
+        offsets = [0.2 * rng.random() for _ in range(10)] + [1e-12, 0.0, 0.0, -1e-12, -0.05]
+
+        # A light carnivore, so that every kill makes it much fitter.
+        carnivores = [Carnivore(5, 2.0) for _ in range(2)]
+        results = []
+        for carnivore, short_circuit in zip(carnivores, (False, True)):
+            mocker.patch("random.random", side_effect=iter(draws))
+            herbivores = [Herbivore(5, 3.0) for _ in offsets]
+            for herb, offset in zip(herbivores, offsets):
+                herb.phi = carnivore.phi - offset
+            herbivores.sort(key=lambda herb: herb.phi)
+
+            weight = carnivore.weight
+            remaining = carnivore.feeding(herbivores, short_circuit=short_circuit)
+            killed = [index for index, herb in enumerate(herbivores) if herb not in remaining]
+            results.append((killed, [herbivores.index(herb) for herb in remaining],
+                            carnivore.weight - weight))
+
+        assert results[0][0], "no herbivore was killed"
+        assert results[0] == results[1]
+        assert carnivores[0].phi == carnivores[1].phi
+
+    def test_short_circuit_feeding_draws(self, mocker):
+        """
+        Testing short circuit feeding does not try herbivores fitter than
+        the carnivore
+
+        Parameters
+        ----------
+        mocker: float
+                Random control
+
+        Notes
+        ------
+        - Hunt herbivores that are all fitter than the carnivore
+        - assert no random number is drawn and no herbivore is killed
+
+        Returns
+        -------
+
+        """
+        draw = mocker.patch("random.random", return_value=0.0)
+        herbivores = [Herbivore(5, 100.0) for _ in range(10)]
+        herbivores = [herb for herb in herbivores if herb.phi >= self.carn.phi]
+        assert len(herbivores) == 10
+
+        remaining = self.carn.feeding(herbivores, short_circuit=True)
+        assert draw.call_count == 0
+        assert remaining == herbivores
+
     def test_migration_prob_parametric_success(self, reset_params):
         """
         Testing carnivore migration probability with Mu
@@ -1076,3 +1157,38 @@ def test_birth_child_born(age, weight, mocker, re_update_params):
     """
     mocker.patch('random.lognormvariate', return_value=22)
     assert isinstance(Carnivore(age, weight).birth(), Carnivore)
+
+
+def test_compiled_params(re_update_params):
+    """
+    Testing the compiled parameters are rebuilt when parameters are updated
+
+    Parameters
+    ----------
+    re_update_params: dict
+                Reset parameters
+
+    Notes
+    -----
+    - Update w_birth, zeta and DeltaPhiMax
+    - assert the compiled parameters hold the new values and the derived
+      minimum weight and child weight mu
+    - assert the compiled record and the parameters cannot be changed
+      directly, so that the record always matches the parameters
+
+    Returns
+    -------
+
+    """
+    Carnivore.update_params({"w_birth": 8.0, "zeta": 2.0, "DeltaPhiMax": 4.0})
+    compiled = Carnivore.compiled
+    assert compiled.w_birth == Carnivore.params["w_birth"] == 8.0
+    assert compiled.minimum_weight == 2.0 * (8.0 + 1.0)
+    assert compiled.birth_mu == pytest.approx(math.log(64 / math.sqrt(65)))
+    assert compiled.DeltaPhiMax == 4.0
+    assert Herbivore.compiled.DeltaPhiMax is None
+    with pytest.raises(AttributeError):
+        compiled.F = 10.0
+    with pytest.raises(TypeError):
+        Carnivore.params["zeta"] = 3.0
+    assert Carnivore.compiled.zeta == Carnivore.params["zeta"] == 2.0
@@ -0,0 +1,516 @@
+import pytest
+import numpy as np
+from biosim.animals.herbivore import Herbivore
+from biosim.animals.carnivore import Carnivore
+from biosim.animals.population import Population, AnimalView
+
+
+@pytest.fixture
+def population():
+    """
+    Creates a herbivore Population with 10 animals
+
+    Returns
+    -------
+    herbs: Population
+    """
+    herbs = Population(Herbivore, capacity=2)
+    herbs.extend(np.arange(10), np.linspace(5, 50, 10))
+    return herbs
+
+
+def test_create_population():
+    """
+    Testing creation of an empty Population
+
+    Returns
+    -------
+    len(herbs) == 0 is True
+    """
+    herbs = Population(Herbivore)
+    assert len(herbs) == 0
+    assert herbs.species is Herbivore
+    assert list(herbs) == []
+
+
+def test_extend_grows_capacity(population):
+    """
+    Testing that extend grows the arrays beyond the initial capacity
+
+    Parameters
+    ----------
+    population: Population
+            herbivore population
+
+    Returns
+    -------
+    len(population) == 10 is True
+    """
+    assert len(population) == 10
+    assert population.age.tolist() == list(range(10))
+    assert population.weight[-1] == 50
+
+
+@pytest.mark.parametrize("species", [Herbivore, Carnivore])
+@pytest.mark.parametrize("age, weight", [(0, 8.0), (10, 30.0), (45, 2.5), (5, 0.0)])
+def test_fitness_matches_animal(species, age, weight):
+    """
+    Testing the vectorised fitness against Animal.fitness
+
+    Parameters
+    ----------
+    species: class
+            Herbivore or Carnivore
+    age: int
+            age of animal
+    weight: float
+            weight of animal
+
+    Returns
+    -------
+    pop.phi[0] == approx(animal.phi) is True
+    """
+    animal = species(age=age, weight=weight)
+    pop = Population(species)
+    pop.extend([age], [weight])
+    assert pop.phi[0] == pytest.approx(animal.phi)
+
+
+@pytest.mark.parametrize("species", [Herbivore, Carnivore])
+def test_batch_fitness(species):
+    """
+    Testing Animal.batch_fitness against Animal.fitness for many animals
+
+    Parameters
+    ----------
+    species: class
+            Herbivore or Carnivore
+
+    Returns
+    -------
+    species.batch_fitness(age, weight) == approx(phi) is True
+    """
+    age = np.arange(0, 100, 5)
+    weight = np.linspace(0, 95, 20)
+    phi = [species(age=int(a), weight=float(w)).phi for a, w in zip(age, weight)]
+    assert species.batch_fitness(age, weight) == pytest.approx(phi)
+
+
+def test_dirty_rows_only(population):
+    """
+    Testing that only dirty rows get their fitness recalculated
+
+    Parameters
+    ----------
+    population: Population
+            herbivore population
+
+    Notes
+    -----
+    - Change weights without marking the rows dirty, phi must not change
+    - Mark one row dirty, only this row gets a new phi
+
+    Returns
+    -------
+
+    """
+    phi = population.phi.copy()
+    population.weight[:] = 80.0
+    assert population.phi == pytest.approx(phi)
+
+    population.mark_dirty([3])
+    new_phi = population.phi
+    assert new_phi[3] == pytest.approx(Herbivore(age=3, weight=80.0).phi)
+    assert np.delete(new_phi, 3) == pytest.approx(np.delete(phi, 3))
+
+
+def test_fitness_params_change(population):
+    """
+    Testing that a change of fitness parameters recalculates every row
+
+    Parameters
+    ----------
+    population: Population
+            herbivore population
+
+    Returns
+    -------
+
+    """
+    phi = population.phi.copy()
+    Herbivore.update_params({"w_half": 20.0})
+    try:
+        assert np.all(population.phi < phi)
+        assert population.phi == pytest.approx(
+            Herbivore.batch_fitness(population.age, population.weight))
+    finally:
+        Herbivore.update_params({"w_half": 10.0})
+
+
+def test_append_and_views():
+    """
+    Testing append of Animal objects and the AnimalView object API
+
+    Notes
+    -----
+    - Append two Herbivore objects
+    - assert views return age, weight and phi of the objects
+    - assert setting weight on a view writes the arrays and updates phi
+
+    Returns
+    -------
+
+    """
+    herbs = Population(Herbivore)
+    first, second = Herbivore(age=3, weight=12.0), Herbivore(age=7, weight=30.0)
+    herbs.append(first)
+    herbs.append(second)
+
+    view = herbs[1]
+    assert isinstance(view, AnimalView)
+    assert (view.age, view.weight, view.phi) == (7, 30.0, pytest.approx(second.phi))
+    assert herbs[-2].weight == 12.0
+
+    view.weight = 12.0
+    assert herbs.weight[1] == 12.0
+    assert view.phi == pytest.approx(Herbivore(age=7, weight=12.0).phi)
+
+    with pytest.raises(IndexError):
+        herbs[2]
+
+
+def test_assign_and_to_animals(population):
+    """
+    Testing assign from a list of views and conversion to Animal objects
+
+    Parameters
+    ----------
+    population: Population
+            herbivore population
+
+    Returns
+    -------
+
+    """
+    # Keep every second animal, in reverse order.
+    population.assign(list(population)[::-2])
+    assert population.age.tolist() == [9, 7, 5, 3, 1]
+
+    animals = population.to_animals()
+    assert all(type(animal) is Herbivore for animal in animals)
+    assert [animal.weight for animal in animals] == population.weight.tolist()
+
+
+def test_compact(population):
+    """
+    Testing compaction of the arrays with a keep mask
+
+    Parameters
+    ----------
+    population: Population
+            herbivore population
+
+    Returns
+    -------
+    population.age.tolist() == [0, 2, 4, 6, 8] is True
+    """
+    population.compact(population.age % 2 == 0)
+    assert len(population) == 5
+    assert population.age.tolist() == [0, 2, 4, 6, 8]
+
+
+def test_aging(population):
+    """
+    Testing aging increases age by 1 and decreases weight by eta
+
+    Parameters
+    ----------
+    population: Population
+            herbivore population
+
+    Returns
+    -------
+
+    """
+    weight = population.weight.copy()
+    population.aging()
+    assert population.age.tolist() == list(range(1, 11))
+    assert population.weight == pytest.approx(weight * (1 - Herbivore.params["eta"]))
+
+
+def test_death(population):
+    """
+    Testing death against the uniform numbers of a seeded generator
+
+    Parameters
+    ----------
+    population: Population
+            herbivore population
+
+    Notes
+    -----
+    - Draw the uniform numbers with the same seed as the death step
+    - assert exactly the animals with draw >= omega * (1 - phi) survive
+
+    Returns
+    -------
+
+    """
+    draws = np.random.default_rng(7).random(len(population))
+    survives = draws >= Herbivore.params["omega"] * (1 - population.phi)
+    expected = population.age[survives].tolist()
+
+    population.death(np.random.default_rng(7))
+    assert population.age.tolist() == expected
+
+
+@pytest.mark.parametrize("omega, size", [(0, 10), (1e9, 0)])
+def test_death_omega(population, omega, size):
+    """
+    Testing death with omega controlling the death probability
+
+    Parameters
+    ----------
+    population: Population
+            herbivore population
+    omega: float
+            death parameter
+    size: int
+            expected number of survivors
+
+    Returns
+    -------
+    len(population) == size is True
+    """
+    Herbivore.update_params({"omega": omega})
+    try:
+        population.death(np.random.default_rng(1))
+    finally:
+        Herbivore.update_params({"omega": 0.4})
+    assert len(population) == size
+
+
+def test_death_zero_weight(population):
+    """
+    Testing animals without weight always die
+
+    Parameters
+    ----------
+    population: Population
+            herbivore population
+
+    Returns
+    -------
+
+    """
+    population.weight[:5] = 0
+    population.mark_dirty()
+    Herbivore.update_params({"omega": 0})
+    try:
+        population.death(np.random.default_rng(1))
+    finally:
+        Herbivore.update_params({"omega": 0.4})
+    assert population.age.tolist() == [5, 6, 7, 8, 9]
+
+
+@pytest.fixture
+def heavy_population():
+    """
+    Creates a herbivore Population with 20 animals heavy enough to give birth
+
+    Returns
+    -------
+    herbs: Population
+    """
+    Herbivore.min_weight()
+    Herbivore.calculate_mu_sigma()
+    herbs = Population(Herbivore)
+    herbs.extend(np.full(20, 5), np.full(20, 60.0))
+    return herbs
+
+
+def test_birth_weight_loss(heavy_population):
+    """
+    Testing mothers lose xi times the weight of their newborns
+
+    Parameters
+    ----------
+    heavy_population: Population
+            herbivore population
+
+    Notes
+    -----
+    - Set gamma high so that every animal gives birth
+    - assert one newborn of age zero per animal
+    - assert total weight of mothers fell by xi times the newborn weight
+
+    Returns
+    -------
+
+    """
+    Herbivore.update_params({"gamma": 100})
+    try:
+        heavy_population.birth(np.random.default_rng(3))
+    finally:
+        Herbivore.update_params({"gamma": 0.2})
+
+    assert len(heavy_population) == 40
+    mothers, newborns = heavy_population.weight[:20], heavy_population.weight[20:]
+    assert heavy_population.age[20:].tolist() == [0] * 20
+    assert 20 * 60.0 - mothers.sum() == pytest.approx(Herbivore.params["xi"] * newborns.sum())
+
+
+def test_birth_minimum_weight(heavy_population):
+    """
+    Testing animals below the minimum weight do not give birth
+
+    Parameters
+    ----------
+    heavy_population: Population
+            herbivore population
+
+    Returns
+    -------
+    len(heavy_population) == 20 is True
+    """
+    heavy_population.weight[:] = Herbivore.minimum_weight - 0.1
+    heavy_population.mark_dirty()
+    Herbivore.update_params({"gamma": 100})
+    try:
+        heavy_population.birth(np.random.default_rng(3))
+    finally:
+        Herbivore.update_params({"gamma": 0.2})
+    assert len(heavy_population) == 20
+
+
+def test_birth_single_animal(heavy_population):
+    """
+    Testing a single animal cannot give birth
+
+    Parameters
+    ----------
+    heavy_population: Population
+            herbivore population
+
+    Returns
+    -------
+    len(heavy_population) == 1 is True
+    """
+    heavy_population.compact(np.arange(20) == 0)
+    heavy_population.birth(np.random.default_rng(3))
+    assert len(heavy_population) == 1
+
+
+@pytest.mark.parametrize("fodder, eaters", [(1000.0, 10), (25.0, 3), (0.0, 0)])
+def test_graze(population, fodder, eaters):
+    """
+    Testing grazing of the population with plenty and scarce fodder
+
+    Parameters
+    ----------
+    population: Population
+            herbivore population
+    fodder: float
+            fodder available
+    eaters: int
+            expected number of animals that gain weight
+
+    Notes
+    -----
+    - assert the fodder eaten is min(fodder, N * F)
+    - assert only the eaters gain weight, by beta times what they ate
+    - assert the fitness of the eaters is updated
+
+    Returns
+    -------
+
+    """
+    params = Herbivore.params
+    weight = population.weight.copy()
+    eaten = population.graze(fodder, np.random.default_rng(5))
+    assert eaten == pytest.approx(min(fodder, len(population) * params["F"]))
+
+    gain = population.weight - weight
+    assert np.count_nonzero(gain) == eaters
+    assert gain.sum() == pytest.approx(params["beta"] * eaten)
+    assert gain.max(initial=0) <= params["beta"] * params["F"]
+    assert population.phi == pytest.approx(
+        Herbivore.batch_fitness(population.age, population.weight))
+
+
+class ConstantGenerator:
+    """
+    Stand-in for numpy.random.Generator whose uniform numbers are all equal
+    """
+
+    def __init__(self, value):
+        self.value = value
+
+    def random(self, size):
+        return np.full(size, self.value)
+
+
+@pytest.mark.parametrize("draw", [0.005, 0.02, 0.06])
+def test_hunt_matches_carnivore_feeding(monkeypatch, draw):
+    """
+    Testing columnar hunting against Carnivore.feeding with equal random numbers
+
+    Parameters
+    ----------
+    monkeypatch: pytest.MonkeyPatch
+            used to fix random.random
+    draw: float
+            value of every uniform random number
+
+    Notes
+    -----
+    - Hunt with Animal objects sorted as in Land.feeding_cycle
+    - Hunt with Population objects with the same draws
+    - assert the surviving herbivores and carnivore weights are equal
+
+    Returns
+    -------
+
+    """
+    herb_values = [(age % 15, 4.0 + 1.5 * age) for age in range(60)]
+    carn_values = [(3 + age % 4, 12.0 + 3 * age) for age in range(8)]
+
+    monkeypatch.setattr("random.random", lambda: draw)
+    herbs = sorted([Herbivore(age=a, weight=w) for a, w in herb_values],
+                   key=lambda herb: herb.phi)
+    carns = sorted([Carnivore(age=a, weight=w) for a, w in carn_values],
+                   key=lambda carn: carn.phi, reverse=True)
+    for carn in carns:
+        herbs = carn.feeding(herbs)
+
+    herb_pop, carn_pop = Population(Herbivore), Population(Carnivore)
+    herb_pop.extend(*zip(*herb_values))
+    carn_pop.extend(*zip(*carn_values))
+    carn_pop.hunt(herb_pop, ConstantGenerator(draw))
+
+    assert len(herb_pop) < len(herb_values)
+    assert sorted(zip(herb_pop.age.tolist(), herb_pop.weight.tolist())) == \
+           sorted((herb.age, herb.weight) for herb in herbs)
+    assert sorted(carn_pop.weight) == pytest.approx(sorted(carn.weight for carn in carns))
+    assert carn_pop.phi == pytest.approx(
+        Carnivore.batch_fitness(carn_pop.age, carn_pop.weight))
+
+
+def test_hunt_fitter_prey(population):
+    """
+    Testing no prey is killed if every prey is fitter than the hunters
+
+    Parameters
+    ----------
+    population: Population
+            herbivore population
+
+    Returns
+    -------
+    len(population) == 10 is True
+    """
+    carns = Population(Carnivore)
+    carns.extend([80, 90], [1.0, 2.0])
+    carns.hunt(population, ConstantGenerator(0.0))
+    assert len(population) == 10
+    assert carns.weight.tolist() == [1.0, 2.0]
@@ -0,0 +1,175 @@
+from biosim import ensemble
+from biosim.animals.herbivore import Herbivore
+from biosim.island import Island
+from biosim.simulation import BioSim
+import random
+import subprocess
+import sys
+import pytest
+
+ISLAND_MAP = "WWWWW\nWLLLW\nWLHDW\nWWWWW"
+INI_POP = [{'loc': (2, 2),
+            'pop': ([{'species': 'Herbivore', 'age': 5, 'weight': 20}
+                     for _ in range(40)] +
+                    [{'species': 'Carnivore', 'age': 5, 'weight': 20}
+                     for _ in range(8)])}]
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_ensemble_matches_biosim(columnar):
+    """
+    Testing every ensemble run gives the yearly counts of BioSim with its seed
+
+    Parameters
+    ----------
+    columnar: bool
+        use the columnar simulation engine
+
+    Notes
+    -----
+    - Run three seeds for 10 years in two worker processes
+    - assert one result per seed, with the initial population at year 0
+    - assert the counts of each year equal those of BioSim with the same seed
+
+    Returns
+    -------
+
+    """
+    results = dict(ensemble.run(ISLAND_MAP, INI_POP, [1, 2, 3], 10,
+                                workers=2, columnar=columnar))
+    assert sorted(results) == [1, 2, 3]
+
+    for seed, counts in results.items():
+        assert counts.shape == (11, 2)
+        assert counts[0].tolist() == [40, 8]
+
+        sim = BioSim(ISLAND_MAP, INI_POP, seed, vis_years=0, columnar=columnar)
+        for year in range(1, 11):
+            sim.simulate(1)
+            assert counts[year].tolist() == [sim.num_animals_per_species["Herbivore"],
+                                             sim.num_animals_per_species["Carnivore"]]
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_simulate_seed_random_module(columnar):
+    """
+    Testing a run in this process leaves the random module alone
+
+    Parameters
+    ----------
+    columnar: bool
+        use the columnar simulation engine
+
+    Notes
+    -----
+    - Simulate a copy of an island template with one seed, in this process
+    - assert the state of the random module is unchanged
+    - assert the counts equal those of BioSim with the same seed
+
+    Returns
+    -------
+
+    """
+    template = ensemble.build_island(ISLAND_MAP, INI_POP, columnar)
+    state = random.getstate()
+    counts = ensemble.simulate_seed(template, 4, 5)
+    assert random.getstate() == state
+
+    sim = BioSim(ISLAND_MAP, INI_POP, 4, vis_years=0, columnar=columnar)
+    sim.simulate(5)
+    assert counts[-1].tolist() == [sim.num_animals_per_species["Herbivore"],
+                                   sim.num_animals_per_species["Carnivore"]]
+
+
+def test_ensemble_params():
+    """
+    Testing parameters of an ensemble are set in the workers only
+
+    Notes
+    -----
+    - Without fodder no herbivore gains weight, so none give birth
+    - assert the herbivores do not increase with f_max zero
+    - assert the parameters of this process are unchanged
+
+    Returns
+    -------
+
+    """
+    mu = Herbivore.params["mu"]
+    results = dict(ensemble.run(ISLAND_MAP, INI_POP, [1], 5, workers=1,
+                                params={"L": {"f_max": 0}, "H": {"f_max": 0},
+                                        "Herbivore": {"mu": 0}}))
+    herbivores = results[1][:, 0]
+    assert (herbivores[1:] <= herbivores[:-1]).all()
+    assert Herbivore.params["mu"] == mu
+
+
+def test_ensemble_params_context(monkeypatch):
+    """
+    Testing the parameters are checked and used in a parameter context
+
+    Notes
+    -----
+    - Record the classes Island.set_params is called on
+    - assert resolve_params never sets the parameters of the Island class
+    - assert build_island gives an island with the resolved parameters,
+      and leaves the Island class unchanged
+
+    Returns
+    -------
+
+    """
+    classes = []
+    set_params = Island.set_params.__func__
+
+    def record_set_params(cls, params):
+        classes.append(cls)
+        set_params(cls, params)
+
+    monkeypatch.setattr(Island, "set_params", classmethod(record_set_params))
+    f_max = Island.get_params()["L"]["f_max"]
+    params = ensemble.resolve_params({"L": {"f_max": 0}})
+    assert classes and Island not in classes
+
+    island = ensemble.build_island(ISLAND_MAP, INI_POP, True, params)
+    assert island.get_params()["L"]["f_max"] == 0
+    assert Island.get_params()["L"]["f_max"] == f_max
+    assert Island not in classes
+
+
+@pytest.mark.parametrize("params, years", [({"X": {"f_max": 1}}, 5),
+                                           ({"Herbivore": {"zeta": -1}}, 5),
+                                           (None, -1)])
+def test_ensemble_fail(params, years):
+    """
+    Testing wrong ensemble arguments are reported before any run starts
+
+    Parameters
+    ----------
+    params: dict
+        animal and landscape parameters
+    years: int
+        number of years
+
+    Raises
+    ------
+    ValueError
+    """
+    zeta = Herbivore.params["zeta"]
+    with pytest.raises(ValueError):
+        ensemble.run(ISLAND_MAP, INI_POP, [1], years, params=params)
+    assert Herbivore.params["zeta"] == zeta
+
+
+def test_ensemble_no_visualization():
+    """
+    Testing the ensemble module does not import matplotlib
+
+    Returns
+    -------
+
+    """
+    code = "import sys, biosim.ensemble; print('matplotlib' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                            text=True, check=True).stdout
+    assert output.strip() == "False"
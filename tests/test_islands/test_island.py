@@ -1,3 +1,6 @@
+import random
+from copy import deepcopy
+import numpy as np
 from biosim.animals.carnivore import Carnivore
 from biosim.animals.herbivore import Herbivore
 from biosim.island import Island
@@ -758,3 +761,441 @@ class TestIsland:
                                    / len(animal_values["Carnivore"]["weight"])
 
         assert carnivore_new_avg_weight > carnivore_current_avg_weight
+
+
+@pytest.mark.parametrize("map1", ["WWWWW\nWLHLW\nWLDLW\nWWWWW"])
+def test_columnar_island_seed(map1, reset_params):
+    """
+    Testing a columnar island is reproducible for a given seed
+
+    Parameters
+    ----------
+    map1: str
+            Geogr multiline string representing island topology
+    reset_params: dict
+            Parameters reset value
+
+    Notes
+    -----
+    - Create two columnar islands with the same seed and population
+    - Run the annual cycle on both
+    - assert both islands have the same animals in every land object
+
+    Returns
+    -------
+
+    """
+    continents = []
+    for _ in range(2):
+        random.seed(5)
+        land_mass = Island(map1, columnar=True, seed=42)
+        land_mass.add_neighbors()
+        land_mass.add_pop((2, 2), [{"species": "Herbivore",
+                                    "age": 10,
+                                    "weight": 30} for _ in range(40)])
+        land_mass.add_pop((2, 2), [{"species": "Carnivore",
+                                    "age": 5,
+                                    "weight": 20} for _ in range(8)])
+        land_mass.update_animal_island_values()
+        for _ in range(10):
+            land_mass.annual_cycle()
+        continents.append(land_mass)
+
+    for loc, terra in continents[0].island.items():
+        other = continents[1].island[loc]
+        assert terra.rng is continents[0].rng
+        assert terra.get_hist_values() == other.get_hist_values()
+
+
+@pytest.mark.parametrize("map1, moved", [("WWWWW\nWLLLW\nWLLLW\nWLLLW\nWWWWW", True),
+                                         ("WWW\nWLW\nWWW", False)])
+def test_columnar_migration(map1, moved, reset_params):
+    """
+    Testing the columnar migration of a whole island
+
+    Parameters
+    ----------
+    map1: str
+            Geogr multiline string representing island topology
+    moved: bool
+            True if the animals have habitable neighbors to move to
+    reset_params: dict
+            Parameters reset value
+
+    Notes
+    -----
+    - Set mu high so that every animal chooses to migrate
+    - assert the animals leave the land object if a neighbor is habitable
+      and stay if all neighbors are water
+    - assert no animal is lost or ends up in water
+
+    Returns
+    -------
+
+    """
+    land_mass = Island(map1, columnar=True, seed=3)
+    land_mass.add_neighbors()
+    loc = (3, 3) if moved else (2, 2)
+    land_mass.add_pop(loc, [{"species": "Herbivore",
+                             "age": 5,
+                             "weight": 30} for _ in range(100)])
+    land_mass.add_pop(loc, [{"species": "Carnivore",
+                             "age": 5,
+                             "weight": 20} for _ in range(20)])
+    LowLand.set_animal_params("Herbivore", {"mu": 1000})
+    LowLand.set_animal_params("Carnivore", {"mu": 1000})
+    try:
+        land_mass.columnar_migration()
+    finally:
+        LowLand.set_animal_params("Herbivore", {"mu": 0.25})
+        LowLand.set_animal_params("Carnivore", {"mu": 0.4})
+
+    assert land_mass.num_animals_species == {"Herbivore": 100, "Carnivore": 20}
+    if moved:
+        assert len(land_mass.island[loc].pop_herbivore) == 0
+        for neighbor in [(2, 3), (4, 3), (3, 2), (3, 4)]:
+            assert len(land_mass.island[neighbor].pop_herbivore) > 0
+    else:
+        assert len(land_mass.island[loc].pop_herbivore) == 100
+    for terra in land_mass.island.values():
+        if not terra.habitable:
+            assert len(terra.pop_herbivore) + len(terra.pop_carnivore) == 0
+
+
+@pytest.mark.parametrize("map1", ["WWWWW\nWLHLW\nWLDLW\nWWWWW",
+                                  "WWWWW\nWLLLW\nWHWHW\nWDDDW\nWWWW"])
+def test_cell_index(map1, reset_params):
+    """
+    Testing the dense cell index of the island
+
+    Parameters
+    ----------
+    map1: str
+            Geogr multiline string representing island topology
+    reset_params: dict
+            Parameters reset value
+
+    Notes
+    -----
+    - assert every location maps to its land object through the grid
+    - assert the neighbor table gives the same neighbors as add_neighbors
+    - assert locations outside the map raise ValueError
+    - assert get_matrix puts the counts at the location of each land object
+
+    Returns
+    -------
+
+    """
+    land_mass = Island(map1)
+    land_mass.add_neighbors()
+    for cell, (loc, terra) in enumerate(land_mass.island.items()):
+        assert land_mass.cell_index(loc) == cell
+        assert land_mass.cells[cell] is terra
+        assert land_mass.habitable[cell] == terra.habitable
+        neighbors = land_mass.neighbor_index[cell, :land_mass.neighbor_count[cell]]
+        assert [land_mass.locations[n] for n in neighbors] == terra.neighbors
+
+    rows = map1.splitlines()
+    with pytest.raises(ValueError):
+        land_mass.cell_index((len(rows) + 1, 1))
+    with pytest.raises(ValueError):
+        land_mass.add_pop((len(rows), len(rows[0]) + 1), [])
+
+    land_mass.add_pop((2, 3), [{"species": "Herbivore",
+                                "age": 5,
+                                "weight": 20} for _ in range(7)])
+    carn_matrix, herb_matrix = land_mass.get_matrix()
+    assert herb_matrix.shape == (len(rows), len(rows[0]))
+    assert herb_matrix[1, 2] == 7
+    assert herb_matrix.sum() == 7
+    assert carn_matrix.sum() == 0
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_active_cells(columnar, reset_params):
+    """
+    Testing the active cell bitmap follows the occupied habitable land objects
+
+    Parameters
+    ----------
+    columnar: bool
+            store animals in Population arrays
+    reset_params: dict
+            Parameters reset value
+
+    Notes
+    -----
+    - assert only the land object given animals is active after add_pop
+    - assert land objects receiving migrants become active
+    - assert land objects become inactive when all animals die
+
+    Returns
+    -------
+
+    """
+    land_mass = Island("WWWWW\nWLLLW\nWLLLW\nWWWWW", columnar=columnar, seed=1)
+    land_mass.add_neighbors()
+    land_mass.add_pop((2, 2), [{"species": "Herbivore",
+                                "age": 5,
+                                "weight": 20} for _ in range(50)])
+    assert np.flatnonzero(land_mass.active).tolist() == [land_mass.cell_index((2, 2))]
+
+    LowLand.set_animal_params("Herbivore", {"mu": 1000, "omega": 0, "gamma": 0})
+    try:
+        land_mass.annual_cycle()
+        active = np.flatnonzero(land_mass.active).tolist()
+        assert land_mass.cell_index((2, 3)) in active
+        assert land_mass.cell_index((3, 2)) in active
+        assert all(land_mass.habitable[active])
+
+        LowLand.set_animal_params("Herbivore", {"mu": 0, "omega": 1e9})
+        land_mass.annual_cycle()
+    finally:
+        LowLand.set_animal_params("Herbivore", {"mu": 0.25, "omega": 0.4, "gamma": 0.2})
+    assert not land_mass.active.any()
+    assert land_mass.num_animals_species == {"Herbivore": 0, "Carnivore": 0}
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_counters(columnar, reset_params):
+    """
+    Testing the island counters match the animals on the land objects
+
+    Parameters
+    ----------
+    columnar: bool
+            store animals in Population arrays
+    reset_params: dict
+            Parameters reset value
+
+    Notes
+    -----
+    - Run the annual cycle and compare the counters with a full recount
+    - Change a land population directly, update_counts picks it up
+
+    Returns
+    -------
+
+    """
+    land_mass = Island("WWWWW\nWLHLW\nWLDLW\nWWWWW", columnar=columnar, seed=2)
+    land_mass.add_neighbors()
+    land_mass.add_pop((2, 2), [{"species": "Herbivore",
+                                "age": 5,
+                                "weight": 20} for _ in range(60)])
+    land_mass.add_pop((2, 2), [{"species": "Carnivore",
+                                "age": 5,
+                                "weight": 20} for _ in range(10)])
+    land_mass.update_animal_island_values()
+
+    for _ in range(5):
+        land_mass.annual_cycle()
+        herbivores = [len(terra.pop_herbivore) for terra in land_mass.cells]
+        carnivores = [len(terra.pop_carnivore) for terra in land_mass.cells]
+        assert land_mass.counts.tolist() == [herbivores, carnivores]
+        assert land_mass.num_animals_species == {"Herbivore": sum(herbivores),
+                                                 "Carnivore": sum(carnivores)}
+        assert land_mass.animal_count() == sum(herbivores) + sum(carnivores)
+
+    land_mass.island[(3, 4)].insert_pop([{"species": "Herbivore",
+                                          "age": 5,
+                                          "weight": 20}])
+    land_mass.update_counts()
+    assert land_mass.num_animals_species["Herbivore"] == sum(herbivores) + 1
+    assert land_mass.active[land_mass.cell_index((3, 4))]
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_cell_streams(columnar):
+    """
+    Testing the stream of a land object depends on the seed and its location only
+
+    Parameters
+    ----------
+    columnar: bool
+        use the columnar simulation engine
+
+    Notes
+    -----
+    - Create two islands with the same seed and different maps
+    - assert the land object at (2, 2) draws the same numbers on both
+    - assert another seed and another location draw different numbers
+    - assert water has no stream of its own
+
+    Returns
+    -------
+
+    """
+    first = Island("WWWW\nWLLW\nWWWW", columnar=columnar, seed=5, cell_streams=True)
+    second = Island("WWWWW\nWLDHW\nWHLLW\nWWWWW", columnar=columnar, seed=5,
+                    cell_streams=True)
+    other_seed = Island("WWWW\nWLLW\nWWWW", columnar=columnar, seed=6, cell_streams=True)
+
+    draws = [island.island[(2, 2)].rng.random() for island in (first, second, other_seed)]
+    assert draws[0] == draws[1]
+    assert draws[0] != draws[2]
+    assert second.island[(2, 3)].rng.random() != second.island[(3, 2)].rng.random()
+    assert first.island[(1, 1)].rng is (first.rng if columnar else first.random)
+
+
+def test_cell_streams_order_independent(reset_params):
+    """
+    Testing land objects with cell streams give the same results in any order
+
+    Notes
+    -----
+    - Run birth, regrow and feeding on the land objects of two islands,
+      forwards on one and backwards on the other
+    - assert every land object has the same animals on both islands
+
+    Returns
+    -------
+
+    """
+    islands = [Island("WWWWW\nWLLLW\nWLHDW\nWWWWW", columnar=True, seed=7, cell_streams=True)
+               for _ in range(2)]
+    for land_mass in islands:
+        land_mass.add_neighbors()
+        for loc in ((2, 2), (2, 4), (3, 3)):
+            land_mass.add_pop(loc, [{"species": "Herbivore", "age": 5, "weight": 40}
+                                    for _ in range(30)] +
+                              [{"species": "Carnivore", "age": 5, "weight": 30}
+                               for _ in range(5)])
+    Island.update_animal_island_values()
+
+    for land_mass, order in zip(islands, (1, -1)):
+        for cell in np.flatnonzero(land_mass.active)[::order].tolist():
+            terra = land_mass.cells[cell]
+            terra.birth_cycle()
+            terra.regrow()
+            terra.feeding_cycle()
+
+    for first, second in zip(*(land_mass.cells for land_mass in islands)):
+        for species in ("pop_herbivore", "pop_carnivore"):
+            assert getattr(first, species).weight.tolist() == \
+                   getattr(second, species).weight.tolist()
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_histogram_arrays(columnar, reset_params):
+    """
+    Testing the histogram arrays hold the values of every land object
+
+    Parameters
+    ----------
+    columnar: bool
+            store animals in Population arrays
+    reset_params: dict
+            Parameters reset value
+
+    Notes
+    -----
+    - Run a few years so that the animals spread over the island
+    - assert the arrays equal the values of the land objects, in their order
+
+    Returns
+    -------
+
+    """
+    land_mass = Island("WWWWW\nWLHLW\nWLDLW\nWWWWW", columnar=columnar, seed=3)
+    land_mass.add_neighbors()
+    land_mass.add_pop((2, 2), [{"species": "Herbivore", "age": 5, "weight": 20}
+                               for _ in range(60)] +
+                      [{"species": "Carnivore", "age": 5, "weight": 20}
+                       for _ in range(10)])
+    land_mass.update_animal_island_values()
+    for _ in range(3):
+        land_mass.annual_cycle()
+
+    histogram = land_mass.get_histogram()
+    for species in ("Herbivore", "Carnivore"):
+        for key in ("age", "weight", "fitness"):
+            expected = [value for terra in land_mass.cells
+                        for value in terra.get_hist_values()[species][key]]
+            assert isinstance(histogram[species][key], np.ndarray)
+            assert histogram[species][key].tolist() == expected
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_matrix_views(columnar, reset_params):
+    """
+    Testing the density matrices are views of the counts array
+
+    Parameters
+    ----------
+    columnar: bool
+            store animals in Population arrays
+    reset_params: dict
+            Parameters reset value
+
+    Notes
+    -----
+    - assert the matrices share memory with the counts array, and are read-only
+    - assert they follow the counts after a year, and after a copy of the island
+    - assert a ragged map still gives the counts at their locations
+
+    Raises
+    ------
+    ValueError
+    """
+    land_mass = Island("WWWW\nWLHW\nWWWW", columnar=columnar, seed=2)
+    land_mass.add_neighbors()
+    land_mass.add_pop((2, 2), [{"species": "Herbivore", "age": 5, "weight": 20}
+                               for _ in range(30)])
+    carn_matrix, herb_matrix = land_mass.get_matrix()
+    assert np.shares_memory(herb_matrix, land_mass.counts)
+    assert np.shares_memory(carn_matrix, land_mass.counts)
+    with pytest.raises(ValueError):
+        herb_matrix[1, 1] = 0
+    assert land_mass.counts[0, 5] == 30
+
+    land_mass.annual_cycle()
+    assert herb_matrix.sum() == land_mass.num_animals_species["Herbivore"]
+    assert herb_matrix[1, 1:3].tolist() == [land_mass.counts[0, 5], land_mass.counts[0, 6]]
+
+    copy = deepcopy(land_mass)
+    copy.annual_cycle()
+    assert copy.get_matrix()[1].sum() == copy.num_animals_species["Herbivore"]
+
+    ragged = Island("WWWW\nWLW\nWWWW")
+    ragged.add_pop((2, 2), [{"species": "Herbivore", "age": 5, "weight": 20}])
+    assert ragged.get_matrix()[1].tolist() == [[0, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 0]]
+    assert not ragged.get_matrix()[1].flags.writeable
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_histogram_counts(columnar, reset_params):
+    """
+    Testing the histogram counts equal the histograms of the values
+
+    Parameters
+    ----------
+    columnar: bool
+            store animals in Population arrays
+    reset_params: dict
+            Parameters reset value
+
+    Notes
+    -----
+    - Spread herbivores over two land objects, with ages and weights beyond
+      the last bin
+    - assert the counts equal the histograms of the values of the island
+
+    Returns
+    -------
+
+    """
+    land_mass = Island("WWWWW\nWLHLW\nWWWWW", columnar=columnar, seed=4)
+    land_mass.add_neighbors()
+    for loc in ((2, 2), (2, 3)):
+        land_mass.add_pop(loc, [{"species": "Herbivore", "age": age, "weight": 5 + 2 * age}
+                                for age in range(40)])
+    land_mass.annual_cycle()
+
+    bin_edges = {"age": np.arange(0, 31, 2), "weight": np.arange(0, 61, 2),
+                 "fitness": np.arange(0, 1.025, 0.05)}
+    counts = land_mass.get_histogram_counts(bin_edges)
+    values = land_mass.get_histogram()
+    for key, edges in bin_edges.items():
+        assert counts["Herbivore"][key].tolist() == \
+               np.histogram(values["Herbivore"][key], edges)[0].tolist()
+        assert counts["Carnivore"][key].sum() == 0
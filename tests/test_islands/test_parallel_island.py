@@ -0,0 +1,172 @@
+import numpy as np
+from biosim.island import Island
+from biosim.parallel_island import ParallelIsland
+import pytest
+
+ISLAND_MAP = "\n".join(["W" * 10] + ["W" + "L" * 8 + "W"] * 8 + ["W" * 10])
+
+
+def herbivores(number, weight=20):
+    """
+    Animal dictionaries of herbivores
+
+    Parameters
+    ----------
+    number: int
+        number of herbivores
+    weight: float
+        weight of every herbivore
+
+    Returns
+    -------
+    list
+    """
+    return [{"species": "Herbivore", "age": 5, "weight": weight} for _ in range(number)]
+
+
+def carnivores(number):
+    """
+    Animal dictionaries of carnivores
+
+    Parameters
+    ----------
+    number: int
+        number of carnivores
+
+    Returns
+    -------
+    list
+    """
+    return [{"species": "Carnivore", "age": 5, "weight": 20} for _ in range(number)]
+
+
+def test_migrants_cross_bands():
+    """
+    Testing migrants are exchanged between bands without losing any
+
+    Notes
+    -----
+    - With gamma and omega zero no herbivore is born or dies; they are set
+      on a parameter context only
+    - Place all herbivores in the top row of the island
+    - assert the total stays the same every year
+    - assert herbivores reach the rows of every band
+
+    Returns
+    -------
+
+    """
+    context = Island.new_context()
+    context.set_params({"Herbivore": {"gamma": 0, "omega": 0, "mu": 1}})
+    with ParallelIsland(ISLAND_MAP, bands=3, seed=1, params=context.get_params()) as island:
+        island.add_pop((2, 5), herbivores(200, weight=40))
+        assert island.num_animals_species == {"Herbivore": 200, "Carnivore": 0}
+        for _ in range(10):
+            island.annual_cycle()
+            assert island.animal_count() == 200
+        carn_matrix, herb_matrix = island.get_matrix()
+
+    assert herb_matrix.sum() == 200
+    assert carn_matrix.sum() == 0
+    for rows in np.array_split(np.arange(10), 3):
+        assert herb_matrix[rows].sum() > 0
+    assert herb_matrix[0].sum() == herb_matrix[-1].sum() == 0
+
+
+def test_parallel_reproducible():
+    """
+    Testing the same seed and bands give the same island
+
+    Returns
+    -------
+
+    """
+    matrices = []
+    for _ in range(2):
+        with ParallelIsland(ISLAND_MAP, bands=2, seed=3) as island:
+            island.add_pop((3, 3), herbivores(40) + carnivores(5))
+            island.add_pop((8, 8), herbivores(40))
+            for _ in range(5):
+                island.annual_cycle()
+            matrices.append(island.get_matrix())
+    for first, second in zip(*matrices):
+        assert (first == second).all()
+
+
+@pytest.mark.parametrize("bands", [1, 3, 5])
+def test_parallel_matches_serial(bands):
+    """
+    Testing the parallel island gives the island of the serial one with cell streams
+
+    Parameters
+    ----------
+    bands: int
+        number of bands
+
+    Notes
+    -----
+    - Run 10 years on a serial island with cell streams and a parallel one
+    - assert the density matrices are equal, whatever the number of bands
+
+    Returns
+    -------
+
+    """
+    geogr = "\n".join(["W" * 10] + ["W" + "LLHHDDLL" + "W"] * 8 + ["W" * 10])
+    serial = Island(geogr, columnar=True, seed=4, cell_streams=True)
+    serial.add_neighbors()
+    Island.update_animal_island_values()
+    with ParallelIsland(geogr, bands=bands, seed=4) as parallel:
+        for island in (serial, parallel):
+            island.add_pop((5, 5), herbivores(50) + carnivores(10))
+            island.add_pop((2, 3), herbivores(50))
+            for _ in range(10):
+                island.annual_cycle()
+        matrices = parallel.get_matrix()
+        assert parallel.num_animals_species == serial.num_animals_species
+
+    for parallel_matrix, serial_matrix in zip(matrices, serial.get_matrix()):
+        assert (parallel_matrix == serial_matrix).all()
+
+
+@pytest.mark.parametrize("geogr, bands, params", [(ISLAND_MAP, 0, None), (ISLAND_MAP, "2", None),
+                                                  ("WWW\nWXW\nWWW", 2, None),
+                                                  (ISLAND_MAP, 2, {"Herbivore": {"mu": -1}})])
+def test_parallel_island_fail(geogr, bands, params):
+    """
+    Testing wrong parallel island arguments
+
+    Parameters
+    ----------
+    geogr: str
+        island geography
+    bands: int
+        number of bands
+    params: dict
+        animal and landscape parameters
+
+    Raises
+    ------
+    ValueError
+    """
+    with pytest.raises(ValueError):
+        ParallelIsland(geogr, bands=bands, params=params)
+
+
+@pytest.mark.parametrize("loc", [(0, 3), (11, 3), (3, 20)])
+def test_parallel_add_pop_fail(loc):
+    """
+    Testing adding a population at a location that does not exist
+
+    Parameters
+    ----------
+    loc: tuple
+        location of the population
+
+    Raises
+    ------
+    ValueError
+    """
+    with ParallelIsland(ISLAND_MAP, bands=2) as island:
+        with pytest.raises(ValueError):
+            island.add_pop(loc, herbivores(1))
@@ -0,0 +1,287 @@
+import pytest
+import random
+import numpy as np
+from biosim.animals.herbivore import Herbivore
+from biosim.animals.population import Population
+from biosim.land.lowland import LowLand
+from biosim.land.highland import HighLand
+from biosim.land.desert import Desert
+
+
+@pytest.mark.parametrize("land_type", [LowLand, HighLand, Desert])
+class TestColumnarLand:
+    """
+    The test class comparing columnar land objects with object based ones
+    """
+
+    @pytest.fixture(autouse=True)
+    def create(self, land_type):
+        """
+        Create an object based and a columnar land with the same animals
+
+        Parameters
+        ----------
+        land_type: class
+                Land type to create
+
+        Returns
+        -------
+
+        """
+        self.lands = [land_type(), land_type(columnar=True)]
+        for terra in self.lands:
+            terra.neighbors = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+            terra.insert_pop([{"species": "Herbivore",
+                               "age": str(age % 30),
+                               "weight": str(10 + age)} for age in range(40)])
+            terra.insert_pop([{"species": "Carnivore",
+                               "age": str(age % 20),
+                               "weight": str(8 + age)} for age in range(10)])
+        LowLand.update_animal_values()
+
+    def values(self, terra):
+        """
+        Age and weight of every animal on a land object
+
+        Parameters
+        ----------
+        terra: Land
+                land object
+
+        Returns
+        -------
+        list
+        """
+        return [[(animal.age, pytest.approx(animal.weight))
+                 for animal in population]
+                for population in (terra.pop_herbivore, terra.pop_carnivore)]
+
+    def test_columnar_storage(self):
+        """
+        Testing that a columnar land keeps the animals in Population arrays
+
+        Returns
+        -------
+
+        """
+        terra = self.lands[1]
+        assert isinstance(terra.pop_herbivore, Population)
+        assert isinstance(terra.pop_carnivore, Population)
+        assert len(terra.pop_herbivore) == 40
+        assert len(terra.pop_carnivore) == 10
+        assert self.values(self.lands[0]) == self.values(terra)
+
+    @pytest.mark.parametrize("cycle", ["aging_cycle"])
+    def test_cycle_equivalence(self, cycle):
+        """
+        Testing that a cycle gives the same animals on both land objects
+
+        Parameters
+        ----------
+        cycle: str
+                name of the cycle method
+
+        Notes
+        -----
+        - Run the cycle on both lands with the same random seed
+        - assert the age and weight of all animals are equal
+
+        Returns
+        -------
+
+        """
+        for terra in self.lands:
+            random.seed(1234)
+            for _ in range(5):
+                getattr(terra, cycle)()
+                terra.regrow()
+        assert self.values(self.lands[0]) == self.values(self.lands[1])
+
+    def test_grazing(self):
+        """
+        Testing the columnar feeding cycle lets the herbivores eat the fodder
+
+        Notes
+        -----
+        - Remove the carnivores so that only grazing changes the weights
+        - assert the fodder decreases by min(fodder, N * F)
+        - assert the herbivores gain beta times the fodder eaten
+
+        Returns
+        -------
+
+        """
+        terra = self.lands[1]
+        terra.pop_carnivore = []
+        terra.regrow()
+        fodder = terra.fodder
+        weight = terra.pop_herbivore.weight.sum()
+        terra.feeding_cycle()
+
+        eaten = min(fodder, 40 * Herbivore.params["F"])
+        assert fodder - terra.fodder == pytest.approx(eaten)
+        assert terra.pop_herbivore.weight.sum() - weight == \
+               pytest.approx(Herbivore.params["beta"] * eaten)
+
+    def test_feeding_without_objects(self, monkeypatch):
+        """
+        Testing the columnar feeding cycle runs without Animal objects
+
+        Parameters
+        ----------
+        monkeypatch: pytest.MonkeyPatch
+                used to make Population.to_animals fail
+
+        Returns
+        -------
+
+        """
+        terra = self.lands[1]
+        terra.rng = np.random.default_rng(123)
+
+        def to_animals(population):
+            raise AssertionError("feeding created Animal objects")
+
+        monkeypatch.setattr(Population, "to_animals", to_animals)
+        carnivore_weight = terra.pop_carnivore.weight.sum()
+        for _ in range(10):
+            terra.regrow()
+            terra.feeding_cycle()
+        assert len(terra.pop_herbivore) <= 40
+        assert terra.pop_carnivore.weight.sum() >= carnivore_weight
+
+    def test_hist_values(self):
+        """
+        Testing get_hist_values gives the same lists on both land objects
+
+        Returns
+        -------
+
+        """
+        object_values, columnar_values = [terra.get_hist_values() for terra in self.lands]
+        for species in ("Herbivore", "Carnivore"):
+            assert object_values[species]["age"] == columnar_values[species]["age"]
+            assert object_values[species]["fitness"] == \
+                   pytest.approx(columnar_values[species]["fitness"])
+
+    def test_set_population(self):
+        """
+        Testing assignment of an Animal list to a columnar land
+
+        Returns
+        -------
+
+        """
+        self.lands[1].pop_herbivore = self.lands[0].pop_herbivore[:5]
+        assert len(self.lands[1].pop_herbivore) == 5
+        assert isinstance(self.lands[1].pop_herbivore, Population)
+
+    @pytest.mark.parametrize("years", [10, 50])
+    def test_death_cycle(self, years):
+        """
+        Testing the columnar death cycle reduces the population over the years
+
+        Parameters
+        ----------
+        years: int
+                Iteration number
+
+        Returns
+        -------
+
+        """
+        terra = self.lands[1]
+        terra.rng = np.random.default_rng(123)
+        current_herb_pop = len(terra.pop_herbivore)
+        for _ in range(years):
+            terra.aging_cycle()
+            terra.death_cycle()
+        assert len(terra.pop_herbivore) < current_herb_pop
+
+    def test_death_cycle_omega_zero(self):
+        """
+        Testing no animal dies in the columnar death cycle if omega is zero
+
+        Returns
+        -------
+
+        """
+        terra = self.lands[1]
+        terra.set_animal_params("Herbivore", {"omega": 0})
+        terra.set_animal_params("Carnivore", {"omega": 0})
+        try:
+            for _ in range(10):
+                terra.death_cycle()
+        finally:
+            terra.set_animal_params("Herbivore", {"omega": 0.4})
+            terra.set_animal_params("Carnivore", {"omega": 0.8})
+        assert len(terra.pop_herbivore) == 40
+        assert len(terra.pop_carnivore) == 10
+
+    @pytest.mark.parametrize("years", [10, 50])
+    def test_birth_cycle(self, years):
+        """
+        Testing the columnar birth cycle adds newborns of age zero
+
+        Parameters
+        ----------
+        years: int
+                Iteration number
+
+        Returns
+        -------
+
+        """
+        terra = self.lands[1]
+        terra.rng = np.random.default_rng(123)
+        for _ in range(years):
+            terra.birth_cycle()
+        # Carnivores of the fixture are below their minimum weight.
+        assert len(terra.pop_herbivore) > 40
+        assert len(terra.pop_carnivore) == 10
+        assert 0 in terra.pop_herbivore.age
+
+    def test_birth_cycle_no_child(self):
+        """
+        Testing no child is born in the columnar birth cycle if gamma is zero
+
+        Returns
+        -------
+
+        """
+        terra = self.lands[1]
+        terra.set_animal_params("Herbivore", {"gamma": 0})
+        terra.set_animal_params("Carnivore", {"gamma": 0})
+        try:
+            for _ in range(10):
+                terra.birth_cycle()
+        finally:
+            terra.set_animal_params("Herbivore", {"gamma": 0.2})
+            terra.set_animal_params("Carnivore", {"gamma": 0.8})
+        assert len(terra.pop_herbivore) == 40
+        assert len(terra.pop_carnivore) == 10
+
+    @pytest.mark.parametrize("cycle", ["migration_cycle", "combine_pop"])
+    def test_object_migration_fail(self, cycle):
+        """
+        Testing a columnar land does not run the object based migration
+
+        Parameters
+        ----------
+        cycle: str
+                name of the migration method
+
+        Notes
+        -----
+        - Columnar islands migrate with Island.columnar_migration, so the
+          object based migration would only run unseeded on Animal objects
+
+        Raises
+        ------
+        RuntimeError
+        """
+        terra = self.lands[1]
+        with pytest.raises(RuntimeError):
+            getattr(terra, cycle)()
+        assert len(terra.pop_herbivore) == 40
+        assert len(terra.pop_carnivore) == 10
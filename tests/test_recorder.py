@@ -0,0 +1,102 @@
+from biosim.recorder import Recorder
+from biosim.simulation import BioSim
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("chunk_years", [1, 3, 50])
+def test_record_and_grow(tmp_path, chunk_years):
+    """
+    Testing the recorder grows the file in chunks and keeps earlier years
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the record file
+    chunk_years: int
+        years the file grows by
+
+    Notes
+    -----
+    - Record 10 years of known matrices
+    - assert the flushed file holds exactly the years recorded
+    - assert close cuts the file to the years recorded
+
+    Returns
+    -------
+
+    """
+    path = str(tmp_path / "record.npy")
+    recorder = Recorder(path, (3, 4), chunk_years=chunk_years)
+    matrices = [(np.full((3, 4), year), np.arange(12).reshape(3, 4) * year)
+                for year in range(10)]
+    for year, (herb, carn) in enumerate(matrices):
+        recorder.record(year, herb, carn)
+    recorder.flush()
+
+    data = Recorder.load(path)
+    assert data.shape == (10, 3, 4, 2)
+    for year, (herb, carn) in enumerate(matrices):
+        assert data[year, ..., 0].tolist() == herb.tolist()
+        assert data[year, ..., 1].tolist() == carn.tolist()
+    del data
+
+    recorder.close()
+    assert (tmp_path / "record.npy").stat().st_size == \
+           recorder.offset + 10 * recorder.frame_size
+    assert np.load(path).shape == (10, 3, 4, 2)
+
+
+def test_record_fail(tmp_path):
+    """
+    Testing wrong chunk_years
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the record file
+
+    Raises
+    ------
+    ValueError
+    """
+    with pytest.raises(ValueError):
+        Recorder(str(tmp_path / "record.npy"), (3, 3), chunk_years=0)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_simulation_record(tmp_path, columnar):
+    """
+    Testing BioSim records the count matrix of every year
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the record file
+    columnar: bool
+        store animals in Population arrays
+
+    Returns
+    -------
+
+    """
+    path = str(tmp_path / "record.npy")
+    ini_pop = [{'loc': (2, 2),
+                'pop': [{'species': 'Herbivore', 'age': 5, 'weight': 20}
+                        for _ in range(30)]}]
+    with BioSim("WWWWW\nWLLLW\nWWWWW", ini_pop=ini_pop, seed=1, vis_years=0,
+                columnar=columnar, record_file=path, record_chunk_years=4) as sim:
+        sim.simulate(5)
+        sim.simulate(3)
+
+    # Closing cuts the file from three chunks to the nine years recorded.
+    assert (tmp_path / "record.npy").stat().st_size == \
+           sim.recorder.offset + 9 * sim.recorder.frame_size
+
+    data = Recorder.load(path)
+    assert data.shape == (9, 3, 5, 2)
+    assert data[0, 1, 1, 0] == 30
+    c_matrix, h_matrix = sim.get_matrix()
+    assert data[8, ..., 0].tolist() == h_matrix.tolist()
+    assert data[8, ..., 1].tolist() == c_matrix.tolist()
+    assert data[..., 0].sum(axis=(1, 2))[-1] == sim.num_animals_per_species["Herbivore"]
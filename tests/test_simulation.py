@@ -1,9 +1,12 @@
-from biosim.animals.carnivore import Carnivore
-from biosim.animals.herbivore import Herbivore
+from biosim.frame_writer import FrameWriter
+from biosim.island import Island
+from biosim.recorder import Recorder
 from biosim.simulation import BioSim
+import matplotlib.image as mpimg
+import matplotlib.pyplot as plt
+import numpy as np
 import pytest
-from biosim.land.lowland import LowLand
-from biosim.land.highland import HighLand
+import random
 
 
 @pytest.mark.parametrize("map1", [("WWW\nWLW\nWWW")])
@@ -307,24 +310,74 @@ def test_update_params_success(map1, reset_params):
 
     Returns
     -------
-    LowLand.f_max == 700 is True
-    HighLand.f_max == 100 is True
-    Carnivore.params['w_birth'] == 4.0 is True
-    Herbivore.params['w_birth'] == 10.0 is True
+    f_max of L == 700 is True
+    f_max of H == 100 is True
+    Carnivore w_birth == 4.0 is True
+    Herbivore w_birth == 10.0 is True
+    parameters of the Island class unchanged
     """
+    params = Island.get_params()
     sim = BioSim(map1, ini_pop=[], seed=1, vis_years=0)
 
     sim.set_landscape_parameters('L', {'f_max': 700})
-    assert LowLand.f_max == 700
+    assert sim.map.get_params()["L"]["f_max"] == 700
 
     sim.set_landscape_parameters('H', {'f_max': 100})
-    assert HighLand.f_max == 100
+    assert sim.map.get_params()["H"]["f_max"] == 100
 
     sim.set_animal_parameters("Carnivore", {"w_birth": 4.0})
-    assert Carnivore.params['w_birth'] == 4.0
+    assert sim.map.get_params()["Carnivore"]['w_birth'] == 4.0
 
     sim.set_animal_parameters("Herbivore", {"w_birth": 10.0})
-    assert Herbivore.params['w_birth'] == 10.0
+    assert sim.map.get_params()["Herbivore"]['w_birth'] == 10.0
+
+    # The parameters of the classes, and of other simulations, are unchanged.
+    assert Island.get_params() == params
+
+
+def test_simulations_independent():
+    """
+    Testing two simulations in one process do not affect each other
+
+    Notes
+    -----
+    - Run a simulation alone, and again interleaved year by year with a
+      second simulation that has other parameters
+    - assert the interleaved run gives the same animals as the one alone
+    - assert the random module is not reseeded by BioSim
+
+    Returns
+    -------
+
+    """
+    ini_pop = [{'loc': (2, 2),
+                'pop': ([{'species': 'Herbivore', 'age': 5, 'weight': 20}
+                         for _ in range(40)] +
+                        [{'species': 'Carnivore', 'age': 5, 'weight': 20}
+                         for _ in range(8)])}]
+    island_map = "WWWWW\nWLLLW\nWLHDW\nWWWWW"
+
+    params = Island.get_params()
+    alone = BioSim(island_map, ini_pop=ini_pop, seed=2, vis_years=0)
+    alone.simulate(10)
+
+    random.seed(99)
+    expected = random.random()
+    random.seed(99)
+    sim = BioSim(island_map, ini_pop=ini_pop, seed=2, vis_years=0)
+    other = BioSim(island_map, ini_pop=ini_pop, seed=3, vis_years=0)
+    other.set_animal_parameters("Herbivore", {"mu": 1.0, "omega": 0.1})
+    other.set_landscape_parameters("L", {"f_max": 200})
+    for _ in range(10):
+        sim.simulate(1)
+        other.simulate(1)
+    assert random.random() == expected
+
+    assert sim.num_animals_per_species == alone.num_animals_per_species
+    for species, values in alone.get_histogram_values().items():
+        for key, value in values.items():
+            assert (sim.get_histogram_values()[species][key] == value).all()
+    assert Island.get_params() == params
 
 
 @pytest.mark.parametrize('island, location', [("WWWWW\nWWLWW\nWHDHW\nWWLWW\nWWWWW", (3, 3)),
@@ -471,3 +524,510 @@ class TestBiosim:
         """
         self.bio_simulate.simulate(years)
         assert self.bio_simulate.year == years
+
+
+@pytest.mark.parametrize("columnar", ["yes", 1])
+def test_columnar_fail(columnar):
+    """
+    Testing columnar only accepts booleans
+
+    Parameters
+    ----------
+    columnar: str, int
+        wrong columnar value
+
+    Returns
+    -------
+
+    Raises
+    ------
+    ValueError
+    """
+    with pytest.raises(ValueError):
+        BioSim("WWW\nWLW\nWWW", ini_pop=[], seed=1, vis_years=0, columnar=columnar)
+
+
+@pytest.mark.parametrize("years", [5, 20])
+def test_columnar_simulate(years):
+    """
+    Testing a columnar simulation runs and keeps animals on the island
+
+    Parameters
+    ----------
+    years: int
+        Iterations
+
+    Returns
+    -------
+    sim.year == years is True
+    """
+    ini_pop = [{'loc': (2, 2),
+                'pop': ([{'species': 'Herbivore', 'age': 5, 'weight': 20}
+                         for _ in range(50)] +
+                        [{'species': 'Carnivore', 'age': 5, 'weight': 20}
+                         for _ in range(20)])}]
+    sim = BioSim("WWWWW\nWLLLW\nWLHDW\nWWWWW", ini_pop=ini_pop, seed=1,
+                 vis_years=0, columnar=True)
+    sim.simulate(years)
+    assert sim.year == years
+    assert sim.num_animals > 0
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("flush_years", [1, 4, 100])
+def test_log_file(tmp_path, columnar, flush_years):
+    """
+    Testing the buffered log file holds one line per simulated year
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the log file
+    columnar: bool
+        store animals in Population arrays
+    flush_years: int
+        years buffered before writing
+
+    Notes
+    -----
+    - Lines are only guaranteed on disk after simulate returns
+    - The last line holds the final animal counts
+
+    Returns
+    -------
+
+    """
+    log_file = str(tmp_path / "log.csv")
+    ini_pop = [{'loc': (2, 2),
+                'pop': [{'species': 'Herbivore', 'age': 5, 'weight': 20}
+                        for _ in range(30)]}]
+    with BioSim("WWWW\nWLLW\nWWWW", ini_pop=ini_pop, seed=1, vis_years=0,
+                log_file=log_file, columnar=columnar, log_flush_years=flush_years) as sim:
+        sim.simulate(6)
+        sim.simulate(3)
+
+        with open(log_file) as file:
+            lines = file.read().splitlines()
+        assert lines[0] == "Year,Herbivore,Carnivore"
+        assert len(lines) == 10
+        count = sim.num_animals_per_species
+        assert lines[-1] == f"9, {count['Herbivore']},{count['Carnivore']}"
+    assert sim.log_writer.file.closed
+
+
+def test_log_file_stats(tmp_path):
+    """
+    Testing the log file with the mean values of each species
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the log file
+
+    Returns
+    -------
+
+    """
+    log_file = str(tmp_path / "log.csv")
+    ini_pop = [{'loc': (2, 2),
+                'pop': [{'species': 'Herbivore', 'age': 5, 'weight': 20}
+                        for _ in range(30)]}]
+    with BioSim("WWWW\nWLLW\nWWWW", ini_pop=ini_pop, seed=1, vis_years=0,
+                log_file=log_file, log_stats=True) as sim:
+        sim.simulate(2)
+
+    with open(log_file) as file:
+        header, *lines = file.read().splitlines()
+    assert header.split(",")[:4] == ["Year", "Herbivore", "Carnivore",
+                                     "Herbivore_mean_weight"]
+    assert len(header.split(",")) == len(lines[-1].split(",")) == 9
+
+    values = sim.get_histogram_values()["Herbivore"]
+    mean_age = float(lines[-1].split(",")[4])
+    assert mean_age == pytest.approx(sum(values["age"]) / len(values["age"]))
+    assert lines[-1].split(",")[6:] == ["0", "0", "0"]
+
+
+@pytest.mark.parametrize("log_flush_years, log_stats", [(0, False), ("1", False), (1, 1)])
+def test_log_file_fail(tmp_path, log_flush_years, log_stats):
+    """
+    Testing wrong log writer settings
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the log file
+    log_flush_years: int
+        years buffered before writing
+    log_stats: bool
+        log mean values
+
+    Raises
+    ------
+    ValueError
+    """
+    with pytest.raises(ValueError):
+        BioSim("WWW\nWLW\nWWW", ini_pop=[], seed=1, vis_years=0,
+               log_file=str(tmp_path / "log.csv"), log_flush_years=log_flush_years,
+               log_stats=log_stats)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_checkpoint_resume(tmp_path, columnar):
+    """
+    Testing a simulation restored from a checkpoint continues like the original
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the checkpoint file
+    columnar: bool
+        use the columnar simulation engine
+
+    Notes
+    -----
+    - Simulate 5 years and save a checkpoint
+    - Simulate 5 more years with the original and the restored simulation
+    - assert the year, animal counts, density matrices and weights are equal
+
+    Returns
+    -------
+
+    """
+    checkpoint = str(tmp_path / "sim.ckpt")
+    ini_pop = [{'loc': (2, 2),
+                'pop': ([{'species': 'Herbivore', 'age': 5, 'weight': 20}
+                         for _ in range(50)] +
+                        [{'species': 'Carnivore', 'age': 5, 'weight': 20}
+                         for _ in range(10)])}]
+    sim = BioSim("WWWWW\nWLLLW\nWLHDW\nWWWWW", ini_pop=ini_pop, seed=3,
+                 vis_years=0, columnar=columnar)
+    sim.simulate(5)
+    sim.save_checkpoint(checkpoint)
+    sim.simulate(5)
+
+    restored = BioSim.load_checkpoint(checkpoint)
+    assert restored.year == 5
+    restored.simulate(5)
+
+    assert restored.year == sim.year
+    assert restored.num_animals_per_species == sim.num_animals_per_species
+    for original, copy in zip(sim.map.get_matrix(), restored.map.get_matrix()):
+        assert (original == copy).all()
+    assert restored.get_histogram_values()["Herbivore"]["weight"].tolist() == \
+           sim.get_histogram_values()["Herbivore"]["weight"].tolist()
+
+
+def test_checkpoint_params(tmp_path):
+    """
+    Testing a checkpoint restores the animal and landscape parameters
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the checkpoint file
+
+    Returns
+    -------
+
+    """
+    checkpoint = str(tmp_path / "sim.ckpt")
+    params = Island.get_params()
+    sim = BioSim("WWW\nWLW\nWWW", ini_pop=[], seed=1, vis_years=0)
+    sim.set_animal_parameters("Herbivore", {"mu": 0.3})
+    sim.set_landscape_parameters("L", {"f_max": 700})
+    sim.save_checkpoint(checkpoint)
+    sim.set_animal_parameters("Herbivore", {"mu": 0.25})
+    sim.set_landscape_parameters("L", {"f_max": 800})
+
+    restored = BioSim.load_checkpoint(checkpoint)
+    assert restored.map.get_params()["Herbivore"]["mu"] == 0.3
+    assert restored.map.get_params()["L"]["f_max"] == 700
+    assert Island.get_params() == params
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_checkpoint_outputs(tmp_path, columnar):
+    """
+    Testing a restored simulation continues the log and record files
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the checkpoint, log and record files
+    columnar: bool
+        use the columnar simulation engine
+
+    Notes
+    -----
+    - Simulate 6 years with a log and record file, save a checkpoint and
+      simulate 3 more years, then keep copies of the files
+    - Restore the checkpoint with the same files and simulate 3 years
+    - assert the files equal the copies: the years before the checkpoint
+      are kept, and those after it are written once
+
+    Returns
+    -------
+
+    """
+    checkpoint = str(tmp_path / "sim.ckpt")
+    outputs = {"log_file": str(tmp_path / "log.csv"),
+               "record_file": str(tmp_path / "record.npy"),
+               "log_flush_years": 2, "record_chunk_years": 4}
+    ini_pop = [{'loc': (2, 2),
+                'pop': ([{'species': 'Herbivore', 'age': 5, 'weight': 20}
+                         for _ in range(50)] +
+                        [{'species': 'Carnivore', 'age': 5, 'weight': 20}
+                         for _ in range(10)])}]
+    with BioSim("WWWWW\nWLLLW\nWLHDW\nWWWWW", ini_pop=ini_pop, seed=3,
+                vis_years=0, columnar=columnar, **outputs) as sim:
+        sim.simulate(6)
+        sim.save_checkpoint(checkpoint)
+        sim.simulate(3)
+    with open(outputs["log_file"]) as file:
+        log_lines = file.read().splitlines()
+    record = Recorder.load(outputs["record_file"]).tolist()
+
+    with BioSim.load_checkpoint(checkpoint, **outputs) as restored:
+        restored.simulate(3)
+
+    with open(outputs["log_file"]) as file:
+        assert file.read().splitlines() == log_lines
+    assert len(log_lines) == 10
+    data = Recorder.load(outputs["record_file"])
+    assert data.shape[0] == 10
+    assert data.tolist() == record
+    assert (data.sum(axis=(1, 2, 3)) > 0).all()
+
+
+@pytest.mark.parametrize("record_file, geogr", [("missing.npy", "WWWWW\nWLLLW\nWWWWW"),
+                                                ("record.npy", "WWWW\nWLLW\nWWWW")])
+def test_checkpoint_outputs_fail(tmp_path, record_file, geogr):
+    """
+    Testing a record file that does not belong to the checkpoint is refused
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the checkpoint and record files
+    record_file: str
+        name of the record file to continue
+    geogr: str
+        island map of the simulation that wrote record.npy
+
+    Raises
+    ------
+    ValueError
+    """
+    checkpoint = str(tmp_path / "sim.ckpt")
+    with BioSim(geogr, ini_pop=[], seed=1, vis_years=0,
+                record_file=str(tmp_path / "record.npy")) as sim:
+        sim.simulate(2)
+    sim = BioSim("WWWWW\nWLLLW\nWWWWW", ini_pop=[], seed=1, vis_years=0)
+    sim.simulate(2)
+    sim.save_checkpoint(checkpoint)
+    with pytest.raises(ValueError):
+        BioSim.load_checkpoint(checkpoint, record_file=str(tmp_path / record_file))
+
+
+@pytest.mark.parametrize("blit", [False, True])
+def test_visualization_artists(tmp_path, blit):
+    """
+    Testing the visualization updates its artists instead of adding new ones
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the figures
+    blit: bool
+        redraw only the changing artists
+
+    Notes
+    -----
+    - Simulate with a figure every year, in two calls of simulate
+    - assert each heatmap keeps a single image
+    - assert a figure is written every year, and at the start of each
+      call of simulate
+
+    Returns
+    -------
+
+    """
+    ini_pop = [{'loc': (2, 2),
+                'pop': [{'species': 'Herbivore', 'age': 5, 'weight': 20}
+                        for _ in range(20)]}]
+    sim = BioSim("WWWW\nWLLW\nWWWW", ini_pop=ini_pop, seed=1, vis_years=1,
+                 img_dir=str(tmp_path), img_base="sim", blit=blit)
+    sim.simulate(2)
+    sim.simulate(1)
+    plt.close(sim.visual.fig)
+    assert len(sim.visual.herbivore_heatmap.images) == 1
+    assert len(sim.visual.carnivore_heatmap.images) == 1
+    assert len(list(tmp_path.glob("sim_*.png"))) == 5
+    assert (sim.visual.background is not None) == blit
+
+
+def test_visualization_histograms():
+    """
+    Testing the histograms show the age, weight and fitness of the animals
+
+    Notes
+    -----
+    - Herbivores are heavier than the age bins reach, so a weight histogram
+      of the ages would differ from one of the weights
+
+    Returns
+    -------
+
+    """
+    ini_pop = [{'loc': (2, 2),
+                'pop': [{'species': 'Herbivore', 'age': 5, 'weight': 20 + weight}
+                        for weight in range(20)]}]
+    sim = BioSim("WWWW\nWLLW\nWWWW", ini_pop=ini_pop, seed=1, vis_years=1)
+    sim.simulate(1)
+    plt.close(sim.visual.fig)
+
+    values = sim.get_histogram_values()["Herbivore"]
+    for key, stairs in (("age", sim.visual.age_hist_herbivore),
+                        ("weight", sim.visual.weight_hist_herbivore),
+                        ("fitness", sim.visual.fitness_hist_herbivore)):
+        counts, _ = np.histogram(values[key], stairs.get_data().edges)
+        assert stairs.get_data().values.tolist() == counts.tolist()
+    assert sim.visual.weight_hist_herbivore.get_data().values.sum() == len(values["weight"])
+
+
+def test_blit_fail():
+    """
+    Testing blit needs to be a boolean
+
+    Raises
+    ------
+    ValueError
+    """
+    with pytest.raises(ValueError):
+        BioSim("WWW\nWLW\nWWW", ini_pop=[], seed=1, vis_years=0, blit=1)
+
+
+@pytest.mark.parametrize("blit", [False, True])
+def test_frame_writer_images(tmp_path, blit):
+    """
+    Testing the images written in the background equal those written by savefig
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the figures
+    blit: bool
+        redraw only the changing artists
+
+    Notes
+    -----
+    - Simulate the same island with and without a frame writer queue
+    - assert every image is written when simulate returns
+    - assert the images are equal
+
+    Returns
+    -------
+
+    """
+    ini_pop = [{'loc': (2, 2),
+                'pop': [{'species': 'Herbivore', 'age': 5, 'weight': 20}
+                        for _ in range(20)]}]
+    for base, img_queue_size in (("sync", 0), ("async", 2)):
+        with BioSim("WWWW\nWLLW\nWWWW", ini_pop=ini_pop, seed=1, vis_years=1,
+                    img_dir=str(tmp_path), img_base=base, blit=blit,
+                    img_queue_size=img_queue_size) as sim:
+            sim.simulate(3)
+        plt.close(sim.visual.fig)
+
+    sync_files = sorted(tmp_path.glob("sync_*.png"))
+    async_files = sorted(tmp_path.glob("async_*.png"))
+    assert len(sync_files) == len(async_files) == 4
+    for sync_file, async_file in zip(sync_files, async_files):
+        assert (mpimg.imread(sync_file) == mpimg.imread(async_file)).all()
+
+
+def test_frame_writer_error(tmp_path):
+    """
+    Testing an error of the background thread is raised by flush
+
+    Notes
+    -----
+    - Queue a frame for a directory that does not exist
+    - assert flush raises the error, once
+
+    Raises
+    ------
+    FileNotFoundError
+    """
+    writer = FrameWriter(queue_size=1)
+    writer.write(str(tmp_path / "missing" / "frame.png"), np.zeros((2, 2, 4)), "png", 100)
+    with pytest.raises(FileNotFoundError):
+        writer.flush()
+    writer.close()
+
+
+def test_frame_writer_close(tmp_path):
+    """
+    Testing close writes the queued frames, stops the thread and raises its error
+
+    Notes
+    -----
+    - Queue a frame that is written and one for a directory that does not exist
+    - assert close raises the error, the frame is written and the thread stopped
+    - assert write fails on the closed writer
+
+    Raises
+    ------
+    FileNotFoundError
+    RuntimeError
+    """
+    writer = FrameWriter(queue_size=1)
+    writer.write(str(tmp_path / "frame.png"), np.zeros((2, 2, 4)), "png", 100)
+    writer.write(str(tmp_path / "missing" / "frame.png"), np.zeros((2, 2, 4)), "png", 100)
+    with pytest.raises(FileNotFoundError):
+        writer.close()
+    assert (tmp_path / "frame.png").exists()
+    assert not writer.thread.is_alive()
+    with pytest.raises(RuntimeError):
+        writer.write(str(tmp_path / "frame.png"), np.zeros((2, 2, 4)), "png", 100)
+    writer.close()
+
+
+def test_close_frame_writer(tmp_path):
+    """
+    Testing BioSim.close stops the frame writer thread
+
+    Notes
+    -----
+    - Simulate with a frame writer queue in a with block
+    - assert the thread is stopped after the block
+
+    Returns
+    -------
+
+    """
+    with BioSim("WWW\nWLW\nWWW", ini_pop=[], seed=1, vis_years=1,
+                img_dir=str(tmp_path), img_queue_size=2) as sim:
+        sim.simulate(2)
+    plt.close(sim.visual.fig)
+    assert not sim.visual.frame_writer.thread.is_alive()
+
+
+@pytest.mark.parametrize("img_queue_size", [-1, 1.5, "2"])
+def test_img_queue_size_fail(img_queue_size):
+    """
+    Testing img_queue_size needs to be a non-negative integer
+
+    Parameters
+    ----------
+    img_queue_size: int
+        number of figures waiting to be written
+
+    Raises
+    ------
+    ValueError
+    """
+    with pytest.raises(ValueError):
+        BioSim("WWW\nWLW\nWWW", ini_pop=[], seed=1, vis_years=0,
+               img_queue_size=img_queue_size)
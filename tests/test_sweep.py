@@ -0,0 +1,203 @@
+from biosim import ensemble, sweep
+from biosim.animals.herbivore import Herbivore
+from biosim.island import Island
+from biosim.land.lowland import LowLand
+import csv
+import pytest
+
+ISLAND_MAP = "WWWWW\nWLLLW\nWLHDW\nWWWWW"
+INI_POP = [{'loc': (2, 2),
+            'pop': ([{'species': 'Herbivore', 'age': 5, 'weight': 20}
+                     for _ in range(40)] +
+                    [{'species': 'Carnivore', 'age': 5, 'weight': 20}
+                     for _ in range(8)])}]
+
+
+def read_rows(path):
+    """
+    Rows of a result table
+
+    Parameters
+    ----------
+    path: str
+        path of the csv file
+
+    Returns
+    -------
+    list
+    """
+    with open(path, newline='') as file:
+        return list(csv.DictReader(file))
+
+
+def test_grid_and_sample():
+    """
+    Testing the points of a grid and of the sampler
+
+    Returns
+    -------
+
+    """
+    points = sweep.grid({"Herbivore.zeta": [3.0, 3.5], "L.f_max": [700, 800, 900]})
+    assert len(points) == 6
+    assert points[1] == {"Herbivore.zeta": 3.0, "L.f_max": 800}
+
+    samples = sweep.sample({"Herbivore.xi": (1.0, 1.5)}, 5, seed=3)
+    assert samples == sweep.sample({"Herbivore.xi": (1.0, 1.5)}, 5, seed=3)
+    assert all(1.0 <= point["Herbivore.xi"] <= 1.5 for point in samples)
+
+
+def test_sweep_isolated_params(tmp_path):
+    """
+    Testing every point runs with its own parameters only
+
+    Notes
+    -----
+    - Sweep f_max of lowland in one worker, so that the points share a process
+    - assert each row equals an ensemble run with the parameters of the point
+    - assert the parameters of this process are unchanged
+
+    Returns
+    -------
+
+    """
+    results_file = str(tmp_path / "sweep.csv")
+    f_max = LowLand.f_max
+    points = sweep.grid({"L.f_max": [800, 0, 800]})
+    sweep.run(ISLAND_MAP, INI_POP, points, 5, results_file, seeds=[1, 2], workers=1)
+
+    rows = sorted(read_rows(results_file), key=lambda row: int(row["point"]))
+    assert len(rows) == 3
+    for row, point in zip(rows, points):
+        counts = [counts for _, counts in
+                  ensemble.run(ISLAND_MAP, INI_POP, [1, 2], 5, params=sweep.to_params(point),
+                               workers=1)]
+        metrics = sweep.summarize(counts)
+        for name in sweep.METRICS:
+            assert float(row[name]) == pytest.approx(metrics[name])
+    assert rows[0]["Herbivore_final_mean"] == rows[2]["Herbivore_final_mean"]
+    assert LowLand.f_max == f_max
+
+
+def test_sweep_point_in_process(monkeypatch):
+    """
+    Testing a point run in this process leaves the class parameters unchanged
+
+    Notes
+    -----
+    - Run a point as a worker does, in this process
+    - assert the parameters of the Island and animal classes are unchanged
+    - assert the point ran with its own parameters
+
+    Returns
+    -------
+
+    """
+    monkeypatch.setattr(sweep, "_base_params", Island.get_params())
+    params = Island.get_params()
+    _, _, metrics = sweep._run_point(0, {"L.f_max": 0, "Herbivore.zeta": 3.0},
+                                     ISLAND_MAP, INI_POP, [1], 5, True)
+    assert Island.get_params() == params
+    assert Herbivore.params["zeta"] == params["Herbivore"]["zeta"]
+    assert metrics["Herbivore_final_mean"] < 40
+
+
+def test_sweep_resume(tmp_path):
+    """
+    Testing a sweep skips the points already in the result table
+
+    Notes
+    -----
+    - Run the first two points, then the sweep of all four points
+    - assert only the two missing points run the second time
+    - assert the table holds every point once
+
+    Returns
+    -------
+
+    """
+    results_file = str(tmp_path / "sweep.csv")
+    points = sweep.sample({"Herbivore.zeta": (3.0, 4.0), "L.f_max": (600, 900)}, 4)
+    first = sweep.run(ISLAND_MAP, INI_POP, points[:2], 3, results_file, workers=2)
+    second = sweep.run(ISLAND_MAP, INI_POP, points, 3, results_file, workers=2)
+    assert len(first) == len(second) == 2
+    assert sorted(row["point"] for row in second) == [2, 3]
+
+    rows = read_rows(results_file)
+    assert sorted(sweep.point_key(row, list(points[0])) for row in rows) == \
+           sorted(sweep.point_key(point, list(points[0])) for point in points)
+    assert sweep.run(ISLAND_MAP, INI_POP, points, 3, results_file, workers=2) == []
+
+
+@pytest.mark.parametrize("points", [[{"zeta": 3.0}],
+                                    [{"Herbivore.zeta": -1.0}],
+                                    [{"Herbivore.zeta": 3.0}, {"Herbivore.xi": 1.0}]])
+def test_sweep_fail(tmp_path, points):
+    """
+    Testing wrong points are reported before any point runs
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the result table
+    points: list
+        parameter values of the points
+
+    Raises
+    ------
+    ValueError
+    """
+    zeta = Herbivore.params["zeta"]
+    with pytest.raises(ValueError):
+        sweep.run(ISLAND_MAP, INI_POP, points, 3, str(tmp_path / "sweep.csv"))
+    assert Herbivore.params["zeta"] == zeta
+
+
+def test_sweep_other_table(tmp_path):
+    """
+    Testing a result table of another sweep is not appended to
+
+    Raises
+    ------
+    ValueError
+    """
+    results_file = str(tmp_path / "sweep.csv")
+    sweep.run(ISLAND_MAP, INI_POP, [{"L.f_max": 700}], 1, results_file, workers=1)
+    with pytest.raises(ValueError):
+        sweep.run(ISLAND_MAP, INI_POP, [{"H.f_max": 200}], 1, results_file, workers=1)
+
+
+@pytest.mark.parametrize("years, seeds", [(3, [1, 3]), (4, [1, 2])])
+def test_sweep_other_runs(tmp_path, years, seeds):
+    """
+    Testing a result table of other years or seeds is not resumed
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        temporary directory for the result table
+    years: int
+        number of years of the second sweep
+    seeds: list
+        seeds of the second sweep
+
+    Notes
+    -----
+    - Run the first point with 3 years and seeds 1 and 2
+    - assert the rows hold the years and seeds
+    - assert resuming with other years or seeds is refused, and the table
+      is unchanged
+
+    Raises
+    ------
+    ValueError
+    """
+    results_file = str(tmp_path / "sweep.csv")
+    points = sweep.grid({"L.f_max": [700, 800]})
+    sweep.run(ISLAND_MAP, INI_POP, points[:1], 3, results_file, seeds=[1, 2], workers=1)
+    rows = read_rows(results_file)
+    assert [(row["years"], row["seeds"]) for row in rows] == [("3", "1 2")]
+
+    with pytest.raises(ValueError):
+        sweep.run(ISLAND_MAP, INI_POP, points, years, results_file, seeds=seeds, workers=1)
+    assert read_rows(results_file) == rows